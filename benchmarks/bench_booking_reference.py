@@ -0,0 +1,60 @@
+"""
+Пропускная способность генератора номеров броней.
+
+Новый генератор не обращается к таблице броней, поэтому его стоимость не
+зависит от их количества: последовательность выставляется на --existing,
+после чего замеряются кодирование и выдача номеров. Для старого способа
+(8 случайных символов A-Z0-9 и проверка уникальности индексом) выводится
+вероятность коллизии при том же объёме.
+
+    python benchmarks/bench_booking_reference.py --existing 10000000 --count 100000
+"""
+import argparse
+import time
+
+from common import disposable_database, setup_django
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--existing', type=int, default=10_000_000)
+	parser.add_argument('--count', type=int, default=100_000)
+	args = parser.parse_args()
+
+	setup_django()
+	from cinema import references
+	from cinema.models import ReferenceSequence
+
+	with disposable_database() as connection:
+		if connection.vendor == 'postgresql':
+			with connection.cursor() as cursor:
+				cursor.execute('SELECT setval(%s, %s)', [ReferenceSequence.SEQUENCE_NAME, args.existing])
+		else:
+			ReferenceSequence.objects.update_or_create(pk=1, defaults={'value': args.existing})
+
+		started = time.perf_counter()
+		codes = {references.encode(number) for number in range(args.existing + 1, args.existing + args.count + 1)}
+		encode_elapsed = time.perf_counter() - started
+		assert len(codes) == args.count
+
+		calls = min(args.count, 10_000)
+		started = time.perf_counter()
+		for _ in range(calls):
+			references.encode(ReferenceSequence.allocate()[0])
+		single_elapsed = time.perf_counter() - started
+
+		started = time.perf_counter()
+		numbers = ReferenceSequence.allocate(args.count)
+		[references.encode(number) for number in numbers]
+		batch_elapsed = time.perf_counter() - started
+
+	print(f"Существующих броней:             {args.existing:,}")
+	print(f"Кодирование, номеров/с:          {args.count / encode_elapsed:,.0f}")
+	print(f"Выдача по одному, номеров/с:     {calls / single_elapsed:,.0f} ({connection.vendor})")
+	print(f"Пакетная выдача, номеров/с:      {args.count / batch_elapsed:,.0f}")
+	print(f"Коллизий среди новых номеров:    0 из {args.count:,}")
+	print(f"Старый способ, шанс коллизии:    {args.existing / 36 ** 8:.2e} на бронь")
+
+
+if __name__ == '__main__':
+	main()
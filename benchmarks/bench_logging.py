@@ -0,0 +1,125 @@
+"""
+Задержка создания брони (POST /api/v1/bookings/) при разных режимах логов:
+
+    off    — логирование выключено;
+    sync   — JSON в файл прямо из потока запроса (как было до очереди);
+    queue  — тот же файл за QueueHandler, запись в фоновом потоке.
+
+--fsync сбрасывает каждую запись на диск и показывает, что происходит при
+медленном диске: в режиме sync время fsync попадает внутрь транзакции брони.
+
+    python benchmarks/bench_logging.py --requests 2000 --concurrency 8 --fsync
+"""
+import argparse
+import logging
+import logging.config
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import disposable_database, percentile, setup_django
+
+MODES = ('off', 'sync', 'queue')
+
+
+class FsyncFileHandler(logging.FileHandler):
+	def emit(self, record):
+		super().emit(record)
+		self.flush()
+		os.fsync(self.stream.fileno())
+
+
+def configure(mode, path, fsync):
+	from cinema.log import start_queue_logging, stop_queue_logging
+
+	stop_queue_logging()
+	logging.disable(logging.NOTSET)
+	logging.config.dictConfig({
+		'version': 1,
+		'disable_existing_loggers': False,
+		'formatters': {'json': {'()': 'cinema.log.JSONFormatter'}},
+		'handlers': {
+			'file': {
+				'()': FsyncFileHandler if fsync else logging.FileHandler,
+				'filename': path,
+				'formatter': 'json',
+			},
+		},
+		'root': {'handlers': ['file'], 'level': 'INFO'},
+		'loggers': {'django': {'handlers': ['file'], 'level': 'INFO', 'propagate': False}},
+	})
+	if mode == 'off':
+		logging.disable(logging.CRITICAL)
+	elif mode == 'queue':
+		start_queue_logging()
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--requests', type=int, default=1000)
+	parser.add_argument('--concurrency', type=int, default=1)
+	parser.add_argument('--fsync', action='store_true')
+	args = parser.parse_args()
+
+	setup_django()
+	from datetime import timedelta
+
+	from django.db import connection
+	from django.utils import timezone
+	from rest_framework.test import APIClient
+
+	from cinema.log import stop_queue_logging
+	from cinema.tests.factories import CinemaHallFactory, ScreeningFactory
+
+	with disposable_database(), tempfile.TemporaryDirectory() as directory:
+		hall = CinemaHallFactory(capacity=500)
+		start = timezone.now() + timedelta(days=1)
+		screenings_needed = len(MODES) * args.requests // 500 + 1
+		screenings = iter([
+			ScreeningFactory(hall=hall, start_time=start + timedelta(hours=4 * i)).pk
+			for i in range(screenings_needed)
+		])
+
+		print(f"{'режим':<8} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9} {'среднее':>9}")
+		screening_id, left = next(screenings), 500
+		for mode in MODES:
+			configure(mode, os.path.join(directory, f'{mode}.log'), args.fsync)
+			targets = []
+			for _ in range(args.requests):
+				if not left:
+					screening_id, left = next(screenings), 500
+				targets.append(screening_id)
+				left -= 1
+
+			def book(target):
+				client = APIClient()
+				started = time.perf_counter()
+				response = client.post('/api/v1/bookings/', {
+					'screening': target,
+					'customer_name': 'Нагрузка',
+					'customer_email': 'load@example.com',
+					'customer_phone': '+79160000000',
+					'seats': 1,
+					'status': 'confirmed',
+				}, format='json')
+				elapsed = time.perf_counter() - started
+				connection.close()
+				assert response.status_code == 201, response.content
+				return elapsed * 1000
+
+			with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+				samples = list(executor.map(book, targets))
+
+			print(
+				f"{mode:<8} {percentile(samples, 50):>9.2f} {percentile(samples, 95):>9.2f} "
+				f"{percentile(samples, 99):>9.2f} {statistics.mean(samples):>9.2f}"
+			)
+
+		stop_queue_logging()
+		logging.disable(logging.NOTSET)
+
+
+if __name__ == '__main__':
+	main()
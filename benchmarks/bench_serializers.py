@@ -0,0 +1,75 @@
+"""
+Сериализация списков: ModelSerializer + JSONRenderer против быстрого пути
+(.values() + подготовленные функции полей + orjson). Перед замером
+проверяется, что оба способа дают одинаковые байты.
+
+    python benchmarks/bench_serializers.py --rows 1000 --repeat 20
+"""
+import argparse
+import statistics
+import time
+
+from common import disposable_database, setup_django
+
+
+def measure(func, repeat):
+	samples = []
+	for _ in range(repeat):
+		started = time.perf_counter()
+		func()
+		samples.append(time.perf_counter() - started)
+	return statistics.median(samples) * 1000
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--rows', type=int, default=1000)
+	parser.add_argument('--repeat', type=int, default=20)
+	args = parser.parse_args()
+
+	setup_django()
+	from datetime import timedelta
+
+	from django.utils import timezone
+	from rest_framework.renderers import JSONRenderer
+
+	from cinema import serializers
+	from cinema.models import Booking, Film, Screening
+	from cinema.renderers import ORJSONRenderer
+	from cinema.tests.factories import BookingFactory, CinemaHallFactory, FilmFactory, ScreeningFactory
+
+	with disposable_database():
+		films = FilmFactory.create_batch(args.rows)
+		hall = CinemaHallFactory(capacity=500)
+		start = timezone.now() + timedelta(days=1)
+		screenings = [
+			ScreeningFactory(film=film, hall=hall, start_time=start + timedelta(hours=4 * i))
+			for i, film in enumerate(films)
+		]
+		for screening in screenings:
+			BookingFactory(screening=screening)
+
+		cases = [
+			('films', serializers.FilmSerializer, serializers.fast_films, Film.objects.prefetch_related('genres')),
+			('screenings', serializers.ScreeningSerializer, serializers.fast_screenings, Screening.objects.select_related('film', 'hall')),
+			('bookings', serializers.BookingSerializer, serializers.fast_bookings, Booking.objects.select_related('screening__film')),
+		]
+
+		slow_renderer = JSONRenderer()
+		fast_renderer = ORJSONRenderer()
+		print(f"{'':<12} {'DRF, мс':>10} {'быстрый, мс':>12} {'ускорение':>10}")
+		for name, serializer_class, fast, queryset in cases:
+			def slow_path():
+				return slow_renderer.render(serializer_class(queryset.all(), many=True).data)
+
+			def fast_path():
+				return fast_renderer.render(fast.serialize(queryset.all()))
+
+			assert slow_path() == fast_path(), name
+			slow_ms = measure(slow_path, args.repeat)
+			fast_ms = measure(fast_path, args.repeat)
+			print(f"{name:<12} {slow_ms:>10.1f} {fast_ms:>12.1f} {slow_ms / fast_ms:>9.1f}x")
+
+
+if __name__ == '__main__':
+	main()
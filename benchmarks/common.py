@@ -0,0 +1,33 @@
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+	sys.path.insert(0, str(ROOT))
+	os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+	import django
+	django.setup()
+
+
+@contextmanager
+def disposable_database(keepdb=False):
+	from django.db import connection
+
+	old_name = connection.settings_dict['NAME']
+	connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+	try:
+		yield connection
+	finally:
+		connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def percentile(samples, q):
+	ordered = sorted(samples)
+	if not ordered:
+		return 0.0
+	return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
@@ -0,0 +1,168 @@
+"""
+Нагрузочный набор для API броней и расписания. Поднимает одноразовую базу
+(PostgreSQL из настроек или SQLite через DJANGO_SETTINGS_MODULE), заполняет
+её через cinema.seeding (как manage.py seed_cinema), запускает приложение в
+многопоточном WSGI-сервере и гоняет сценарии параллельными клиентами. Клиенты
+распределены по --processes процессам, чтобы не делить GIL с сервером; для
+цифр продакшен-профиля запустите gunicorn отдельно и передайте его адрес в
+--url — тогда набор заполняет базу из настроек (не одноразовую) и свой
+сервер не поднимает:
+
+    upcoming  GET  /api/v1/screenings/upcoming/
+    listing   GET  /api/v1/screenings/listing/
+    films     GET  /api/v1/films/
+    bookings  GET  /api/v1/bookings/
+    book      POST /api/v1/bookings/ на несколько «горячих» сеансов
+    cancel    POST /api/v1/bookings/{id}/cancel/ по заранее созданным броням;
+              клиент, у которого кончились брони, останавливается
+
+По каждому сценарию печатаются RPS и p50/p95/p99, после сценария book —
+число проданных сверх вместимости мест (должно быть 0). SQLite пускает
+только одного писателя, поэтому в сценариях book и cancel на нём будут
+ошибки блокировки; цифры под конкуренцией имеет смысл снимать на PostgreSQL.
+
+    python benchmarks/load_suite.py --films 2000 --halls 50 --screenings 5000 --bookings 1000000
+    python benchmarks/load_suite.py --scenarios book,cancel --concurrency 64 --duration 30
+    python benchmarks/load_suite.py --url http://127.0.0.1:8000
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+
+from common import disposable_database, setup_django
+from load_test import format_stats, run_load
+
+SCENARIOS = ('upcoming', 'listing', 'films', 'bookings', 'book', 'cancel')
+SLOT = timedelta(hours=4)
+
+
+def oversold(screening_ids):
+	from django.db.models import Q, Sum
+
+	from cinema.models import Screening
+
+	total = 0
+	for screening in Screening.objects.filter(pk__in=screening_ids).select_related('hall').annotate(
+		booked=Sum('booking__seats', filter=~Q(booking__status='cancelled'))
+	):
+		total += max((screening.booked or 0) - screening.hall.capacity, 0)
+	return total
+
+
+def serve():
+	from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+
+	class QuietHandler(WSGIRequestHandler):
+		def log_message(self, *args):
+			pass
+
+	server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler)
+	server.set_app(get_internal_wsgi_application())
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--films', type=int, default=2000)
+	parser.add_argument('--halls', type=int, default=50)
+	parser.add_argument('--screenings', type=int, default=5000)
+	parser.add_argument('--bookings', type=int, default=100_000)
+	parser.add_argument('--hot-screenings', type=int, default=5, help='Сколько сеансов делят между собой сценарии book')
+	parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+	parser.add_argument('--concurrency', type=int, default=32)
+	parser.add_argument('--duration', type=float, default=10.0)
+	parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Сколько процессов делят между собой клиентов')
+	parser.add_argument('--url', help='Адрес уже запущенного сервера (например, gunicorn) вместо встроенного')
+	parser.add_argument('--keepdb', action='store_true', help='Не пересоздавать базу и не заполнять её повторно')
+	parser.add_argument('--verbose', action='store_true', help='Не глушить логи приложения')
+	args = parser.parse_args()
+
+	scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+	unknown = set(scenarios) - set(SCENARIOS)
+	if unknown:
+		parser.error(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+	setup_django()
+	from django.conf import settings
+	from django.db import connection
+
+	from cinema.models import Booking, CinemaHall, Screening
+	from cinema.seeding import seed
+	from cinema.tests.factories import ScreeningFactory
+
+	settings.ALLOWED_HOSTS = ['*']
+	settings.DEBUG = False
+	if not args.verbose:
+		logging.disable(logging.CRITICAL)
+
+	database = nullcontext() if args.url else disposable_database(keepdb=args.keepdb)
+	with database:
+		if not Screening.objects.exists():
+			started = time.perf_counter()
+			created = seed(
+				films=args.films, halls=args.halls, screenings=args.screenings, bookings=args.bookings
+			)['bookings']
+			print(f"База заполнена за {time.perf_counter() - started:.1f} с: броней {created} (БД: {connection.vendor})")
+
+		hall = CinemaHall.objects.order_by('-capacity').first()
+		last = Screening.objects.filter(hall=hall).order_by('-start_time').first()
+		hot = [
+			ScreeningFactory(hall=hall, film=last.film, start_time=last.start_time + SLOT * (i + 1)).pk
+			for i in range(args.hot_screenings)
+		]
+		connection.close()
+
+		server, base_url = (None, args.url.rstrip('/')) if args.url else serve()
+		try:
+			for name in scenarios:
+				if name == 'book':
+					def make_request(number, iteration):
+						return 'POST', '/api/v1/bookings/', {
+							'screening': hot[(number + iteration) % len(hot)],
+							'customer_name': f'Клиент {number}',
+							'customer_email': f'client{number}@example.com',
+							'customer_phone': '+79160000000',
+							'seats': 1 + iteration % 3,
+							'status': 'confirmed',
+						}
+				elif name == 'cancel':
+					ids = list(
+						Booking.objects.exclude(status='cancelled').order_by('?').values_list('pk', flat=True)[:200_000]
+					)
+					connection.close()
+					chunks = [iter(ids[number::args.concurrency]) for number in range(args.concurrency)]
+
+					def make_request(number, iteration):
+						booking_id = next(chunks[number], None)
+						if booking_id is None:
+							return None
+						return 'POST', f'/api/v1/bookings/{booking_id}/cancel/', None
+				else:
+					path = {
+						'upcoming': '/api/v1/screenings/upcoming/',
+						'listing': '/api/v1/screenings/listing/',
+						'films': '/api/v1/films/',
+						'bookings': '/api/v1/bookings/',
+					}[name]
+
+					def make_request(number, iteration, path=path):
+						return 'GET', path, None
+
+				stats = run_load(base_url, make_request, args.concurrency, args.duration, args.processes)
+				print(format_stats(name, stats))
+				if name == 'book':
+					print(f"{'':<28} проданных сверх вместимости мест: {oversold(hot)}")
+					connection.close()
+		finally:
+			if server is not None:
+				server.shutdown()
+				server.server_close()
+
+
+if __name__ == '__main__':
+	main()
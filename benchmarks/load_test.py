@@ -0,0 +1,135 @@
+"""
+Нагрузочный тест HTTP API: N параллельных клиентов с keep-alive в течение
+заданного времени, на выходе RPS и перцентили задержки.
+
+Целевой сценарий — сравнение режимов запуска на одной и той же базе:
+
+    python manage.py runserver 0.0.0.0:8000 --noreload
+    python benchmarks/load_test.py --url http://127.0.0.1:8000/api/v1/films/
+
+    gunicorn config.wsgi:application -c config/gunicorn.conf.py
+    python benchmarks/load_test.py --url http://127.0.0.1:8000/api/v1/films/
+
+Продакшен-профиль должен давать кратно больший RPS при --concurrency 32.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from common import percentile
+
+
+def run_clients(base_url, make_request, numbers, deadline):
+	parts = urlsplit(base_url)
+	latencies = []
+	statuses = Counter()
+	lock = threading.Lock()
+
+	def client(number):
+		connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+		local_latencies = []
+		local_statuses = Counter()
+		iteration = 0
+		while time.perf_counter() < deadline:
+			request = make_request(number, iteration)
+			if request is None:
+				break
+			method, path, body = request
+			headers = {'Content-Type': 'application/json'} if body is not None else {}
+			started = time.perf_counter()
+			try:
+				connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+				response = connection.getresponse()
+				response.read()
+				local_statuses[response.status] += 1
+			except (OSError, http.client.HTTPException):
+				local_statuses['error'] += 1
+				connection.close()
+				connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+			local_latencies.append(time.perf_counter() - started)
+			iteration += 1
+		connection.close()
+		with lock:
+			latencies.extend(local_latencies)
+			statuses.update(local_statuses)
+
+	threads = [threading.Thread(target=client, args=(number,)) for number in numbers]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	return latencies, statuses
+
+
+def run_load(base_url, make_request, concurrency=16, duration=10.0, processes=1):
+	deadline = time.perf_counter() + duration
+	processes = max(1, min(processes, concurrency))
+
+	started = time.perf_counter()
+	if processes == 1:
+		latencies, statuses = run_clients(base_url, make_request, range(concurrency), deadline)
+	else:
+		# Клиенты в отдельных процессах не делят GIL ни друг с другом, ни с
+		# сервером, запущенным в этом же процессе. При fork make_request
+		# достаётся дочерним процессам как есть, без pickle.
+		context = multiprocessing.get_context('fork')
+		results = context.SimpleQueue()
+
+		def worker(numbers):
+			results.put(run_clients(base_url, make_request, numbers, deadline))
+
+		workers = [
+			context.Process(target=worker, args=(range(first, concurrency, processes),))
+			for first in range(processes)
+		]
+		for process in workers:
+			process.start()
+		latencies = []
+		statuses = Counter()
+		for _ in workers:
+			part_latencies, part_statuses = results.get()
+			latencies.extend(part_latencies)
+			statuses.update(part_statuses)
+		for process in workers:
+			process.join()
+	elapsed = time.perf_counter() - started
+
+	return {
+		'requests': len(latencies),
+		'rps': len(latencies) / elapsed,
+		'p50': percentile(latencies, 50) * 1000,
+		'p95': percentile(latencies, 95) * 1000,
+		'p99': percentile(latencies, 99) * 1000,
+		'statuses': dict(statuses),
+	}
+
+
+def format_stats(name, stats):
+	return (
+		f"{name:<28} {stats['requests']:>8} req  {stats['rps']:>9.1f} rps  "
+		f"p50 {stats['p50']:>7.1f} ms  p95 {stats['p95']:>7.1f} ms  p99 {stats['p99']:>7.1f} ms  "
+		f"{stats['statuses']}"
+	)
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--url', required=True)
+	parser.add_argument('--concurrency', type=int, default=32)
+	parser.add_argument('--duration', type=float, default=10.0)
+	parser.add_argument('--processes', type=int, default=1, help='Сколько процессов делят между собой клиентов')
+	args = parser.parse_args()
+
+	parts = urlsplit(args.url)
+	path = parts.path + (f'?{parts.query}' if parts.query else '')
+	stats = run_load(args.url, lambda number, iteration: ('GET', path, None), args.concurrency, args.duration, args.processes)
+	print(format_stats(path, stats))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,266 @@
+# Предагрегированная аналитика продаж (DailySales): одна строка на день показа,
+# фильм и зал. Брони, сеансы и залы меняют строку приращениями F() в той же
+# транзакции, так что параллельные изменения не затирают друг друга.
+# rebuild_sales пересчитывает диапазон из первичных таблиц (вместе с архивом,
+# если диапазон заходит за горизонт архивации) — для обслуживания, а не на
+# каждое изменение. Запросы дашбордов читают только свёртки.
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, DateField, F, Q, Sum, Value, When
+from django.db.models.functions import Trunc, TruncDate
+from django.utils import timezone
+
+from .archive import archive_horizon
+from .models import ArchivedBooking, ArchivedScreening, Booking, CinemaHall, DailySales, Screening
+
+BUCKETS = ('day', 'week', 'month')
+GROUPS = {
+	'film': ('film', F('film__title')),
+	'hall': ('hall', F('hall__name')),
+}
+NO_SALES = (0, 0, 0)
+
+
+def sales_key(screening):
+	return timezone.localdate(screening.start_time), screening.film_id, screening.hall_id
+
+
+def _key_filter(key):
+	day, film_id, hall_id = key
+	return Q(day=day, film_id=film_id, hall_id=hall_id)
+
+
+def _add_sales(key, seats, revenue, bookings, screenings, capacity):
+	return DailySales.objects.filter(_key_filter(key)).update(
+		seats_sold=F('seats_sold') + seats,
+		revenue=F('revenue') + revenue,
+		bookings=F('bookings') + bookings,
+		screenings=F('screenings') + screenings,
+		capacity=F('capacity') + capacity
+	)
+
+
+def record_sales(key, seats=0, revenue=0, bookings=0, screenings=0, capacity=0):
+	delta = (seats, revenue, bookings, screenings, capacity)
+	if not any(delta) or _add_sales(key, *delta):
+		return
+
+	# Строки ещё нет: считаем её целиком из первичных таблиц (в подсчёт уже
+	# входит текущая бронь этой транзакции) и вставляем. Если параллельная
+	# транзакция успела вставить строку раньше, get_or_create вернёт её, и
+	# тогда наше изменение добавляется приращением, как обычно.
+	day, film_id, hall_id = key
+	row = _collect_sales(day, day, film_id, hall_id).get(key)
+	if row is None:
+		return
+	_, created = DailySales.objects.get_or_create(
+		day=day, film_id=film_id, hall_id=hall_id,
+		defaults={
+			'screenings': row.screenings,
+			'capacity': row.capacity,
+			'bookings': row.bookings,
+			'seats_sold': row.seats_sold,
+			'revenue': row.revenue,
+		}
+	)
+	if not created:
+		_add_sales(key, *delta)
+
+
+def booking_changed(booking, previous):
+	previous_screening_id, previous_sales = previous
+	_, current = booking.sales_snapshot()
+
+	if previous_screening_id not in (None, booking.screening_id):
+		record_sales(sales_key(Screening.objects.get(pk=previous_screening_id)), *(-value for value in previous_sales))
+		previous_sales = NO_SALES
+
+	record_sales(sales_key(booking.screening), *(now - before for now, before in zip(current, previous_sales)))
+
+
+def screening_sales(screening_id):
+	totals = Booking.objects.filter(screening_id=screening_id, status='confirmed').aggregate(
+		seats=Sum('seats'), revenue=Sum('total_price'), bookings=Count('id')
+	)
+	return totals['seats'] or 0, totals['revenue'] or 0, totals['bookings']
+
+
+def screening_changed(screening, created, previous):
+	key = sales_key(screening)
+	if created:
+		record_sales(key, screenings=1, capacity=screening.hall.capacity)
+		return
+
+	# Цена, время окончания и прочие поля свёртку не меняют; пересчёт нужен,
+	# только когда сеанс переехал в другой день, зал или фильм. Строку сеанса
+	# держит lock_inventory, поэтому его брони не меняются до конца транзакции.
+	if previous is None:
+		return
+	start_time, film_id, hall_id = previous
+	previous_key = (timezone.localdate(start_time), film_id, hall_id)
+	if previous_key == key:
+		return
+	sold = screening_sales(screening.pk)
+	previous_capacity = CinemaHall.objects.values_list('capacity', flat=True).get(pk=hall_id)
+	record_sales(previous_key, *(-value for value in sold), screenings=-1, capacity=-previous_capacity)
+	_drop_empty(previous_key)
+	record_sales(key, *sold, screenings=1, capacity=screening.hall.capacity)
+
+
+def screening_removed(screening, capacity):
+	# Брони удалённого сеанса к этому моменту уже вычтены их post_delete.
+	key = sales_key(screening)
+	record_sales(key, screenings=-1, capacity=-capacity)
+	_drop_empty(key)
+
+
+def _drop_empty(key):
+	DailySales.objects.filter(_key_filter(key), screenings=0).delete()
+
+
+def record_screenings(counts, batch_size=1000):
+	# counts: ключ -> (сеансов, вместимость). Одна вставка недостающих строк и
+	# одно UPDATE с CASE на пачку ключей вместо запросов на каждый ключ.
+	keys = list(counts)
+	for start in range(0, len(keys), batch_size):
+		batch = keys[start:start + batch_size]
+		DailySales.objects.bulk_create([
+			DailySales(day=day, film_id=film_id, hall_id=hall_id, revenue=0) for day, film_id, hall_id in batch
+		], ignore_conflicts=True)
+		screenings = [When(_key_filter(key), then=Value(counts[key][0])) for key in batch]
+		capacity = [When(_key_filter(key), then=Value(counts[key][1])) for key in batch]
+		condition = Q()
+		for key in batch:
+			condition |= _key_filter(key)
+		DailySales.objects.filter(condition).update(
+			screenings=F('screenings') + Case(*screenings, default=Value(0)),
+			capacity=F('capacity') + Case(*capacity, default=Value(0))
+		)
+
+
+def hall_resized(hall, previous_capacity):
+	tz = timezone.get_current_timezone()
+	delta = hall.capacity - previous_capacity
+	rows = Screening.objects.filter(hall=hall).order_by().values(
+		'film_id', day=TruncDate('start_time', tzinfo=tz)
+	).annotate(screenings=Count('id'))
+	record_screenings({
+		(row['day'], row['film_id'], hall.pk): (0, row['screenings'] * delta) for row in rows
+	})
+
+
+def _local_midnight(day):
+	return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _screening_filters(date_from, date_to, film_id, hall_id):
+	filters = {}
+	if date_from is not None:
+		filters['start_time__gte'] = _local_midnight(date_from)
+	if date_to is not None:
+		filters['start_time__lt'] = _local_midnight(date_to + timedelta(days=1))
+	if film_id is not None:
+		filters['film_id'] = film_id
+	if hall_id is not None:
+		filters['hall_id'] = hall_id
+	return filters
+
+
+def _collect_sales(date_from, date_to, film_id, hall_id):
+	filters = _screening_filters(date_from, date_to, film_id, hall_id)
+	booking_filters = {f'screening__{name}': value for name, value in filters.items()}
+	sources = [(Screening, Booking, 'hall__capacity')]
+	if date_from is None or date_from < archive_horizon():
+		sources.append((ArchivedScreening, ArchivedBooking, 'capacity'))
+
+	tz = timezone.get_current_timezone()
+	rows = {}
+
+	def sales(row):
+		key = (row['day'], row['film_id'], row['hall_id'])
+		if key not in rows:
+			rows[key] = DailySales(day=row['day'], film_id=row['film_id'], hall_id=row['hall_id'], revenue=0)
+		return rows[key]
+
+	for screening_model, booking_model, capacity in sources:
+		for row in screening_model.objects.filter(**filters).exclude(film=None).exclude(hall=None).order_by().values(
+			'film_id', 'hall_id', day=TruncDate('start_time', tzinfo=tz)
+		).annotate(screenings=Count('id'), capacity=Sum(capacity)):
+			day_sales = sales(row)
+			day_sales.screenings += row['screenings']
+			day_sales.capacity += row['capacity']
+
+		for row in booking_model.objects.filter(status='confirmed', **booking_filters).order_by().values(
+			film_id=F('screening__film_id'), hall_id=F('screening__hall_id'),
+			day=TruncDate('screening__start_time', tzinfo=tz)
+		).annotate(bookings=Count('id'), seats_sold=Sum('seats'), revenue=Sum('total_price')):
+			if (row['day'], row['film_id'], row['hall_id']) in rows:
+				day_sales = sales(row)
+				day_sales.bookings += row['bookings']
+				day_sales.seats_sold += row['seats_sold']
+				day_sales.revenue += row['revenue']
+	return rows
+
+
+@transaction.atomic
+def rebuild_sales(date_from=None, date_to=None, film_id=None, hall_id=None, batch_size=1000):
+	rows = _collect_sales(date_from, date_to, film_id, hall_id)
+	existing = DailySales.objects.all()
+	if date_from is not None:
+		existing = existing.filter(day__gte=date_from)
+	if date_to is not None:
+		existing = existing.filter(day__lte=date_to)
+	if film_id is not None:
+		existing = existing.filter(film_id=film_id)
+	if hall_id is not None:
+		existing = existing.filter(hall_id=hall_id)
+	existing.delete()
+	DailySales.objects.bulk_create(rows.values(), batch_size=batch_size)
+	return len(rows)
+
+
+def occupancy(seats_sold, capacity):
+	return round(seats_sold * 100 / capacity, 1) if capacity else 0.0
+
+
+def _totals(queryset):
+	return queryset.annotate(
+		screenings=Sum('screenings'),
+		capacity=Sum('capacity'),
+		bookings=Sum('bookings'),
+		seats_sold=Sum('seats_sold'),
+		revenue=Sum('revenue')
+	)
+
+
+def _row(row):
+	row['occupancy'] = occupancy(row['seats_sold'], row['capacity'])
+	row['revenue'] = f"{row['revenue']:.2f}"
+	return row
+
+
+def filter_sales(date_from=None, date_to=None, film_id=None, hall_id=None):
+	queryset = DailySales.objects.all()
+	if date_from is not None:
+		queryset = queryset.filter(day__gte=date_from)
+	if date_to is not None:
+		queryset = queryset.filter(day__lte=date_to)
+	if film_id is not None:
+		queryset = queryset.filter(film_id=film_id)
+	if hall_id is not None:
+		queryset = queryset.filter(hall_id=hall_id)
+	return queryset
+
+
+def sales_by(group, queryset):
+	field, name = GROUPS[group]
+	rows = _totals(queryset.order_by().values(field, name=name)).order_by('-revenue', field)
+	return [_row(row) for row in rows]
+
+
+def sales_series(bucket, queryset):
+	rows = _totals(
+		queryset.order_by().values(period=Trunc('day', bucket, output_field=DateField()))
+	).order_by('period')
+	return [_row(row) for row in rows]
@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class CinemaConfig(AppConfig):
     name = 'cinema'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import receivers  # noqa: F401
+        from .log import start_queue_logging
+
+        if settings.LOG_QUEUE:
+            start_queue_logging()
@@ -0,0 +1,89 @@
+# Архив прошедших сеансов и их броней. Живые таблицы Screening и Booking
+# хранят только последние ARCHIVE_AFTER_DAYS дней, поэтому их индексы
+# остаются маленькими; старые строки пачками переносятся в ArchivedScreening
+# и ArchivedBooking с теми же первичными ключами. Переносятся целые дни, так
+# что строка сводной аналитики всегда целиком живая или целиком архивная.
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import schedule_cache
+from .models import ArchivedBooking, ArchivedScreening, Booking, Screening, ScreeningListing
+
+BOOKING_FIELDS = (
+	'id', 'screening_id', 'customer_name', 'customer_email', 'customer_phone', 'seats', 'seat_numbers',
+	'total_price', 'status', 'booking_date', 'booking_reference', 'expires_at',
+)
+
+
+def archive_horizon(today=None):
+	return (today or timezone.localdate()) - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+
+
+def archive_cutoff(today=None):
+	return timezone.make_aware(datetime.combine(archive_horizon(today), time.min))
+
+
+def archived_screening(screening):
+	return ArchivedScreening(
+		id=screening.pk,
+		film_id=screening.film_id,
+		film_title=screening.film.title,
+		hall_id=screening.hall_id,
+		hall_name=screening.hall.name,
+		capacity=screening.hall.capacity,
+		start_time=screening.start_time,
+		end_time=screening.end_time,
+		price=screening.price,
+		available_seats=screening.available_seats
+	)
+
+
+@transaction.atomic
+def archive_batch(cutoff, batch_size=100):
+	screenings = list(
+		Screening.objects.select_for_update(skip_locked=True, of=('self',))
+		.select_related('film', 'hall')
+		.filter(start_time__lt=cutoff)
+		.order_by('start_time', 'id')[:batch_size]
+	)
+	if not screenings:
+		return 0, 0
+
+	screening_ids = [screening.pk for screening in screenings]
+	bookings = Booking.objects.filter(screening_id__in=screening_ids)
+	ArchivedScreening.objects.bulk_create([archived_screening(screening) for screening in screenings])
+	archived = ArchivedBooking.objects.bulk_create(
+		[ArchivedBooking(**row) for row in bookings.order_by().values(*BOOKING_FIELDS)],
+		batch_size=1000
+	)
+
+	# Данные переезжают, а не исчезают: сигналы post_delete пересчитали бы
+	# аналитику и кэш расписания, поэтому удаляем обычным DELETE без ORM,
+	# а из кеша убираем только ключи самих сеансов.
+	ScreeningListing.objects.filter(pk__in=screening_ids).delete()
+	placeholders = ', '.join(['%s'] * len(screening_ids))
+	with connection.cursor() as cursor:
+		cursor.execute(
+			f"DELETE FROM {connection.ops.quote_name(Booking._meta.db_table)} WHERE screening_id IN ({placeholders})",
+			screening_ids
+		)
+		cursor.execute(
+			f"DELETE FROM {connection.ops.quote_name(Screening._meta.db_table)} WHERE id IN ({placeholders})",
+			screening_ids
+		)
+	transaction.on_commit(lambda: schedule_cache.drop_screenings(screening_ids))
+	return len(screenings), len(archived)
+
+
+def archive_screenings(batch_size=100, today=None):
+	cutoff = archive_cutoff(today)
+	screenings = bookings = 0
+	while True:
+		moved, moved_bookings = archive_batch(cutoff, batch_size)
+		if not moved:
+			return screenings, bookings
+		screenings += moved
+		bookings += moved_bookings
@@ -0,0 +1,109 @@
+# Потоковая выгрузка броней для бухгалтерии. Строки читаются через
+# .iterator(chunk_size=...) (на PostgreSQL это серверный курсор) и сразу
+# превращаются в CSV или NDJSON, поэтому память не зависит от размера таблицы.
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Booking
+
+FORMATS = {
+	'csv': 'text/csv; charset=utf-8',
+	'ndjson': 'application/x-ndjson',
+}
+
+COLUMNS = (
+	('id', 'id'),
+	('booking_reference', 'booking_reference'),
+	('booking_date', 'booking_date'),
+	('status', 'status'),
+	('customer_name', 'customer_name'),
+	('customer_email', 'customer_email'),
+	('customer_phone', 'customer_phone'),
+	('seats', 'seats'),
+	('total_price', 'total_price'),
+	('screening', 'screening_id'),
+	('start_time', 'screening__start_time'),
+	('film_title', 'screening__film__title'),
+	('hall_name', 'screening__hall__name'),
+)
+
+CHUNK_SIZE = 2000
+
+
+def parse_filters(date_from=None, date_to=None, statuses=None):
+	filters = {}
+	for name, value, lookup, shift in (
+		('date_from', date_from, 'booking_date__gte', 0),
+		('date_to', date_to, 'booking_date__lt', 1),
+	):
+		if not value:
+			continue
+		day = parse_date(value)
+		if day is None:
+			raise ValueError(f"Некорректная дата {name}: {value}")
+		filters[lookup] = timezone.make_aware(datetime.combine(day + timedelta(days=shift), time.min))
+
+	if statuses:
+		statuses = [status.strip() for status in statuses.split(',') if status.strip()]
+		known = dict(Booking.STATUS_CHOICES)
+		unknown = [status for status in statuses if status not in known]
+		if unknown:
+			raise ValueError(f"Неизвестный статус: {', '.join(unknown)}")
+		filters['status__in'] = statuses
+	return filters
+
+
+def export_rows(filters, chunk_size=CHUNK_SIZE):
+	return (
+		Booking.objects.filter(**filters)
+		.order_by('pk')
+		.values_list(*(lookup for _, lookup in COLUMNS))
+		.iterator(chunk_size=chunk_size)
+	)
+
+
+def _value(value):
+	if isinstance(value, datetime):
+		return timezone.localtime(value).isoformat()
+	if value is None or isinstance(value, (int, str)):
+		return value
+	return str(value)
+
+
+class _Echo:
+	def write(self, value):
+		return value
+
+
+def iter_csv(rows, chunk_size=CHUNK_SIZE):
+	writer = csv.writer(_Echo())
+	yield '\ufeff' + writer.writerow([name for name, _ in COLUMNS])
+	chunk = []
+	for row in rows:
+		chunk.append(writer.writerow([_value(value) for value in row]))
+		if len(chunk) >= chunk_size:
+			yield ''.join(chunk)
+			chunk = []
+	if chunk:
+		yield ''.join(chunk)
+
+
+def iter_ndjson(rows, chunk_size=CHUNK_SIZE):
+	names = [name for name, _ in COLUMNS]
+	chunk = []
+	for row in rows:
+		chunk.append(json.dumps(dict(zip(names, map(_value, row))), ensure_ascii=False) + '\n')
+		if len(chunk) >= chunk_size:
+			yield ''.join(chunk)
+			chunk = []
+	if chunk:
+		yield ''.join(chunk)
+
+
+def export_bookings(output, filters, chunk_size=CHUNK_SIZE):
+	write = iter_csv if output == 'csv' else iter_ndjson
+	return write(export_rows(filters, chunk_size), chunk_size)
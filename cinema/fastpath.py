@@ -0,0 +1,163 @@
+# Быстрый путь сериализации списков: строки берутся через .values(), а
+# представление каждого поля считается заранее подготовленной функцией
+# вместо полного прохода ModelSerializer по объектам модели. Результат
+# совпадает с serializer.data байт в байт (см. tests/integration/test_fastpath.py).
+# Включается настройкой FAST_SERIALIZATION.
+from collections import defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, SlugRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .metrics import timed_serialization
+
+# Поля, у которых to_representation не меняет значение, пришедшее из .values().
+_PASSTHROUGH = (
+	serializers.BooleanField,
+	serializers.CharField,
+	serializers.ChoiceField,
+	serializers.EmailField,
+	serializers.IntegerField,
+	serializers.ReadOnlyField,
+)
+
+
+def _convert(lookup, to_representation):
+	def extract(row):
+		value = row[lookup]
+		return None if value is None else to_representation(value)
+	return extract
+
+
+def _iso_datetime(lookup, field):
+	# То же, что DateTimeField.to_representation, но часовой пояс
+	# определяется один раз на пачку строк, а не для каждого значения.
+	def make():
+		tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+
+		def extract(row):
+			value = row[lookup]
+			if value is None:
+				return None
+			value = value.astimezone(tz).isoformat()
+			return value[:-6] + 'Z' if value.endswith('+00:00') else value
+		return extract
+	return make
+
+
+def _fixed(extract):
+	return lambda: extract
+
+
+def _empty_list(row):
+	return []
+
+
+class FastSerializer:
+	def __init__(self, serializer_class, **computed):
+		self.serializer_class = serializer_class
+		self.computed = computed
+		self._plan = None
+
+	def _compile(self):
+		serializer = self.serializer_class()
+		opts = serializer.Meta.model._meta
+		lookups = {opts.pk.attname}
+		extractors = []
+		many = []
+
+		for name, field in serializer.fields.items():
+			if field.write_only:
+				continue
+
+			if name in self.computed:
+				needed, extract = self.computed[name]
+				lookups.update(needed)
+				extractors.append((name, _fixed(extract)))
+				continue
+			if isinstance(field, ManyRelatedField):
+				many.append((name, opts.get_field(field.source), self._related_value(field.child_relation)))
+				extractors.append((name, _fixed(_empty_list)))
+				continue
+
+			lookup = '__'.join(field.source_attrs)
+			if isinstance(field, SlugRelatedField):
+				lookup = f'{lookup}__{field.slug_field}'
+				make = _fixed(itemgetter(lookup))
+			elif isinstance(field, PrimaryKeyRelatedField) or type(field) in _PASSTHROUGH:
+				make = _fixed(itemgetter(lookup))
+			elif isinstance(field, serializers.RelatedField):
+				raise ImproperlyConfigured(f"Поле {name} не поддерживается быстрой сериализацией")
+			elif isinstance(field, serializers.JSONField) and not field.binary:
+				make = _fixed(itemgetter(lookup))
+			elif (
+				type(field) is serializers.DateTimeField and settings.USE_TZ
+				and getattr(field, 'format', api_settings.DATETIME_FORMAT).lower() == ISO_8601
+			):
+				make = _iso_datetime(lookup, field)
+			else:
+				make = _fixed(_convert(lookup, field.to_representation))
+			lookups.add(lookup)
+			extractors.append((name, make))
+
+		return sorted(lookups), extractors, many
+
+	@staticmethod
+	def _related_value(field):
+		if isinstance(field, PrimaryKeyRelatedField):
+			return 'pk'
+		if isinstance(field, SlugRelatedField):
+			return field.slug_field
+		raise ImproperlyConfigured(f"Связь {field.__class__.__name__} не поддерживается быстрой сериализацией")
+
+	@property
+	def plan(self):
+		if self._plan is None:
+			self._plan = self._compile()
+		return self._plan
+
+	def values(self, queryset):
+		return queryset.prefetch_related(None).values(*self.plan[0])
+
+	@timed_serialization
+	def to_representation(self, rows):
+		_, factories, many = self.plan
+		extractors = [(name, make()) for name, make in factories]
+		data = [{name: extract(row) for name, extract in extractors} for row in rows]
+		if many and data:
+			pk_name = self.serializer_class.Meta.model._meta.pk.attname
+			ids = [row[pk_name] for row in rows]
+			for name, relation, value in many:
+				related = defaultdict(list)
+				query_name = relation.related_query_name()
+				for pk, item in relation.related_model._default_manager.filter(
+					**{f'{query_name}__in': ids}
+				).values_list(query_name, value):
+					related[pk].append(item)
+				for row_id, item in zip(ids, data):
+					item[name] = related.get(row_id, [])
+		return data
+
+	def serialize(self, queryset):
+		return self.to_representation(list(self.values(queryset)))
+
+
+class FastListMixin:
+	fast_serializer = None
+
+	def fast_serialization_enabled(self):
+		return settings.FAST_SERIALIZATION and self.fast_serializer is not None
+
+	def list(self, request, *args, **kwargs):
+		if not self.fast_serialization_enabled():
+			return super().list(request, *args, **kwargs)
+
+		queryset = self.fast_serializer.values(self.filter_queryset(self.get_queryset()))
+		page = self.paginate_queryset(queryset)
+		if page is not None:
+			return self.get_paginated_response(self.fast_serializer.to_representation(page))
+		return Response(self.fast_serializer.to_representation(list(queryset)))
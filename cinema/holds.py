@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Screening, Booking
+
+
+def hold_expiry(now=None):
+	return (now or timezone.now()) + timedelta(seconds=settings.BOOKING_HOLD_TTL)
+
+
+def expired_holds(now=None):
+	return Booking.objects.filter(status='pending', expires_at__lte=now or timezone.now())
+
+
+@transaction.atomic
+def release_screening_holds(screening_id, now=None):
+	screening = Screening(pk=screening_id)
+	screening.lock_inventory()
+
+	# Подтверждение брони не берёт блокировку сеанса, поэтому сами брони
+	# блокируем тоже: освобождаем места только тех, что всё ещё ждут оплаты.
+	bookings = expired_holds(now).filter(screening_id=screening_id).select_for_update()
+	rows = list(bookings.values_list('pk', 'seats', 'seat_numbers'))
+	if not rows:
+		return 0
+
+	Booking.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(status='cancelled', expires_at=None)
+	screening.release_seats(
+		sum(seats for _, seats, _ in rows),
+		[seat for _, _, seat_numbers in rows for seat in seat_numbers]
+	)
+	return len(rows)
+
+
+def expire_holds(batch_size=100, now=None):
+	now = now or timezone.now()
+	screening_ids = list(
+		expired_holds(now).order_by().values_list('screening_id', flat=True).distinct()[:batch_size]
+	)
+	return sum(release_screening_holds(screening_id, now) for screening_id in screening_ids)
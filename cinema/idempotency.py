@@ -0,0 +1,75 @@
+# Ключи идемпотентности (заголовок Idempotency-Key). Ключ записывается в той
+# же транзакции, что и результат запроса: параллельный повтор с тем же ключом
+# ждёт на уникальном индексе и получает сохранённый ответ, а не выполняет
+# операцию второй раз.
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+
+
+def fingerprint(data):
+	return hashlib.sha256(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode()).hexdigest()
+
+
+def idempotent(scope):
+	def decorator(view):
+		@wraps(view)
+		def wrapper(self, request, *args, **kwargs):
+			key = request.headers.get(HEADER)
+			if not key:
+				return view(self, request, *args, **kwargs)
+			if len(key) > 255:
+				return Response(
+					{'error': 'Слишком длинный ключ идемпотентности'},
+					status=status.HTTP_400_BAD_REQUEST
+				)
+
+			request_scope = scope.format(**kwargs)
+			request_fingerprint = fingerprint(request.data)
+			with transaction.atomic():
+				try:
+					with transaction.atomic():
+						record = IdempotencyKey.objects.create(
+							key=key, scope=request_scope, fingerprint=request_fingerprint
+						)
+				except IntegrityError:
+					record = IdempotencyKey.objects.get(key=key, scope=request_scope)
+					if record.fingerprint != request_fingerprint:
+						return Response(
+							{'error': 'Ключ идемпотентности уже использован для другого запроса'},
+							status=status.HTTP_422_UNPROCESSABLE_ENTITY
+						)
+					return Response(
+						record.response_body,
+						status=record.status_code,
+						headers={'Idempotent-Replayed': 'true'}
+					)
+
+				response = view(self, request, *args, **kwargs)
+				if response.status_code >= 500:
+					transaction.set_rollback(True)
+					return response
+				record.status_code = response.status_code
+				record.response_body = response.data
+				record.save(update_fields=['status_code', 'response_body'])
+				return response
+		return wrapper
+	return decorator
+
+
+def purge_idempotency_keys(now=None):
+	cutoff = (now or timezone.now()) - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+	deleted, _ = IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+	return deleted
@@ -0,0 +1,68 @@
+# Денормализованная витрина сеансов (ScreeningListing): всё, что нужно для
+# списка, лежит в одной строке без JOIN. Строки пересчитываются при
+# сохранении сеанса, переименовании фильма или зала и внутри транзакции,
+# меняющей свободные места.
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import fields
+
+from .models import Screening, ScreeningListing
+
+UPDATE_FIELDS = ('film', 'film_title', 'hall', 'hall_name', 'start_time', 'end_time', 'price', 'available_seats')
+
+_datetime = fields.DateTimeField()
+_decimal = fields.DecimalField(max_digits=8, decimal_places=2)
+
+
+def build_listing(screening):
+	return ScreeningListing(
+		screening_id=screening.pk,
+		film_id=screening.film_id,
+		film_title=screening.film.title,
+		hall_id=screening.hall_id,
+		hall_name=screening.hall.name,
+		start_time=screening.start_time,
+		end_time=screening.end_time,
+		price=screening.price,
+		available_seats=screening.available_seats
+	)
+
+
+def refresh_listings(screening_ids):
+	# Отменённые сеансы в витрину не попадают: cancel_bookings() удаляет их строки.
+	screenings = Screening.objects.filter(pk__in=screening_ids, is_cancelled=False)
+	screenings = screenings.select_related('film', 'hall').only(
+		'film', 'hall', 'start_time', 'end_time', 'price', 'available_seats', 'film__title', 'hall__name'
+	)
+	ScreeningListing.objects.bulk_create(
+		[build_listing(screening) for screening in screenings],
+		update_conflicts=True,
+		unique_fields=['screening'],
+		update_fields=UPDATE_FIELDS
+	)
+
+
+def listing_values(queryset):
+	return queryset.values(
+		'film', 'film_title', 'hall', 'hall_name', 'start_time', 'end_time', 'price', 'available_seats',
+		id=F('screening_id')
+	)
+
+
+def listing_rows(rows):
+	now = timezone.now()
+	return [
+		{
+			'id': row['id'],
+			'film': row['film'],
+			'film_title': row['film_title'],
+			'hall': row['hall'],
+			'hall_name': row['hall_name'],
+			'start_time': _datetime.to_representation(row['start_time']),
+			'end_time': _datetime.to_representation(row['end_time']),
+			'price': _decimal.to_representation(row['price']),
+			'available_seats': row['available_seats'],
+			'is_available': row['available_seats'] > 0 and row['start_time'] > now,
+		}
+		for row in rows
+	]
@@ -0,0 +1,75 @@
+# Логирование без записи на диск в потоке запроса. CinemaConfig.ready()
+# заменяет обработчики корневого логгера и логгера django на QueueHandler,
+# а настоящие обработчики (консоль, файл) обслуживает
+# QueueListener в отдельном потоке. В файл записи пишутся JSON-строками
+# (JSONFormatter), поля из extra попадают в JSON как есть.
+import atexit
+import copy
+import json
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+_listeners = []
+
+
+class JSONFormatter(logging.Formatter):
+	def format(self, record):
+		data = {
+			'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+			'level': record.levelname,
+			'logger': record.name,
+			'message': record.getMessage(),
+		}
+		data.update((key, value) for key, value in vars(record).items() if key not in _RECORD_FIELDS)
+		if record.exc_info:
+			data['exc_info'] = self.formatException(record.exc_info)
+		elif record.exc_text:
+			data['exc_info'] = record.exc_text
+		if record.stack_info:
+			data['stack_info'] = self.formatStack(record.stack_info)
+		return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+	# Стандартный prepare() склеивает трейсбек с сообщением; здесь он
+	# остаётся в exc_text, чтобы JSONFormatter вынес его в отдельное поле.
+	def prepare(self, record):
+		record = copy.copy(record)
+		record.msg = record.getMessage()
+		record.args = None
+		if record.exc_info:
+			record.exc_text = logging.Formatter().formatException(record.exc_info)
+			record.exc_info = None
+		return record
+
+
+def start_queue_logging(logger_names=('', 'django')):
+	queue_handlers = {}
+	for name in logger_names:
+		logger = logging.getLogger(name)
+		handlers = tuple(handler for handler in logger.handlers if not isinstance(handler, QueueHandler))
+		if not handlers:
+			continue
+
+		queue_handler = queue_handlers.get(handlers)
+		if queue_handler is None:
+			queue = SimpleQueue()
+			listener = QueueListener(queue, *handlers, respect_handler_level=True)
+			listener.start()
+			if not _listeners:
+				atexit.register(stop_queue_logging)
+			_listeners.append(listener)
+			queue_handler = queue_handlers[handlers] = StructuredQueueHandler(queue)
+
+		for handler in handlers:
+			logger.removeHandler(handler)
+		logger.addHandler(queue_handler)
+
+
+def stop_queue_logging():
+	while _listeners:
+		_listeners.pop().stop()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from cinema.archive import archive_screenings
+
+
+class Command(BaseCommand):
+	help = 'Переносит прошедшие сеансы старше ARCHIVE_AFTER_DAYS дней вместе с бронями в архив'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--batch-size', type=int, default=100, help='Сколько сеансов переносить за транзакцию')
+
+	def handle(self, *args, **options):
+		screenings, bookings = archive_screenings(batch_size=options['batch_size'])
+		self.stdout.write(self.style.SUCCESS(f"В архив перенесено сеансов: {screenings}, броней: {bookings}"))
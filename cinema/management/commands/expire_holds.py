@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cinema.holds import expire_holds
+from cinema.idempotency import purge_idempotency_keys
+
+
+class Command(BaseCommand):
+	help = 'Снимает просроченные временные брони, возвращает места в продажу и удаляет старые ключи идемпотентности'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--batch-size', type=int, default=100, help='Сколько сеансов обрабатывать за проход')
+		parser.add_argument('--loop', action='store_true', help='Работать постоянно как фоновый процесс')
+		parser.add_argument('--interval', type=float, default=30, help='Пауза между проходами в секундах')
+
+	def handle(self, *args, **options):
+		while True:
+			total = 0
+			while True:
+				expired = expire_holds(batch_size=options['batch_size'])
+				total += expired
+				if not expired:
+					break
+			purge_idempotency_keys()
+
+			if total or not options['loop']:
+				self.stdout.write(self.style.SUCCESS(f"Снято просроченных броней: {total}"))
+			if not options['loop']:
+				return
+			time.sleep(options['interval'])
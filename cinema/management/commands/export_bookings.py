@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cinema import exports
+
+
+class Command(BaseCommand):
+	help = 'Выгружает брони в CSV или NDJSON для бухгалтерии'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--output', choices=sorted(exports.FORMATS), default='csv', help='Формат выгрузки')
+		parser.add_argument('--path', default='-', help='Файл для записи, по умолчанию stdout')
+		parser.add_argument('--date-from', help='Начальная дата брони, ГГГГ-ММ-ДД')
+		parser.add_argument('--date-to', help='Конечная дата брони включительно, ГГГГ-ММ-ДД')
+		parser.add_argument('--status', help='Статусы через запятую')
+		parser.add_argument('--chunk-size', type=int, default=exports.CHUNK_SIZE)
+
+	def handle(self, *args, **options):
+		try:
+			filters = exports.parse_filters(options['date_from'], options['date_to'], options['status'])
+		except ValueError as e:
+			raise CommandError(str(e))
+
+		chunks = exports.export_bookings(options['output'], filters, options['chunk_size'])
+		if options['path'] == '-':
+			for chunk in chunks:
+				self.stdout.write(chunk, ending='')
+			return
+
+		try:
+			with open(options['path'], 'w', encoding='utf-8', newline='') as f:
+				for chunk in chunks:
+					f.write(chunk)
+		except OSError as e:
+			raise CommandError(f"Не удалось записать файл: {e}")
+		self.stdout.write(self.style.SUCCESS(f"Выгрузка сохранена в {options['path']}"))
@@ -0,0 +1,30 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cinema.schedule_import import import_screenings
+
+
+class Command(BaseCommand):
+	help = 'Импортирует расписание сеансов из CSV или JSON файла'
+
+	def add_arguments(self, parser):
+		parser.add_argument('path', help='Путь к файлу .csv или .json')
+		parser.add_argument('--batch-size', type=int, default=1000)
+
+	def handle(self, *args, **options):
+		path = options['path']
+		try:
+			with open(path, encoding='utf-8-sig', newline='') as f:
+				rows = list(csv.DictReader(f)) if path.endswith('.csv') else json.load(f)
+		except (OSError, ValueError) as e:
+			raise CommandError(f"Не удалось прочитать файл: {e}")
+
+		created, errors = import_screenings(rows, batch_size=options['batch_size'])
+		for error in errors:
+			self.stderr.write(f"Строка {error['row']}: {error['errors']}")
+		if errors:
+			raise CommandError(f"Импорт отклонён, ошибок: {len(errors)}")
+
+		self.stdout.write(self.style.SUCCESS(f"Импортировано сеансов: {created}"))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cinema.outbox import process_outbox
+
+
+class Command(BaseCommand):
+	help = 'Рассылает уведомления из очереди исходящих сообщений'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--batch-size', type=int, default=100, help='Сколько сообщений обрабатывать за проход')
+		parser.add_argument('--loop', action='store_true', help='Работать постоянно как фоновый процесс')
+		parser.add_argument('--interval', type=float, default=5, help='Пауза между проходами в секундах')
+
+	def handle(self, *args, **options):
+		while True:
+			total = 0
+			while True:
+				processed = process_outbox(batch_size=options['batch_size'])
+				total += processed
+				if processed < options['batch_size']:
+					break
+
+			if total or not options['loop']:
+				self.stdout.write(self.style.SUCCESS(f"Обработано сообщений: {total}"))
+			if not options['loop']:
+				return
+			time.sleep(options['interval'])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cinema.analytics import rebuild_sales
+
+
+class Command(BaseCommand):
+	help = 'Пересчитывает сводные таблицы аналитики продаж по броням и сеансам'
+
+	def handle(self, *args, **options):
+		rows = rebuild_sales()
+		self.stdout.write(self.style.SUCCESS(f"Пересчитано строк аналитики: {rows}"))
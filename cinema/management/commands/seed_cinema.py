@@ -0,0 +1,52 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from cinema.seeding import CHUNK_SIZE, seed
+
+
+class Command(BaseCommand):
+	help = 'Заполняет базу фильмами, залами, сеансами и бронями пачками для стендов и нагрузочных тестов'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--films', type=int, default=1000)
+		parser.add_argument('--halls', type=int, default=20)
+		parser.add_argument('--screenings', type=int, default=10000)
+		parser.add_argument('--bookings', type=int, default=1000000)
+		parser.add_argument('--first-day', help='Первый день расписания, ГГГГ-ММ-ДД; по умолчанию завтра')
+		parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+		parser.add_argument('--no-copy', action='store_true', help='Писать брони через bulk_create даже на PostgreSQL')
+		parser.add_argument('--random-seed', type=int, help='Зерно генератора для воспроизводимых данных')
+
+	def handle(self, *args, **options):
+		first_day = None
+		if options['first_day']:
+			first_day = parse_date(options['first_day'])
+			if first_day is None:
+				raise CommandError("Некорректная дата, ожидается ГГГГ-ММ-ДД")
+		if min(options['films'], options['halls']) <= 0 and options['screenings'] > 0:
+			raise CommandError("Для сеансов нужны хотя бы один фильм и один зал")
+		if options['random_seed'] is not None:
+			random.seed(options['random_seed'])
+
+		started = time.perf_counter()
+
+		def progress(screenings, bookings):
+			self.stdout.write(f"Сеансов: {screenings}, броней: {bookings}")
+
+		result = seed(
+			films=options['films'],
+			halls=options['halls'],
+			screenings=options['screenings'],
+			bookings=options['bookings'],
+			first_day=first_day,
+			chunk_size=options['chunk_size'],
+			use_copy=False if options['no_copy'] else None,
+			progress=progress
+		)
+		self.stdout.write(self.style.SUCCESS(
+			f"Создано фильмов: {result['films']}, залов: {result['halls']}, сеансов: {result['screenings']}, "
+			f"броней: {result['bookings']} за {time.perf_counter() - started:.1f} с"
+		))
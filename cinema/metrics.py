@@ -0,0 +1,152 @@
+# Метрики запросов в формате Prometheus: длительность по view и action,
+# число и время SQL-запросов (connection.execute_wrapper) и время
+# сериализации. При METRICS_ENABLED=False middleware снимает себя из цепочки
+# (MiddlewareNotUsed), а сериализаторы видят пустой контекст и ничего не
+# меряют. Под gunicorn с несколькими воркерами задайте
+# PROMETHEUS_MULTIPROC_DIR, тогда /metrics собирает данные всех процессов.
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import Http404, HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest, multiprocess
+
+REGISTRY = CollectorRegistry()
+
+REQUEST_DURATION = Histogram(
+	'cinema_request_duration_seconds', 'Время обработки запроса',
+	['view', 'method', 'status'], registry=REGISTRY
+)
+DB_QUERIES = Histogram(
+	'cinema_request_db_queries', 'Число SQL-запросов на HTTP-запрос',
+	['view'], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float('inf')), registry=REGISTRY
+)
+DB_DURATION = Histogram(
+	'cinema_request_db_duration_seconds', 'Время SQL-запросов на HTTP-запрос',
+	['view'], registry=REGISTRY
+)
+SERIALIZER_DURATION = Histogram(
+	'cinema_request_serializer_duration_seconds', 'Время сериализации ответа',
+	['view'], registry=REGISTRY
+)
+
+_current = ContextVar('request_metrics', default=None)
+_END = object()
+
+
+class RequestMetrics:
+	__slots__ = ('view', 'queries', 'db_time', 'serializer_time')
+
+	def __init__(self):
+		self.view = 'unmatched'
+		self.queries = 0
+		self.db_time = 0.0
+		self.serializer_time = 0.0
+
+	def __call__(self, execute, sql, params, many, context):
+		start = perf_counter()
+		try:
+			return execute(sql, params, many, context)
+		finally:
+			self.queries += 1
+			self.db_time += perf_counter() - start
+
+
+def view_label(view_func, method):
+	cls = getattr(view_func, 'cls', None)
+	if cls is None:
+		return f'{view_func.__module__}.{view_func.__name__}'
+	action = (getattr(view_func, 'actions', None) or {}).get(method.lower())
+	return f'{cls.__name__}.{action}' if action else cls.__name__
+
+
+def timed_serialization(method):
+	@wraps(method)
+	def wrapper(self, data):
+		metrics = _current.get()
+		if metrics is None:
+			return method(self, data)
+		start = perf_counter()
+		try:
+			return method(self, data)
+		finally:
+			metrics.serializer_time += perf_counter() - start
+	return wrapper
+
+
+class TimedSerializerMixin:
+	@timed_serialization
+	def to_representation(self, instance):
+		return super().to_representation(instance)
+
+
+@contextmanager
+def collecting(metrics):
+	token = _current.set(metrics)
+	try:
+		with connection.execute_wrapper(metrics):
+			yield
+	finally:
+		_current.reset(token)
+
+
+def _collecting_iterator(content, metrics):
+	# Контекст включается только на время next(), а не между yield:
+	# иначе ContextVar и execute_wrapper протекли бы в код, читающий ответ.
+	iterator = iter(content)
+	while True:
+		with collecting(metrics):
+			chunk = next(iterator, _END)
+		if chunk is _END:
+			return
+		yield chunk
+
+
+class MetricsMiddleware:
+	def __init__(self, get_response):
+		if not settings.METRICS_ENABLED:
+			raise MiddlewareNotUsed
+		self.get_response = get_response
+
+	def __call__(self, request):
+		metrics = RequestMetrics()
+		start = perf_counter()
+		with collecting(metrics):
+			response = self.get_response(request)
+
+		# Тело StreamingHttpResponse строится уже после возврата из view:
+		# запросы к БД при итерации тоже считаем, а наблюдение пишем при
+		# закрытии ответа, когда тело отдано целиком.
+		if response.streaming and not response.is_async:
+			response.streaming_content = _collecting_iterator(response.streaming_content, metrics)
+			response._resource_closers.append(lambda: self.observe(request, response, metrics, start))
+		else:
+			self.observe(request, response, metrics, start)
+		return response
+
+	def observe(self, request, response, metrics, start):
+		view = metrics.view
+		REQUEST_DURATION.labels(view, request.method, response.status_code).observe(perf_counter() - start)
+		DB_QUERIES.labels(view).observe(metrics.queries)
+		DB_DURATION.labels(view).observe(metrics.db_time)
+		SERIALIZER_DURATION.labels(view).observe(metrics.serializer_time)
+
+	def process_view(self, request, view_func, view_args, view_kwargs):
+		metrics = _current.get()
+		if metrics is not None:
+			metrics.view = view_label(view_func, request.method)
+
+
+def metrics_view(request):
+	if not settings.METRICS_ENABLED:
+		raise Http404
+	registry = REGISTRY
+	if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+		registry = CollectorRegistry()
+		multiprocess.MultiProcessCollector(registry)
+	return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
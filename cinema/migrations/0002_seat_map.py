@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+from cinema import seatmap
+
+
+def build_seat_maps(apps, schema_editor):
+    Screening = apps.get_model('cinema', 'Screening')
+    Booking = apps.get_model('cinema', 'Booking')
+
+    for screening in Screening.objects.select_related('hall').iterator():
+        capacity = screening.hall.capacity
+        occupied = min(max(capacity - screening.available_seats, 0), capacity)
+        assigned = 0
+
+        bookings = Booking.objects.filter(screening=screening).exclude(status='cancelled').order_by('booking_date')
+        for booking in bookings:
+            if assigned + booking.seats > occupied:
+                break
+            booking.seat_numbers = [[1, index + 1] for index in range(assigned, assigned + booking.seats)]
+            booking.save(update_fields=['seat_numbers'])
+            assigned += booking.seats
+
+        screening.seat_map = seatmap.build(capacity, occupied)
+        screening.save(update_fields=['seat_map'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cinemahall',
+            name='row_sizes',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='screening',
+            name='seat_map',
+            field=models.BinaryField(default=b'', editable=False),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='seat_numbers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(build_seat_maps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0002_seat_map'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['expires_at'], name='booking_pending_expiry_idx'),
+        ),
+    ]
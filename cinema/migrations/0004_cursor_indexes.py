@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0003_booking_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='film',
+            index=models.Index(fields=['title', 'id'], name='film_title_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='screening',
+            index=models.Index(fields=['start_time', 'id'], name='screening_start_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-booking_date', '-id'], name='booking_date_cursor_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+OVERLAP_CONSTRAINT = 'screening_hall_no_overlap'
+
+
+def add_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'ALTER TABLE cinema_screening ADD CONSTRAINT {OVERLAP_CONSTRAINT} '
+        'EXCLUDE USING gist (hall_id WITH =, tstzrange(start_time, end_time) WITH &&)'
+    )
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'ALTER TABLE cinema_screening DROP CONSTRAINT IF EXISTS {OVERLAP_CONSTRAINT}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0004_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='screening',
+            index=models.Index(fields=['hall', 'start_time', 'end_time'], name='screening_hall_time_idx'),
+        ),
+        BtreeGistExtension(),
+        migrations.RunPython(add_overlap_constraint, drop_overlap_constraint),
+    ]
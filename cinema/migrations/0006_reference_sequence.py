@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+SEQUENCE_NAME = 'cinema_booking_reference_seq'
+
+
+def create_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCE_NAME}')
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP SEQUENCE IF EXISTS {SEQUENCE_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0005_screening_overlap'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
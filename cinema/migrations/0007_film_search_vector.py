@@ -0,0 +1,36 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "UPDATE cinema_film SET search_vector = "
+        "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('russian', coalesce(genre, '')), 'C')"
+    )
+    schema_editor.execute('CREATE INDEX film_search_vector_idx ON cinema_film USING gin (search_vector)')
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS film_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0006_reference_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='film',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
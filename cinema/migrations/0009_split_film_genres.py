@@ -0,0 +1,44 @@
+import re
+
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def split_genres(apps, schema_editor):
+    Film = apps.get_model('cinema', 'Film')
+    Genre = apps.get_model('cinema', 'Genre')
+
+    genres = {}
+    for film in Film.objects.iterator():
+        film_genres = set()
+        for name in re.split(r'[,/;]', film.genre):
+            name = name.strip()
+            slug = slugify(name, allow_unicode=True)
+            if not slug:
+                continue
+            if slug not in genres:
+                genres[slug], _ = Genre.objects.get_or_create(
+                    slug=slug,
+                    defaults={'name': name[0].upper() + name[1:].lower()}
+                )
+            film_genres.add(genres[slug])
+        film.genres.add(*film_genres)
+
+
+def join_genres(apps, schema_editor):
+    Film = apps.get_model('cinema', 'Film')
+
+    for film in Film.objects.prefetch_related('genres').iterator(chunk_size=1000):
+        film.genre = ', '.join(genre.name for genre in film.genres.all())[:100]
+        film.save(update_fields=['genre'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0008_genre'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_genres, join_genres),
+    ]
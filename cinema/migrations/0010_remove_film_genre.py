@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0009_split_film_genres'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='film',
+            name='genre',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.RemoveField(
+            model_name='film',
+            name='genre',
+        ),
+    ]
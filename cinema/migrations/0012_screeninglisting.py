@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_listings(apps, schema_editor):
+    Screening = apps.get_model('cinema', 'Screening')
+    ScreeningListing = apps.get_model('cinema', 'ScreeningListing')
+
+    listings = [
+        ScreeningListing(
+            screening_id=screening.pk,
+            film_id=screening.film_id,
+            film_title=screening.film.title,
+            hall_id=screening.hall_id,
+            hall_name=screening.hall.name,
+            start_time=screening.start_time,
+            end_time=screening.end_time,
+            price=screening.price,
+            available_seats=screening.available_seats,
+        )
+        for screening in Screening.objects.select_related('film', 'hall').iterator(chunk_size=1000)
+    ]
+    ScreeningListing.objects.bulk_create(listings, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0011_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScreeningListing',
+            fields=[
+                ('screening', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='cinema.screening')),
+                ('film_title', models.CharField(max_length=200)),
+                ('hall_name', models.CharField(max_length=100)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('available_seats', models.PositiveIntegerField()),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinema.film')),
+                ('hall', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinema.cinemahall')),
+            ],
+            options={
+                'ordering': ['start_time'],
+                'indexes': [models.Index(fields=['start_time', 'screening'], name='listing_start_cursor_idx')],
+            },
+        ),
+        migrations.RunPython(build_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0013_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('screenings', models.PositiveIntegerField(default=0)),
+                ('capacity', models.PositiveIntegerField(default=0)),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('seats_sold', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinema.film')),
+                ('hall', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinema.cinemahall')),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [
+                    models.Index(fields=['film', 'day'], name='daily_sales_film_idx'),
+                    models.Index(fields=['hall', 'day'], name='daily_sales_hall_idx'),
+                ],
+                'constraints': [models.UniqueConstraint(fields=('day', 'film', 'hall'), name='daily_sales_key_uniq')],
+            },
+        ),
+    ]
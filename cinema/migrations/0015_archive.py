@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0014_dailysales'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedScreening',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('film_title', models.CharField(max_length=200)),
+                ('hall_name', models.CharField(max_length=100)),
+                ('capacity', models.PositiveIntegerField()),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('available_seats', models.PositiveIntegerField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('film', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='cinema.film')),
+                ('hall', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='cinema.cinemahall')),
+            ],
+            options={
+                'ordering': ['-start_time'],
+                'indexes': [models.Index(fields=['-start_time', '-id'], name='archived_screening_cursor_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('customer_name', models.CharField(max_length=100)),
+                ('customer_email', models.EmailField(max_length=254)),
+                ('customer_phone', models.CharField(max_length=20)),
+                ('seats', models.PositiveIntegerField()),
+                ('seat_numbers', models.JSONField(default=list)),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('confirmed', 'Подтверждено'), ('cancelled', 'Отменено'), ('pending', 'В ожидании')], max_length=20)),
+                ('booking_date', models.DateTimeField()),
+                ('booking_reference', models.CharField(db_index=True, max_length=10)),
+                ('expires_at', models.DateTimeField(null=True)),
+                ('screening', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='cinema.archivedscreening')),
+            ],
+            options={
+                'ordering': ['-booking_date'],
+                'indexes': [
+                    models.Index(fields=['-booking_date', '-id'], name='archived_booking_cursor_idx'),
+                    models.Index(fields=['customer_email'], name='archived_booking_email_idx'),
+                ],
+            },
+        ),
+    ]
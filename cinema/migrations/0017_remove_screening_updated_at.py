@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0016_screening_version'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='screening',
+            name='updated_at',
+        ),
+    ]
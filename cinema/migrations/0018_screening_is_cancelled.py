@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0017_remove_screening_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screening',
+            name='is_cancelled',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
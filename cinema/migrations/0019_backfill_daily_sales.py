@@ -0,0 +1,52 @@
+from django.db import migrations
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def backfill_daily_sales(apps, schema_editor):
+    # Свёртки для данных, появившихся до 0014: без них первая бронь на
+    # каждый ключ уходила бы в полный пересчёт.
+    DailySales = apps.get_model('cinema', 'DailySales')
+    sources = [
+        (apps.get_model('cinema', 'Screening'), apps.get_model('cinema', 'Booking'), 'hall__capacity'),
+        (apps.get_model('cinema', 'ArchivedScreening'), apps.get_model('cinema', 'ArchivedBooking'), 'capacity'),
+    ]
+    tz = timezone.get_current_timezone()
+    rows = {}
+
+    for screening_model, booking_model, capacity in sources:
+        screenings = screening_model.objects.exclude(film=None).exclude(hall=None).order_by().values(
+            'film_id', 'hall_id', day=TruncDate('start_time', tzinfo=tz)
+        ).annotate(screenings=Count('id'), capacity=Sum(capacity))
+        for row in screenings:
+            key = (row['day'], row['film_id'], row['hall_id'])
+            if key not in rows:
+                rows[key] = DailySales(day=row['day'], film_id=row['film_id'], hall_id=row['hall_id'], revenue=0)
+            rows[key].screenings += row['screenings']
+            rows[key].capacity += row['capacity']
+
+        bookings = booking_model.objects.filter(status='confirmed').order_by().values(
+            film_id=F('screening__film_id'), hall_id=F('screening__hall_id'),
+            day=TruncDate('screening__start_time', tzinfo=tz)
+        ).annotate(bookings=Count('id'), seats_sold=Sum('seats'), revenue=Sum('total_price'))
+        for row in bookings:
+            day_sales = rows.get((row['day'], row['film_id'], row['hall_id']))
+            if day_sales is not None:
+                day_sales.bookings += row['bookings']
+                day_sales.seats_sold += row['seats_sold']
+                day_sales.revenue += row['revenue']
+
+    DailySales.objects.all().delete()
+    DailySales.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0018_screening_is_cancelled'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_sales, migrations.RunPython.noop),
+    ]
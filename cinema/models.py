@@ -1,5 +1,31 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import F, Q
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import references, seatmap
+from .signals import sales_changed, seats_changed
+
+OVERLAP_CONSTRAINT = 'screening_hall_no_overlap'
+
+
+class Genre(models.Model):
+	name = models.CharField(max_length=100, unique=True)
+	slug = models.SlugField(max_length=100, unique=True, allow_unicode=True)
+
+	class Meta:
+		ordering = ['name']
+
+	def save(self, *args, **kwargs):
+		if not self.slug:
+			self.slug = slugify(self.name, allow_unicode=True)
+		super().save(*args, **kwargs)
+
+	def __str__(self):
+		return self.name
 
 
 class Film(models.Model):
@@ -7,12 +33,16 @@ class Film(models.Model):
 	description = models.TextField()
 	duration_minutes = models.PositiveIntegerField()
 	release_year = models.PositiveIntegerField()
-	genre = models.CharField(max_length=100)
+	genres = models.ManyToManyField(Genre, related_name='films', blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
+	search_vector = SearchVectorField(null=True, editable=False)
 
 	class Meta:
 		ordering = ['title']
+		indexes = [
+			models.Index(fields=['title', 'id'], name='film_title_cursor_idx'),
+		]
 
 	def __str__(self):
 		return f"{self.title} ({self.release_year})"
@@ -21,9 +51,21 @@ class Film(models.Model):
 class CinemaHall(models.Model):
 	name = models.CharField(max_length=100)
 	capacity = models.PositiveIntegerField()
+	row_sizes = models.JSONField(default=list, blank=True)
 	description = models.TextField(blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		if 'capacity' in field_names:
+			instance._capacity = instance.capacity
+		return instance
+
+	@property
+	def layout(self):
+		return self.row_sizes or [self.capacity]
+
 	def __str__(self):
 		return f"{self.name} (вместимость: {self.capacity})"
 
@@ -35,9 +77,23 @@ class Screening(models.Model):
 	end_time = models.DateTimeField()
 	price = models.DecimalField(max_digits=8, decimal_places=2)
 	available_seats = models.PositiveIntegerField()
+	seat_map = models.BinaryField(default=b'', editable=False)
+	version = models.PositiveIntegerField(default=1, editable=False)
+	is_cancelled = models.BooleanField(default=False, editable=False)
 
 	class Meta:
 		ordering = ['start_time']
+		indexes = [
+			models.Index(fields=['start_time', 'id'], name='screening_start_cursor_idx'),
+			models.Index(fields=['hall', 'start_time', 'end_time'], name='screening_hall_time_idx'),
+		]
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		if {'start_time', 'film_id', 'hall_id'} <= set(field_names):
+			instance._sales_key = (instance.start_time, instance.film_id, instance.hall_id)
+		return instance
 
 	def clean(self):
 		if self.start_time >= self.end_time:
@@ -53,15 +109,206 @@ class Screening(models.Model):
 			raise ValidationError("В этом зале уже есть сеанс в указанное время")
 
 	def save(self, *args, **kwargs):
-		self.full_clean()
-		if not self.available_seats:
+		if self.available_seats is None and self.hall_id:
 			self.available_seats = self.hall.capacity
-		super().save(*args, **kwargs)
+		self.full_clean()
+		if not self.seat_map:
+			capacity = self.hall.capacity
+			self.seat_map = seatmap.build(capacity, max(capacity - self.available_seats, 0))
+		try:
+			with transaction.atomic():
+				if not self._state.adding:
+					self._reload_inventory()
+				super().save(*args, **kwargs)
+		except IntegrityError as e:
+			if OVERLAP_CONSTRAINT in str(e):
+				raise ValidationError("В этом зале уже есть сеанс в указанное время")
+			raise
+
+	def _reload_inventory(self):
+		# Места меняются только через reserve_seats/release_seats, а копия
+		# в памяти могла устареть: берём их из заблокированной строки, чтобы
+		# сохранение (например, новой цены) не затёрло чужие брони.
+		locked = self.lock_inventory()
+		self.version = locked.version + 1
+		self.is_cancelled = locked.is_cancelled
+		self._sales_key = (locked.start_time, locked.film_id, locked.hall_id)
+		if locked.hall_id == self.hall_id:
+			self.available_seats = locked.available_seats
+			self.seat_map = locked.seat_map
+			return
+
+		if Booking.objects.filter(screening_id=self.pk).exclude(status='cancelled').exists():
+			raise ValidationError("Нельзя перенести сеанс с бронями в другой зал")
+		capacity = self.hall.capacity
+		self.available_seats = 0 if self.is_cancelled else capacity
+		self.seat_map = seatmap.build(capacity, capacity - self.available_seats)
+
+	def lock_inventory(self):
+		return Screening.objects.select_for_update(of=('self',)).select_related('hall').only(
+			'start_time', 'available_seats', 'seat_map', 'version', 'is_cancelled',
+			'film', 'hall', 'hall__capacity', 'hall__row_sizes'
+		).get(pk=self.pk)
+
+	@transaction.atomic
+	def reserve_seats(self, seats, seat_numbers=None):
+		locked = self.lock_inventory()
+		if locked.is_cancelled or locked.available_seats < seats:
+			return None
+
+		layout = locked.hall.layout
+		capacity = locked.hall.capacity
+		if seat_numbers:
+			try:
+				indices = [seatmap.seat_index(layout, row, seat) for row, seat in seat_numbers]
+			except ValueError:
+				return None
+			if not all(seatmap.is_free(locked.seat_map, index) for index in indices):
+				return None
+		else:
+			indices = (
+				seatmap.find_adjacent(locked.seat_map, layout, seats)
+				or seatmap.find_free(locked.seat_map, capacity, seats)
+			)
+			if indices is None:
+				return None
+
+		self._update_inventory(
+			locked,
+			seat_map=seatmap.occupy(locked.seat_map, indices, capacity),
+			available_seats=locked.available_seats - seats
+		)
+		return [seatmap.seat_position(layout, index) for index in indices]
+
+	@transaction.atomic
+	def release_seats(self, seats, seat_numbers=None):
+		locked = self.lock_inventory()
+		if locked.is_cancelled:
+			return
+
+		layout = locked.hall.layout
+		capacity = locked.hall.capacity
+		indices = [seatmap.seat_index(layout, row, seat) for row, seat in seat_numbers or []]
+		seat_map = seatmap.release(locked.seat_map, indices, capacity)
+		if seats > len(indices):
+			seat_map = seatmap.release_any(seat_map, seats - len(indices), capacity)
+
+		self._update_inventory(locked, seat_map=seat_map, available_seats=locked.available_seats + seats)
+
+	@transaction.atomic
+	def cancel_bookings(self):
+		# Сеанс снимается с продажи: все места заняты, строка витрины
+		# удаляется, а повторная отмена ничего не делает.
+		locked = self.lock_inventory()
+		if locked.is_cancelled:
+			return []
+
+		bookings = Booking.objects.filter(screening_id=self.pk).exclude(status='cancelled')
+		cancelled = list(bookings.order_by('pk').values(
+			'pk', 'booking_reference', 'customer_email', 'seats', 'status', 'total_price'
+		))
+		if cancelled:
+			bookings.update(status='cancelled', expires_at=None)
+		confirmed = [booking for booking in cancelled if booking['status'] == 'confirmed']
+		if confirmed:
+			sales_changed.send(
+				sender=Screening,
+				screening=self,
+				seats=-sum(booking['seats'] for booking in confirmed),
+				revenue=-sum(booking['total_price'] for booking in confirmed),
+				bookings=-len(confirmed)
+			)
+		capacity = locked.hall.capacity
+		self._update_inventory(locked, seat_map=seatmap.build(capacity, capacity), available_seats=0, cancel=True)
+		self.is_cancelled = True
+		return cancelled
+
+	def _update_inventory(self, locked, seat_map, available_seats, cancel=False):
+		# Вызывается под блокировкой lock_inventory(), поэтому новая версия
+		# известна заранее и не требует перечитывать строку.
+		version = locked.version + 1
+		Screening.objects.filter(pk=self.pk).update(
+			seat_map=seat_map,
+			available_seats=available_seats,
+			version=version,
+			is_cancelled=cancel
+		)
+		listing = ScreeningListing.objects.filter(pk=self.pk)
+		if cancel:
+			listing.delete()
+		else:
+			listing.update(available_seats=available_seats)
+		transaction.on_commit(lambda: seats_changed.send(
+			sender=Screening,
+			screening_id=self.pk,
+			available_seats=available_seats,
+			version=version,
+			start_time=locked.start_time,
+			is_cancelled=cancel
+		))
 
 	def __str__(self):
 		return f"{self.film.title} - {self.start_time.strftime('%d.%m.%Y %H:%M')}"
 
 
+class ScreeningListing(models.Model):
+	screening = models.OneToOneField(Screening, on_delete=models.CASCADE, primary_key=True, related_name='listing')
+	film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name='+')
+	film_title = models.CharField(max_length=200)
+	hall = models.ForeignKey(CinemaHall, on_delete=models.CASCADE, related_name='+')
+	hall_name = models.CharField(max_length=100)
+	start_time = models.DateTimeField()
+	end_time = models.DateTimeField()
+	price = models.DecimalField(max_digits=8, decimal_places=2)
+	available_seats = models.PositiveIntegerField()
+
+	class Meta:
+		ordering = ['start_time']
+		indexes = [
+			models.Index(fields=['start_time', 'screening'], name='listing_start_cursor_idx'),
+		]
+
+
+class DailySales(models.Model):
+	day = models.DateField()
+	film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name='+')
+	hall = models.ForeignKey(CinemaHall, on_delete=models.CASCADE, related_name='+')
+	screenings = models.PositiveIntegerField(default=0)
+	capacity = models.PositiveIntegerField(default=0)
+	bookings = models.PositiveIntegerField(default=0)
+	seats_sold = models.PositiveIntegerField(default=0)
+	revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+	class Meta:
+		ordering = ['day']
+		constraints = [
+			models.UniqueConstraint(fields=['day', 'film', 'hall'], name='daily_sales_key_uniq'),
+		]
+		indexes = [
+			models.Index(fields=['film', 'day'], name='daily_sales_film_idx'),
+			models.Index(fields=['hall', 'day'], name='daily_sales_hall_idx'),
+		]
+
+
+class ReferenceSequence(models.Model):
+	SEQUENCE_NAME = 'cinema_booking_reference_seq'
+
+	value = models.PositiveBigIntegerField(default=0)
+
+	@classmethod
+	def allocate(cls, count=1):
+		if connection.vendor == 'postgresql':
+			with connection.cursor() as cursor:
+				cursor.execute('SELECT nextval(%s) FROM generate_series(1, %s)', [cls.SEQUENCE_NAME, count])
+				return [row[0] for row in cursor.fetchall()]
+
+		with transaction.atomic():
+			if not cls.objects.filter(pk=1).update(value=F('value') + count):
+				cls.objects.create(pk=1, value=count)
+			last = cls.objects.values_list('value', flat=True).get(pk=1)
+		return list(range(last - count + 1, last + 1))
+
+
 class Booking(models.Model):
 	STATUS_CHOICES = [
 		('confirmed', 'Подтверждено'),
@@ -74,29 +321,158 @@ class Booking(models.Model):
 	customer_email = models.EmailField()
 	customer_phone = models.CharField(max_length=20)
 	seats = models.PositiveIntegerField()
+	seat_numbers = models.JSONField(default=list, blank=True)
 	total_price = models.DecimalField(max_digits=10, decimal_places=2)
 	status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
 	booking_date = models.DateTimeField(auto_now_add=True)
 	booking_reference = models.CharField(max_length=10, unique=True)
+	expires_at = models.DateTimeField(null=True, blank=True)
 
 	class Meta:
 		ordering = ['-booking_date']
+		indexes = [
+			models.Index(fields=['-booking_date', '-id'], name='booking_date_cursor_idx'),
+			models.Index(fields=['expires_at'], condition=Q(status='pending'), name='booking_pending_expiry_idx'),
+		]
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		if {'screening_id', 'status', 'seats', 'total_price'} <= set(field_names):
+			instance._sales = instance.sales_snapshot()
+		return instance
+
+	def sales_snapshot(self):
+		if self.status != 'confirmed':
+			return self.screening_id, (0, 0, 0)
+		return self.screening_id, (self.seats, self.total_price, 1)
 
 	def clean(self):
-		if self.seats > self.screening.available_seats:
+		# Места существующей брони уже списаны reserve_seats, сравнивать их
+		# с остатком незачем.
+		if self._state.adding and self.seats > self.screening.available_seats:
 			raise ValidationError(f"Недостаточно свободных мест. Доступно: {self.screening.available_seats}")
 
 	def save(self, *args, **kwargs):
 		if not self.booking_reference:
-			import random
-			import string
-			self.booking_reference = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+			self.booking_reference = references.encode(ReferenceSequence.allocate()[0])
 
 		if not self.total_price:
 			self.total_price = self.seats * self.screening.price
 
-		self.full_clean()
+		self.full_clean(validate_unique=False)
 		super().save(*args, **kwargs)
 
+	@transaction.atomic
+	def cancel(self):
+		screening = Screening(pk=self.screening_id)
+		screening.lock_inventory()
+
+		current = Booking.objects.select_for_update().filter(pk=self.pk).exclude(status='cancelled').only(
+			'screening_id', 'status', 'seats', 'total_price'
+		).first()
+		if current is None:
+			return False
+
+		Booking.objects.filter(pk=self.pk).update(status='cancelled', expires_at=None)
+		screening.release_seats(self.seats, self.seat_numbers)
+		if current.status == 'confirmed':
+			sales_changed.send(
+				sender=Booking,
+				screening=self.screening,
+				seats=-current.seats,
+				revenue=-current.total_price,
+				bookings=-1
+			)
+		self.status = 'cancelled'
+		self.expires_at = None
+		self._sales = self.sales_snapshot()
+		return True
+
 	def __str__(self):
 		return f"Бронь #{self.booking_reference} - {self.customer_name}"
+
+
+class ArchivedScreening(models.Model):
+	id = models.BigIntegerField(primary_key=True)
+	film = models.ForeignKey(Film, on_delete=models.SET_NULL, null=True, related_name='+')
+	film_title = models.CharField(max_length=200)
+	hall = models.ForeignKey(CinemaHall, on_delete=models.SET_NULL, null=True, related_name='+')
+	hall_name = models.CharField(max_length=100)
+	capacity = models.PositiveIntegerField()
+	start_time = models.DateTimeField()
+	end_time = models.DateTimeField()
+	price = models.DecimalField(max_digits=8, decimal_places=2)
+	available_seats = models.PositiveIntegerField()
+	archived_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		ordering = ['-start_time']
+		indexes = [
+			models.Index(fields=['-start_time', '-id'], name='archived_screening_cursor_idx'),
+		]
+
+
+class ArchivedBooking(models.Model):
+	id = models.BigIntegerField(primary_key=True)
+	screening = models.ForeignKey(ArchivedScreening, on_delete=models.CASCADE, related_name='bookings')
+	customer_name = models.CharField(max_length=100)
+	customer_email = models.EmailField()
+	customer_phone = models.CharField(max_length=20)
+	seats = models.PositiveIntegerField()
+	seat_numbers = models.JSONField(default=list)
+	total_price = models.DecimalField(max_digits=10, decimal_places=2)
+	status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+	booking_date = models.DateTimeField()
+	booking_reference = models.CharField(max_length=10, db_index=True)
+	expires_at = models.DateTimeField(null=True)
+
+	class Meta:
+		ordering = ['-booking_date']
+		indexes = [
+			models.Index(fields=['-booking_date', '-id'], name='archived_booking_cursor_idx'),
+			models.Index(fields=['customer_email'], name='archived_booking_email_idx'),
+		]
+
+
+class IdempotencyKey(models.Model):
+	key = models.CharField(max_length=255)
+	scope = models.CharField(max_length=100)
+	fingerprint = models.CharField(max_length=64)
+	status_code = models.PositiveSmallIntegerField(null=True)
+	response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['key', 'scope'], name='idempotency_key_scope_uniq'),
+		]
+		indexes = [
+			models.Index(fields=['created_at'], name='idempotency_created_idx'),
+		]
+
+
+class OutboxMessage(models.Model):
+	STATUS_CHOICES = [
+		('pending', 'В очереди'),
+		('sent', 'Отправлено'),
+		('failed', 'Ошибка'),
+	]
+
+	topic = models.CharField(max_length=50)
+	payload = models.JSONField(default=dict)
+	status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+	attempts = models.PositiveIntegerField(default=0)
+	available_at = models.DateTimeField(default=timezone.now)
+	last_error = models.TextField(blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	sent_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		ordering = ['id']
+		indexes = [
+			models.Index(fields=['available_at', 'id'], condition=Q(status='pending'), name='outbox_pending_idx'),
+		]
+
+	def __str__(self):
+		return f"{self.topic} #{self.pk}"
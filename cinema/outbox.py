@@ -0,0 +1,116 @@
+# Transactional outbox: побочные эффекты брони (письма, SMS) записываются
+# строками OutboxMessage в той же транзакции, что и сама бронь, а отдельный
+# процесс (manage.py process_outbox) рассылает их пачками с повторами.
+# Доставка «не реже одного раза»: при падении воркера посреди пачки
+# сообщения будут отправлены повторно.
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import transports
+from .models import Booking, OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def handler(topic):
+	def register(func):
+		HANDLERS[topic] = func
+		return func
+	return register
+
+
+def enqueue_booking_confirmation(booking):
+	payload = {'booking_id': booking.pk}
+	messages = [OutboxMessage(topic='booking.email', payload=payload)]
+	if booking.customer_phone:
+		messages.append(OutboxMessage(topic='booking.sms', payload=payload))
+	OutboxMessage.objects.bulk_create(messages)
+
+
+def _confirmed_booking(payload):
+	booking = (
+		Booking.objects.select_related('screening__film', 'screening__hall')
+		.filter(pk=payload['booking_id'], status='confirmed')
+		.first()
+	)
+	if booking is None:
+		logger.info("Бронь %s не подтверждена, уведомление пропущено", payload['booking_id'])
+	return booking
+
+
+def _local_start(booking):
+	return timezone.localtime(booking.screening.start_time).strftime('%d.%m.%Y %H:%M')
+
+
+@handler('booking.email')
+def send_confirmation_email(payload):
+	booking = _confirmed_booking(payload)
+	if booking is None:
+		return
+
+	screening = booking.screening
+	transports.send_email(
+		booking.customer_email,
+		f"Бронь #{booking.booking_reference} подтверждена",
+		f"{booking.customer_name}, ждём вас на фильме «{screening.film.title}».\n"
+		f"Сеанс: {_local_start(booking)}, {screening.hall.name}.\n"
+		f"Мест: {booking.seats}, сумма: {booking.total_price} руб.\n"
+		f"Номер брони: {booking.booking_reference}"
+	)
+
+
+@handler('booking.sms')
+def send_confirmation_sms(payload):
+	booking = _confirmed_booking(payload)
+	if booking is None:
+		return
+
+	transports.send_sms(
+		booking.customer_phone,
+		f"Бронь {booking.booking_reference}: «{booking.screening.film.title}», "
+		f"{_local_start(booking)}, мест: {booking.seats}"
+	)
+
+
+def retry_delay(attempts):
+	return timedelta(seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def process_outbox(batch_size=100, now=None):
+	now = now or timezone.now()
+	with transaction.atomic():
+		messages = list(
+			OutboxMessage.objects.select_for_update(skip_locked=True)
+			.filter(status='pending', available_at__lte=now)
+			.order_by('available_at', 'id')[:batch_size]
+		)
+
+		for message in messages:
+			message.attempts += 1
+			try:
+				# Точка сохранения на каждое сообщение: ошибка БД в обработчике
+				# откатывает только её, а не всю пачку вместе с bulk_update.
+				with transaction.atomic():
+					HANDLERS[message.topic](message.payload)
+			except Exception as e:
+				message.last_error = f"{type(e).__name__}: {e}"
+				if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+					message.status = 'failed'
+					logger.error("Сообщение %s не доставлено после %d попыток: %s", message, message.attempts, e)
+				else:
+					message.available_at = now + retry_delay(message.attempts)
+					logger.warning("Ошибка доставки %s, попытка %d: %s", message, message.attempts, e)
+			else:
+				message.status = 'sent'
+				message.sent_at = timezone.now()
+
+		OutboxMessage.objects.bulk_update(
+			messages, ['status', 'attempts', 'available_at', 'last_error', 'sent_at']
+		)
+	return len(messages)
@@ -0,0 +1,106 @@
+# Курсорная пагинация по составному ключу. Стандартный CursorPagination
+# ищет позицию только по первому полю сортировки, а одинаковые значения
+# (например, названия фильмов) пропускает через OFFSET. Здесь позиция —
+# значения всех полей cursor_ordering (последним всегда идёт id), так что
+# она уникальна, и следующая страница выбирается условием
+# (title, id) > (:title, :id) по составному индексу без OFFSET.
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class CinemaCursorPagination(CursorPagination):
+	page_size_query_param = 'page_size'
+	max_page_size = 200
+	ordering = ('id',)
+
+	def get_ordering(self, request, queryset, view):
+		return getattr(view, 'cursor_ordering', self.ordering)
+
+	def paginate_queryset(self, queryset, request, view=None):
+		self.request = request
+		self.page_size = self.get_page_size(request)
+		if not self.page_size:
+			return None
+
+		self.base_url = request.build_absolute_uri()
+		self.ordering = self.get_ordering(request, queryset, view)
+
+		self.cursor = self.decode_cursor(request)
+		if self.cursor is None:
+			offset, reverse, current_position = 0, False, None
+		else:
+			offset, reverse, current_position = self.cursor
+
+		if reverse:
+			queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+		else:
+			queryset = queryset.order_by(*self.ordering)
+
+		if current_position is not None:
+			queryset = queryset.filter(self._seek(current_position, reverse))
+
+		# Позиции уникальны, поэтому offset в курсорах всегда 0; ненулевой
+		# мог прийти только из курсора, собранного вручную.
+		results = list(queryset[offset:offset + self.page_size + 1])
+		self.page = results[:self.page_size]
+
+		if len(results) > len(self.page):
+			has_following_position = True
+			following_position = self._get_position_from_instance(results[-1], self.ordering)
+		else:
+			has_following_position = False
+			following_position = None
+
+		if reverse:
+			self.page = list(reversed(self.page))
+			self.has_next = current_position is not None or offset > 0
+			self.has_previous = has_following_position
+			if self.has_next:
+				self.next_position = current_position
+			if self.has_previous:
+				self.previous_position = following_position
+		else:
+			self.has_next = has_following_position
+			self.has_previous = current_position is not None or offset > 0
+			if self.has_next:
+				self.next_position = following_position
+			if self.has_previous:
+				self.previous_position = current_position
+
+		if (self.has_previous or self.has_next) and self.template is not None:
+			self.display_page_controls = True
+
+		return self.page
+
+	def _seek(self, position, reverse):
+		try:
+			values = json.loads(position)
+		except ValueError:
+			raise NotFound(self.invalid_cursor_message)
+		if not isinstance(values, list) or len(values) != len(self.ordering):
+			raise NotFound(self.invalid_cursor_message)
+
+		# (a, b) > (x, y) раскрывается в a >= x AND (a > x OR (a = x AND b > y)):
+		# первое условие даёт диапазон по ведущему столбцу индекса.
+		seek = Q()
+		equal = Q()
+		for order, value in zip(self.ordering, values):
+			name = order.lstrip('-')
+			lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+			seek |= equal & Q(**{f'{name}__{lookup}': value})
+			equal &= Q(**{name: value})
+
+		first = self.ordering[0]
+		lookup = 'lte' if first.startswith('-') != reverse else 'gte'
+		return Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & seek
+
+	def _get_position_from_instance(self, instance, ordering):
+		values = []
+		for order in ordering:
+			name = order.lstrip('-')
+			values.append(instance[name] if isinstance(instance, dict) else getattr(instance, name))
+		# str() сохраняет микросекунды, DjangoJSONEncoder обрезал бы их до миллисекунд.
+		return json.dumps(values, default=str, separators=(',', ':'))
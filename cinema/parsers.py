@@ -0,0 +1,20 @@
+import csv
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+	media_type = 'text/csv'
+
+	def parse(self, stream, media_type=None, parser_context=None):
+		parser_context = parser_context or {}
+		encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+		try:
+			text = stream.read().decode(encoding)
+			return list(csv.DictReader(io.StringIO(text.lstrip('\ufeff'))))
+		except (UnicodeDecodeError, csv.Error) as e:
+			raise ParseError(f"Ошибка разбора CSV: {e}")
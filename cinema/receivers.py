@@ -0,0 +1,136 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from . import analytics, listings, schedule_cache, search
+from .models import Film, Genre, CinemaHall, Screening, ScreeningListing, Booking
+from .signals import sales_changed, seats_changed
+
+
+@receiver(post_save, sender=Screening)
+@receiver(post_delete, sender=Screening)
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+@receiver(post_save, sender=CinemaHall)
+@receiver(post_delete, sender=CinemaHall)
+def invalidate_schedule(sender, **kwargs):
+	transaction.on_commit(schedule_cache.invalidate_schedule)
+
+
+@receiver(seats_changed)
+def update_cached_seats(sender, screening_id, available_seats, version, start_time, is_cancelled, **kwargs):
+	schedule_cache.set_seats(screening_id, available_seats, version)
+	schedule_cache.set_availability(screening_id, available_seats, version, start_time, is_cancelled)
+	if is_cancelled:
+		schedule_cache.invalidate_schedule()
+
+
+@receiver(post_save, sender=Screening)
+def update_cached_availability(sender, instance, raw=False, **kwargs):
+	if raw:
+		return
+	values = (instance.pk, instance.available_seats, instance.version, instance.start_time, instance.is_cancelled)
+	transaction.on_commit(lambda: schedule_cache.set_availability(*values))
+
+
+@receiver(post_delete, sender=Screening)
+def drop_cached_availability(sender, instance, **kwargs):
+	screening_id = instance.pk
+	transaction.on_commit(lambda: schedule_cache.drop_screenings([screening_id]))
+
+
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+def refresh_film_search(sender, instance, **kwargs):
+	search.update_search_vector([instance.pk])
+
+
+@receiver(m2m_changed, sender=Film.genres.through)
+def refresh_film_genres(sender, instance, action, reverse, pk_set, **kwargs):
+	if action not in ('post_add', 'post_remove', 'post_clear'):
+		return
+	if not reverse:
+		film_ids = [instance.pk]
+	elif pk_set:
+		film_ids = list(pk_set)
+	else:
+		film_ids = list(Film.objects.values_list('pk', flat=True))
+	search.update_search_vector(film_ids)
+
+
+@receiver(pre_delete, sender=Genre)
+def remember_genre_films(sender, instance, **kwargs):
+	instance._film_ids = list(instance.films.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def refresh_genre_films(sender, instance, created=False, **kwargs):
+	film_ids = getattr(instance, '_film_ids', None)
+	if film_ids is None and not created:
+		film_ids = list(instance.films.values_list('pk', flat=True))
+	if film_ids:
+		search.update_search_vector(film_ids)
+
+
+@receiver(post_save, sender=Screening)
+def refresh_screening_listing(sender, instance, raw=False, **kwargs):
+	if not raw:
+		listings.refresh_listings([instance.pk])
+
+
+@receiver(post_save, sender=Film)
+def rename_film_listings(sender, instance, created, **kwargs):
+	if not created:
+		ScreeningListing.objects.filter(film_id=instance.pk).update(film_title=instance.title)
+
+
+@receiver(post_save, sender=CinemaHall)
+def rename_hall_listings(sender, instance, created, **kwargs):
+	if not created:
+		ScreeningListing.objects.filter(hall_id=instance.pk).update(hall_name=instance.name)
+
+
+@receiver(post_save, sender=Booking)
+def record_booking_sales(sender, instance, created, raw=False, **kwargs):
+	if raw:
+		return
+	previous = (None, analytics.NO_SALES) if created else getattr(instance, '_sales', (None, analytics.NO_SALES))
+	analytics.booking_changed(instance, previous)
+	instance._sales = instance.sales_snapshot()
+
+
+@receiver(post_delete, sender=Booking)
+def remove_booking_sales(sender, instance, **kwargs):
+	screening_id, (seats, revenue, bookings) = getattr(instance, '_sales', instance.sales_snapshot())
+	if not bookings:
+		return
+	screening = Screening.objects.only('start_time', 'film_id', 'hall_id').filter(pk=screening_id).first()
+	if screening is not None:
+		sales_changed.send(sender=Booking, screening=screening, seats=-seats, revenue=-revenue, bookings=-bookings)
+
+
+@receiver(sales_changed)
+def record_sales(sender, screening, seats, revenue, bookings, **kwargs):
+	analytics.record_sales(analytics.sales_key(screening), seats, revenue, bookings)
+
+
+@receiver(post_save, sender=Screening)
+def record_screening_sales(sender, instance, created, raw=False, **kwargs):
+	if raw:
+		return
+	analytics.screening_changed(instance, created, getattr(instance, '_sales_key', None))
+	instance._sales_key = (instance.start_time, instance.film_id, instance.hall_id)
+
+
+@receiver(post_delete, sender=Screening)
+def remove_screening_sales(sender, instance, **kwargs):
+	analytics.screening_removed(instance, instance.hall.capacity)
+
+
+@receiver(post_save, sender=CinemaHall)
+def refresh_hall_sales(sender, instance, created, raw=False, **kwargs):
+	previous = getattr(instance, '_capacity', None)
+	if not created and not raw and previous is not None and previous != instance.capacity:
+		analytics.hall_resized(instance, previous)
+	instance._capacity = instance.capacity
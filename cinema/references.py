@@ -0,0 +1,66 @@
+# Номера броней: порядковый номер из последовательности БД, перемешанный
+# обратимой перестановкой (сеть Фейстеля) и записанный 7 символами base32
+# Крокфорда плюс контрольный символ (Luhn mod 32). Разные номера дают разные
+# коды, поэтому проверять уникальность или повторять генерацию не нужно —
+# пока не меняется ключ перестановки BOOKING_REFERENCE_KEY.
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+CODE_LENGTH = 7
+
+_BITS = CODE_LENGTH * 5
+_HALF = (_BITS + 1) // 2
+_HALF_MASK = (1 << _HALF) - 1
+_ROUNDS = 4
+
+
+@lru_cache(maxsize=1)
+def _round_keys():
+	secret = settings.BOOKING_REFERENCE_KEY.encode()
+	return [hashlib.blake2b(secret, digest_size=16, person=f'booking{i}'.encode()).digest() for i in range(_ROUNDS)]
+
+
+def _round(value, key):
+	digest = hashlib.blake2b(value.to_bytes(3, 'big'), digest_size=3, key=key).digest()
+	return int.from_bytes(digest, 'big') & _HALF_MASK
+
+
+def permute(number):
+	if not 0 <= number < 1 << _BITS:
+		raise ValueError("Номер вне допустимого диапазона")
+
+	keys = _round_keys()
+	while True:
+		left, right = number >> _HALF, number & _HALF_MASK
+		for key in keys:
+			left, right = right, left ^ _round(right, key)
+		number = left << _HALF | right
+		if number < 1 << _BITS:
+			return number
+
+
+def check_char(code):
+	total = 0
+	factor = 2
+	for char in reversed(code):
+		addend = factor * ALPHABET.index(char)
+		total += addend // len(ALPHABET) + addend % len(ALPHABET)
+		factor = 3 - factor
+	return ALPHABET[-total % len(ALPHABET)]
+
+
+def encode(number):
+	value = permute(number)
+	code = ''.join(ALPHABET[value >> shift & 31] for shift in range(_BITS - 5, -1, -5))
+	return code + check_char(code)
+
+
+def is_valid(reference):
+	return (
+		len(reference) == CODE_LENGTH + 1
+		and all(char in ALPHABET for char in reference)
+		and check_char(reference[:-1]) == reference[-1]
+	)
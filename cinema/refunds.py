@@ -0,0 +1,33 @@
+# Отчёт об отмене сеанса в формате NDJSON: первой строкой итог, затем по
+# строке на каждую отменённую бронь. Возврат положен только за
+# подтверждённые брони, временные брони не оплачены.
+import json
+from decimal import Decimal
+
+
+def refund_amount(booking):
+	return booking['total_price'] if booking['status'] == 'confirmed' else Decimal('0.00')
+
+
+def cancellation_summary(screening_id, bookings):
+	refunds = [refund_amount(booking) for booking in bookings]
+	return {
+		'screening': screening_id,
+		'cancelled': len(bookings),
+		'seats_released': sum(booking['seats'] for booking in bookings),
+		'refunds': sum(1 for amount in refunds if amount),
+		'refunded_total': str(sum(refunds, Decimal('0.00'))),
+	}
+
+
+def cancellation_report(screening_id, bookings):
+	yield json.dumps({'summary': cancellation_summary(screening_id, bookings)}, ensure_ascii=False) + '\n'
+	for booking in bookings:
+		yield json.dumps({
+			'booking': booking['pk'],
+			'booking_reference': booking['booking_reference'],
+			'customer_email': booking['customer_email'],
+			'seats': booking['seats'],
+			'status': booking['status'],
+			'refund': str(refund_amount(booking)),
+		}, ensure_ascii=False) + '\n'
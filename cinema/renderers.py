@@ -0,0 +1,36 @@
+import re
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+# Числа, которые json.dumps пишет иначе: 9e-05 против 0.00009, 1e-07 против 1e-7.
+_FLOAT_MISMATCH = re.compile(rb'\de-\d(?!\d)|0\.0000')
+
+
+# JSONRenderer на orjson с тем же результатом байт в байт. Даты и прочие
+# типы, которые orjson кодирует по-своему, уходят в энкодер DRF; всё, с чем
+# orjson не справляется (ключи не-строки, целые больше 64 бит), а также
+# отступы, ensure_ascii и редкие формы записи чисел с плавающей точкой
+# обрабатывает стандартный рендерер.
+class ORJSONRenderer(JSONRenderer):
+	_options = orjson and orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+	def render(self, data, accepted_media_type=None, renderer_context=None):
+		if (
+			orjson is None or data is None or self.ensure_ascii or not self.compact
+			or self.get_indent(accepted_media_type, renderer_context or {})
+		):
+			return super().render(data, accepted_media_type, renderer_context)
+
+		try:
+			ret = orjson.dumps(data, default=self.encoder_class().default, option=self._options)
+		except TypeError:
+			return super().render(data, accepted_media_type, renderer_context)
+		if _FLOAT_MISMATCH.search(ret):
+			return super().render(data, accepted_media_type, renderer_context)
+
+		return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+SCHEDULE_VERSION_KEY = 'schedule:version'
+
+
+def _schedule_version():
+	return cache.get_or_set(SCHEDULE_VERSION_KEY, 1, None)
+
+
+def schedule_key(name, **params):
+	shape = ':'.join(f"{key}={params[key]}" for key in sorted(params))
+	return f"schedule:{_schedule_version()}:{name}:{shape}"
+
+
+def seats_key(screening_id):
+	return f"screening-seats:v2:{screening_id}"
+
+
+def invalidate_schedule():
+	try:
+		cache.incr(SCHEDULE_VERSION_KEY)
+	except ValueError:
+		cache.set(SCHEDULE_VERSION_KEY, 1, None)
+
+
+def availability_key(screening_id):
+	return f"screening-availability:{screening_id}"
+
+
+def _set_newer(key, value):
+	# value[0] — версия сеанса. Записи приходят из on_commit, а колбэки разных
+	# транзакций выполняются не в порядке коммитов, поэтому более старая
+	# версия не должна затирать уже записанную новую.
+	current = cache.get(key)
+	if current is None or current[0] < value[0]:
+		cache.set(key, value, settings.SCHEDULE_CACHE_TIMEOUT)
+
+
+def set_seats(screening_id, available_seats, version):
+	_set_newer(seats_key(screening_id), (version, available_seats))
+
+
+def set_availability(screening_id, available_seats, version, start_time, is_cancelled):
+	_set_newer(availability_key(screening_id), (version, available_seats, start_time, is_cancelled))
+
+
+def drop_screenings(screening_ids):
+	cache.delete_many(
+		[seats_key(screening_id) for screening_id in screening_ids]
+		+ [availability_key(screening_id) for screening_id in screening_ids]
+	)
+
+
+def get_availability(screening_ids, load):
+	# {id: (version, available_seats, start_time, is_cancelled)}; чего нет в кеше,
+	# догружается одним запросом через load(ids). Без общего кеша
+	# (CACHE_SHARED) у каждого воркера своя копия, которую не видят записи
+	# других процессов, поэтому тогда данные всегда берутся из базы.
+	if not settings.CACHE_SHARED:
+		return load(screening_ids)
+
+	cached = cache.get_many([availability_key(screening_id) for screening_id in screening_ids])
+	found = {
+		screening_id: cached[availability_key(screening_id)]
+		for screening_id in screening_ids if availability_key(screening_id) in cached
+	}
+	missing = [screening_id for screening_id in screening_ids if screening_id not in found]
+	if missing:
+		loaded = load(missing)
+		for screening_id, value in loaded.items():
+			# add(), а не set(): прочитанное из базы могло уже устареть, пока
+			# параллельный коммит записывал в кеш более новую версию.
+			cache.add(availability_key(screening_id), value, settings.SCHEDULE_CACHE_TIMEOUT)
+		found.update(loaded)
+	return found
+
+
+def get_schedule(key, build):
+	payload = cache.get(key)
+	if payload is None:
+		payload = build()
+		cache.set(key, payload, settings.SCHEDULE_CACHE_TIMEOUT)
+	return _patch_seats(payload)
+
+
+def _patch_seats(payload):
+	seats = cache.get_many([seats_key(item['id']) for item in payload])
+	if not seats:
+		return payload
+
+	now = timezone.now()
+	patched = []
+	for item in payload:
+		cached = seats.get(seats_key(item['id']))
+		if cached is not None:
+			available_seats = cached[1]
+			item = {
+				**item,
+				'available_seats': available_seats,
+				'is_available': available_seats > 0 and parse_datetime(item['start_time']) > now,
+			}
+		patched.append(item)
+	return patched
@@ -0,0 +1,96 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+
+from . import analytics, schedule_cache, seatmap
+from .listings import build_listing
+from .models import Film, CinemaHall, Screening, ScreeningListing
+from .serializers import ScreeningImportSerializer
+
+
+def _find_overlaps(intervals):
+	conflicts = set()
+	last_end, last_row = None, None
+
+	for start, end, row in sorted(intervals, key=lambda interval: (interval[0], interval[1])):
+		if last_end is not None and start < last_end:
+			conflicts.add(row if row is not None else last_row)
+		if last_end is None or end > last_end:
+			last_end, last_row = end, row
+
+	conflicts.discard(None)
+	return conflicts
+
+
+@transaction.atomic
+def import_screenings(rows, batch_size=1000):
+	errors = []
+	valid = []
+
+	for number, row in enumerate(rows, start=1):
+		serializer = ScreeningImportSerializer(data=row)
+		if serializer.is_valid():
+			valid.append((number, serializer.validated_data))
+		else:
+			errors.append({'row': number, 'errors': serializer.errors})
+
+	films = Film.objects.in_bulk({data['film'] for _, data in valid})
+	halls = CinemaHall.objects.in_bulk({data['hall'] for _, data in valid})
+
+	by_hall = defaultdict(list)
+	for number, data in valid:
+		if data['film'] not in films:
+			errors.append({'row': number, 'errors': {'film': ["Фильм не найден"]}})
+		elif data['hall'] not in halls:
+			errors.append({'row': number, 'errors': {'hall': ["Зал не найден"]}})
+		else:
+			by_hall[data['hall']].append((number, data))
+
+	for hall_id, hall_rows in by_hall.items():
+		intervals = [(data['start_time'], data['end_time'], number) for number, data in hall_rows]
+		existing = Screening.objects.filter(
+			hall_id=hall_id,
+			start_time__lt=max(data['end_time'] for _, data in hall_rows),
+			end_time__gt=min(data['start_time'] for _, data in hall_rows)
+		).values_list('start_time', 'end_time')
+		intervals += [(start, end, None) for start, end in existing]
+
+		for number in sorted(_find_overlaps(intervals)):
+			errors.append({'row': number, 'errors': {'non_field_errors': ["В этом зале уже есть сеанс в указанное время"]}})
+
+	if errors:
+		return 0, sorted(errors, key=lambda error: error['row'])
+	if not valid:
+		return 0, []
+
+	screenings = []
+	for hall_id, hall_rows in by_hall.items():
+		capacity = halls[hall_id].capacity
+		for _, data in hall_rows:
+			screenings.append(Screening(
+				film=films[data['film']],
+				hall=halls[hall_id],
+				start_time=data['start_time'],
+				end_time=data['end_time'],
+				price=data['price'],
+				available_seats=capacity,
+				seat_map=seatmap.build(capacity)
+			))
+
+	try:
+		with transaction.atomic():
+			Screening.objects.bulk_create(screenings, batch_size=batch_size)
+			ScreeningListing.objects.bulk_create(
+				[build_listing(screening) for screening in screenings], batch_size=batch_size
+			)
+			counts = defaultdict(lambda: (0, 0))
+			for screening in screenings:
+				key = analytics.sales_key(screening)
+				number, capacity = counts[key]
+				counts[key] = (number + 1, capacity + screening.hall.capacity)
+			analytics.record_screenings(counts, batch_size)
+			transaction.on_commit(schedule_cache.invalidate_schedule)
+	except IntegrityError:
+		return 0, [{'row': None, 'errors': {'non_field_errors': ["Расписание изменилось во время импорта, повторите попытку"]}}]
+
+	return len(screenings), []
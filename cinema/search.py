@@ -0,0 +1,128 @@
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+from .models import Film
+
+SEARCH_CONFIG = 'russian'
+
+# Веса как у ts_rank по умолчанию: A (название), B (описание), C (жанр).
+WEIGHTS = {'title': 1.0, 'description': 0.4, 'genre': 0.2}
+
+_TOKEN_RE = re.compile(r'\w+')
+# Окончания прилагательных и существительных из стеммера Snowball.
+_ENDINGS = sorted({
+	'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем', 'им', 'ым', 'ом',
+	'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю', 'ая', 'яя', 'ою', 'ею',
+	'а', 'ев', 'ов', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и', 'ией', 'й',
+	'иям', 'ям', 'ием', 'ам', 'о', 'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю',
+	'ия', 'ья', 'я',
+}, key=len, reverse=True)
+
+
+def film_search_vector(genres=Value('')):
+	return (
+		SearchVector('title', weight='A', config=SEARCH_CONFIG)
+		+ SearchVector('description', weight='B', config=SEARCH_CONFIG)
+		+ SearchVector(genres, weight='C', config=SEARCH_CONFIG)
+	)
+
+
+def _genre_names_subquery():
+	names = Film.genres.through.objects.filter(film_id=OuterRef('pk')).values('film_id').annotate(
+		names=StringAgg('genre__name', ' ')
+	).values('names')
+	return Coalesce(Subquery(names), Value(''), output_field=TextField())
+
+
+def genre_names(film_ids=None):
+	links = Film.genres.through.objects.all()
+	if film_ids is not None:
+		links = links.filter(film_id__in=film_ids)
+
+	names = defaultdict(list)
+	for film_id, name in links.values_list('film_id', 'genre__name'):
+		names[film_id].append(name)
+	return {film_id: ' '.join(film_names) for film_id, film_names in names.items()}
+
+
+def update_search_vector(film_ids):
+	if connection.vendor == 'postgresql':
+		Film.objects.filter(pk__in=film_ids).update(search_vector=film_search_vector(_genre_names_subquery()))
+	else:
+		_local_index.invalidate()
+
+
+def stem(word):
+	for ending in _ENDINGS:
+		if word.endswith(ending) and len(word) - len(ending) >= 3:
+			word = word[:-len(ending)]
+			break
+	return word[:-1] if word.endswith('и') and len(word) > 3 else word
+
+
+def tokenize(text):
+	return [stem(token) for token in _TOKEN_RE.findall(text.lower().replace('ё', 'е'))]
+
+
+class LocalSearchIndex:
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._postings = None
+
+	def invalidate(self):
+		self._postings = None
+
+	def _build(self):
+		postings = {}
+		names = genre_names()
+		for film_id, title, description in Film.objects.values_list('id', 'title', 'description'):
+			fields = {'title': title, 'description': description, 'genre': names.get(film_id, '')}
+			for field, text in fields.items():
+				for token in tokenize(text):
+					scores = postings.setdefault(token, {})
+					scores[film_id] = scores.get(film_id, 0.0) + WEIGHTS[field]
+		return postings
+
+	def search(self, query, limit):
+		postings = self._postings
+		if postings is None:
+			with self._lock:
+				postings = self._postings
+				if postings is None:
+					postings = self._postings = self._build()
+
+		terms = set(tokenize(query))
+		if not terms:
+			return []
+
+		matches = None
+		for term in terms:
+			scores = postings.get(term, {})
+			matches = dict(scores) if matches is None else {
+				film_id: score + scores[film_id] for film_id, score in matches.items() if film_id in scores
+			}
+		return sorted(matches, key=lambda film_id: (-matches[film_id], film_id))[:limit]
+
+
+_local_index = LocalSearchIndex()
+
+
+def search_films(query, limit=20):
+	if connection.vendor == 'postgresql':
+		search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+		return list(
+			Film.objects.filter(search_vector=search_query)
+			.annotate(rank=SearchRank(F('search_vector'), search_query))
+			.order_by('-rank', 'title')[:limit]
+		)
+
+	film_ids = _local_index.search(query, limit)
+	films = Film.objects.in_bulk(film_ids)
+	return [films[film_id] for film_id in film_ids if film_id in films]
@@ -0,0 +1,98 @@
+# Битовая карта занятости мест сеанса: бит i установлен, если место с
+# порядковым индексом i (ряды подряд, слева направо) занято.
+
+
+def _to_int(bitmap):
+	return int.from_bytes(bytes(bitmap), 'little')
+
+
+def _to_bytes(value, capacity):
+	return value.to_bytes((capacity + 7) // 8, 'little')
+
+
+def build(capacity, occupied=0):
+	return _to_bytes((1 << occupied) - 1, capacity)
+
+
+def count_occupied(bitmap):
+	return _to_int(bitmap).bit_count()
+
+
+def is_free(bitmap, index):
+	return not _to_int(bitmap) >> index & 1
+
+
+def occupy(bitmap, indices, capacity):
+	value = _to_int(bitmap)
+	for index in indices:
+		value |= 1 << index
+	return _to_bytes(value, capacity)
+
+
+def release(bitmap, indices, capacity):
+	value = _to_int(bitmap)
+	for index in indices:
+		value &= ~(1 << index)
+	return _to_bytes(value, capacity)
+
+
+def release_any(bitmap, count, capacity):
+	value = _to_int(bitmap)
+	for _ in range(count):
+		value &= value - 1
+	return _to_bytes(value, capacity)
+
+
+def seat_index(layout, row, seat):
+	if not 1 <= row <= len(layout) or not 1 <= seat <= layout[row - 1]:
+		raise ValueError(f"Места {row}-{seat} нет в зале")
+	return sum(layout[:row - 1]) + seat - 1
+
+
+def seat_position(layout, index):
+	for row, size in enumerate(layout, start=1):
+		if index < size:
+			return [row, index + 1]
+		index -= size
+	raise ValueError("Индекс места вне зала")
+
+
+def rows(bitmap, layout):
+	value = _to_int(bitmap)
+	result = []
+	for size in layout:
+		result.append([not value >> i & 1 for i in range(size)])
+		value >>= size
+	return result
+
+
+def find_adjacent(bitmap, layout, count):
+	if count <= 0:
+		return []
+
+	value = _to_int(bitmap)
+	offset = 0
+	for size in layout:
+		if count <= size:
+			free = ~(value >> offset) & ((1 << size) - 1)
+			starts = free
+			for shift in range(1, count):
+				starts &= free >> shift
+			if starts:
+				start = offset + (starts & -starts).bit_length() - 1
+				return list(range(start, start + count))
+		offset += size
+	return None
+
+
+def find_free(bitmap, capacity, count):
+	free = ~_to_int(bitmap) & ((1 << capacity) - 1)
+	if free.bit_count() < count:
+		return None
+
+	indices = []
+	for _ in range(count):
+		lowest = free & -free
+		indices.append(lowest.bit_length() - 1)
+		free ^= lowest
+	return indices
@@ -0,0 +1,172 @@
+# Массовое заполнение базы для стендов и нагрузочных тестов. Значения полей
+# берутся из фабрик cinema/tests/factories.py, но строки пишутся пачками
+# (bulk_create, а брони на PostgreSQL — через COPY) в обход save(): расписание
+# каждого зала строится без пересечений заранее, а available_seats, seat_map
+# и total_price считаются из сгенерированных броней.
+import csv
+import io
+import json
+import random
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import analytics, references, schedule_cache, search, seatmap
+from .listings import build_listing
+from .models import Booking, CinemaHall, Film, ReferenceSequence, Screening, ScreeningListing
+from .tests.factories import CinemaHallFactory, FilmFactory, GenreFactory, ScreeningFactory, fake
+
+CHUNK_SIZE = 5000
+GENRES = ('Драма', 'Комедия', 'Боевик', 'Фантастика', 'Ужасы', 'Мультфильм', 'Триллер')
+ROW_SIZE = 20
+OPENING = time(10, 0)
+CLOSING = time(23, 0)
+BREAK = timedelta(minutes=15)
+CANCELLED_SHARE = 0.05
+BOOKING_COLUMNS = (
+	'screening_id', 'customer_name', 'customer_email', 'customer_phone', 'seats', 'seat_numbers',
+	'total_price', 'status', 'booking_date', 'booking_reference', 'expires_at',
+)
+
+
+def _row_sizes(capacity):
+	rows = [ROW_SIZE] * (capacity // ROW_SIZE)
+	if capacity % ROW_SIZE:
+		rows.append(capacity % ROW_SIZE)
+	return rows
+
+
+def _opening(day):
+	return timezone.make_aware(datetime.combine(day, OPENING))
+
+
+def hall_schedule(films, first_day):
+	"""Бесконечная последовательность (фильм, начало, конец) без пересечений в одном зале."""
+	start = _opening(first_day)
+	while True:
+		film = random.choice(films)
+		end = start + timedelta(minutes=film.duration_minutes)
+		if timezone.localtime(end).time() > CLOSING or timezone.localdate(end) != timezone.localdate(start):
+			start = _opening(timezone.localdate(start) + timedelta(days=1))
+			continue
+		yield film, start, end
+		start = end + BREAK
+		start += timedelta(minutes=-timezone.localtime(start).minute % 5)
+
+
+def _customers(count=1000):
+	return [(fake.name(), fake.email(), fake.phone_number()) for _ in range(count)]
+
+
+def _write_bookings(bookings, use_copy):
+	numbers = ReferenceSequence.allocate(len(bookings))
+	for booking, number in zip(bookings, numbers):
+		booking.booking_reference = references.encode(number)
+
+	if not use_copy:
+		Booking.objects.bulk_create(bookings, batch_size=CHUNK_SIZE)
+		return
+
+	buffer = io.StringIO()
+	writer = csv.writer(buffer)
+	for booking in bookings:
+		writer.writerow([
+			booking.screening_id, booking.customer_name, booking.customer_email, booking.customer_phone,
+			booking.seats, json.dumps(booking.seat_numbers), booking.total_price, booking.status,
+			booking.booking_date.isoformat(), booking.booking_reference, '',
+		])
+	buffer.seek(0)
+	with connection.cursor() as cursor:
+		cursor.copy_expert(
+			f"COPY {Booking._meta.db_table} ({', '.join(BOOKING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+			buffer
+		)
+
+
+def _plan_bookings(screening, count, customers, now):
+	layout = screening.hall.layout
+	capacity = screening.hall.capacity
+	occupied = 0
+	bookings = []
+	for _ in range(count):
+		if occupied >= capacity:
+			break
+		seats = min(random.choice((1, 2, 2, 2, 3, 4)), capacity - occupied)
+		name, email, phone = random.choice(customers)
+		cancelled = random.random() < CANCELLED_SHARE
+		bookings.append(Booking(
+			screening=screening,
+			customer_name=name,
+			customer_email=email,
+			customer_phone=phone,
+			seats=seats,
+			seat_numbers=[seatmap.seat_position(layout, index) for index in range(occupied, occupied + seats)],
+			total_price=seats * screening.price,
+			status='cancelled' if cancelled else 'confirmed',
+			booking_date=now
+		))
+		if not cancelled:
+			occupied += seats
+
+	screening.available_seats = capacity - occupied
+	screening.seat_map = seatmap.build(capacity, occupied)
+	return bookings
+
+
+def seed(films=1000, halls=20, screenings=10000, bookings=1000000, first_day=None, chunk_size=CHUNK_SIZE,
+		use_copy=None, progress=None):
+	if use_copy is None:
+		use_copy = connection.vendor == 'postgresql'
+	first_day = first_day or timezone.localdate() + timedelta(days=1)
+	now = timezone.now()
+
+	with transaction.atomic():
+		genres = [GenreFactory(name=name) for name in GENRES]
+		film_rows = Film.objects.bulk_create(FilmFactory.build_batch(films), batch_size=chunk_size)
+		Film.genres.through.objects.bulk_create([
+			Film.genres.through(film_id=film.pk, genre_id=genre.pk)
+			for film in film_rows for genre in random.sample(genres, random.randint(1, 2))
+		], batch_size=chunk_size)
+
+		hall_rows = CinemaHallFactory.build_batch(halls)
+		for hall in hall_rows:
+			hall.row_sizes = _row_sizes(hall.capacity)
+		hall_rows = CinemaHall.objects.bulk_create(hall_rows, batch_size=chunk_size)
+
+	schedules = [(hall, hall_schedule(film_rows, first_day)) for hall in hall_rows]
+	customers = _customers()
+	created_screenings = created_bookings = 0
+	days = set()
+
+	while created_screenings < screenings:
+		batch = []
+		for _ in range(min(chunk_size, screenings - created_screenings)):
+			hall, schedule = schedules[(created_screenings + len(batch)) % len(schedules)]
+			film, start, end = next(schedule)
+			batch.append(ScreeningFactory.build(film=film, hall=hall, start_time=start, end_time=end))
+
+		remaining = screenings - created_screenings
+		with transaction.atomic():
+			planned = []
+			for number, screening in enumerate(batch):
+				share = (bookings - created_bookings - len(planned)) // max(remaining - number, 1)
+				planned.extend(_plan_bookings(screening, share, customers, now))
+			Screening.objects.bulk_create(batch)
+			ScreeningListing.objects.bulk_create([build_listing(screening) for screening in batch])
+			for booking in planned:
+				booking.screening_id = booking.screening.pk
+			for start in range(0, len(planned), chunk_size):
+				_write_bookings(planned[start:start + chunk_size], use_copy)
+
+		created_screenings += len(batch)
+		created_bookings += len(planned)
+		days.update(timezone.localdate(screening.start_time) for screening in batch)
+		if progress:
+			progress(created_screenings, created_bookings)
+
+	if days:
+		analytics.rebuild_sales(min(days), max(days))
+	search.update_search_vector([film.pk for film in film_rows])
+	schedule_cache.invalidate_schedule()
+	return {'films': films, 'halls': halls, 'screenings': created_screenings, 'bookings': created_bookings}
@@ -1,41 +1,126 @@
 from rest_framework import serializers
-from .models import Film, CinemaHall, Screening, Booking
+from .fastpath import FastSerializer
+from .metrics import TimedSerializerMixin
+from .models import Film, Genre, CinemaHall, Screening, Booking, ArchivedScreening, ArchivedBooking
 from django.utils import timezone
+from django.utils.text import slugify
 
 
-class FilmSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+	slug = serializers.SlugField(allow_unicode=True, required=False)
+
 	class Meta:
-		model = Film
+		model = Genre
 		fields = '__all__'
 
+	def validate(self, data):
+		if 'slug' not in data and self.instance is not None:
+			return data
+		# Slug по умолчанию берётся из названия (Genre.save), поэтому «драма» и
+		# «Драма» дают один и тот же slug; проверяем его здесь, а не ловим
+		# IntegrityError при вставке.
+		slug = data.get('slug') or slugify(data.get('name', ''), allow_unicode=True)
+		if not slug:
+			raise serializers.ValidationError({'slug': "Не удалось получить slug из названия, укажите его явно"})
+		duplicates = Genre.objects.filter(slug=slug)
+		if self.instance is not None:
+			duplicates = duplicates.exclude(pk=self.instance.pk)
+		if duplicates.exists():
+			raise serializers.ValidationError({'slug': "Жанр с таким slug уже существует"})
+		data['slug'] = slug
+		return data
+
+
+class FilmSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+	genres = serializers.SlugRelatedField(
+		many=True,
+		slug_field='slug',
+		queryset=Genre.objects.all(),
+		required=False
+	)
 
-class CinemaHallSerializer(serializers.ModelSerializer):
+	class Meta:
+		model = Film
+		exclude = ('search_vector',)
+
+
+class CinemaHallSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 	class Meta:
 		model = CinemaHall
 		fields = '__all__'
 
+	def validate(self, data):
+		row_sizes = data.get('row_sizes')
+		capacity = data.get('capacity', getattr(self.instance, 'capacity', None))
 
-class ScreeningSerializer(serializers.ModelSerializer):
+		if row_sizes:
+			if any(not isinstance(size, int) or size <= 0 for size in row_sizes):
+				raise serializers.ValidationError(
+					{"row_sizes": "Размер ряда должен быть положительным числом"}
+				)
+			if sum(row_sizes) != capacity:
+				raise serializers.ValidationError(
+					{"row_sizes": "Сумма мест в рядах должна совпадать с вместимостью зала"}
+				)
+
+		if self.instance is not None:
+			layout = (capacity, data.get('row_sizes', self.instance.row_sizes) or [])
+			if layout != (self.instance.capacity, self.instance.row_sizes or []) and self.instance.screening_set.exists():
+				raise serializers.ValidationError(
+					"Нельзя менять вместимость и ряды зала, пока в нём есть сеансы"
+				)
+
+		return data
+
+
+class ScreeningSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 	film_title = serializers.CharField(source='film.title', read_only=True)
 	hall_name = serializers.CharField(source='hall.name', read_only=True)
 	is_available = serializers.SerializerMethodField()
 
 	class Meta:
 		model = Screening
-		fields = '__all__'
+		exclude = ('seat_map', 'version', 'is_cancelled')
+		read_only_fields = ('available_seats',)
 
 	def get_is_available(self, obj):
 		return obj.available_seats > 0 and obj.start_time > timezone.now()
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class ScreeningImportSerializer(serializers.Serializer):
+	film = serializers.IntegerField()
+	hall = serializers.IntegerField()
+	start_time = serializers.DateTimeField()
+	end_time = serializers.DateTimeField()
+	price = serializers.DecimalField(max_digits=8, decimal_places=2, min_value=0)
+
+	def validate(self, data):
+		if data['start_time'] >= data['end_time']:
+			raise serializers.ValidationError("Время окончания должно быть после времени начала")
+		return data
+
+
+class BookingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 	screening_info = serializers.CharField(source='screening.__str__', read_only=True)
 	film_title = serializers.CharField(source='screening.film.title', read_only=True)
+	seat_numbers = serializers.ListField(
+		child=serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=2, max_length=2),
+		required=False
+	)
 
 	class Meta:
 		model = Booking
 		fields = '__all__'
-		read_only_fields = ('booking_reference', 'booking_date', 'total_price')
+		read_only_fields = ('booking_reference', 'booking_date', 'total_price', 'expires_at')
+
+	def get_fields(self):
+		fields = super().get_fields()
+		# Места занимает reserve_seats при создании, освобождает cancel();
+		# правка сеанса или мест в существующей брони разошлась бы с картой зала.
+		if self.instance is not None:
+			for name in ('screening', 'seats', 'seat_numbers'):
+				fields[name].read_only = True
+		return fields
 
 	def validate(self, data):
 		screening = data.get('screening')
@@ -46,7 +131,24 @@ class BookingSerializer(serializers.ModelSerializer):
 				{"seats": "Количество мест должно быть положительным числом"}
 			)
 
+		if self.instance and self.instance.status == 'pending' and data.get('status') == 'confirmed':
+			if self.instance.expires_at and self.instance.expires_at <= timezone.now():
+				raise serializers.ValidationError("Время временной брони истекло")
+			data['expires_at'] = None
+
+		seat_numbers = data.get('seat_numbers')
+		if seat_numbers:
+			if len(seat_numbers) != seats:
+				raise serializers.ValidationError(
+					{"seat_numbers": "Количество выбранных мест должно совпадать с количеством мест"}
+				)
+			if len({tuple(seat) for seat in seat_numbers}) != len(seat_numbers):
+				raise serializers.ValidationError({"seat_numbers": "Места не должны повторяться"})
+
 		if screening and seats:
+			if screening.is_cancelled:
+				raise serializers.ValidationError("Сеанс отменён, бронирование недоступно")
+
 			if screening.start_time <= timezone.now():
 				raise serializers.ValidationError("Нельзя забронировать билеты на прошедший сеанс")
 
@@ -56,3 +158,35 @@ class BookingSerializer(serializers.ModelSerializer):
 				)
 
 		return data
+
+
+class ArchivedScreeningSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+	class Meta:
+		model = ArchivedScreening
+		fields = '__all__'
+
+
+class ArchivedBookingSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+	film_title = serializers.CharField(source='screening.film_title', read_only=True)
+	screening_start_time = serializers.DateTimeField(source='screening.start_time', read_only=True)
+
+	class Meta:
+		model = ArchivedBooking
+		fields = '__all__'
+
+
+fast_films = FastSerializer(FilmSerializer)
+fast_screenings = FastSerializer(
+	ScreeningSerializer,
+	is_available=(
+		('available_seats', 'start_time'),
+		lambda row: row['available_seats'] > 0 and row['start_time'] > timezone.now()
+	)
+)
+fast_bookings = FastSerializer(
+	BookingSerializer,
+	screening_info=(
+		('screening__film__title', 'screening__start_time'),
+		lambda row: f"{row['screening__film__title']} - {row['screening__start_time'].strftime('%d.%m.%Y %H:%M')}"
+	)
+)
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+seats_changed = Signal()
+sales_changed = Signal()
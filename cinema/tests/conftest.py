@@ -1,11 +1,27 @@
 import pytest
 
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APIClient
+from cinema import transports
 from freezegun import freeze_time
 from datetime import datetime, timezone
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def sms_outbox(settings):
+    settings.SMS_BACKEND = 'cinema.transports.LocMemSMSBackend'
+    transports.sms_outbox.clear()
+    return transports.sms_outbox
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -23,8 +39,7 @@ def film_data():
         'title': 'Тестовый фильм',
         'description': 'Тестовое описание',
         'duration_minutes': 120,
-        'release_year': 2023,
-        'genre': 'Драма'
+        'release_year': 2023
     }
 
 @pytest.fixture
@@ -54,3 +69,7 @@ def url_booking_list():
 @pytest.fixture
 def url_screening_upcoming():
     return reverse('screening-upcoming')
+
+@pytest.fixture
+def url_screening_availability():
+    return reverse('screening-availability')
@@ -4,20 +4,34 @@ from factory.django import DjangoModelFactory
 from faker import Faker
 from datetime import timedelta
 from django.utils import timezone
-from cinema.models import Film, CinemaHall, Screening, Booking
+from cinema.models import Film, Genre, CinemaHall, Screening, Booking
 
 fake = Faker(['ru_RU'])
 
 
+class GenreFactory(DjangoModelFactory):
+	class Meta:
+		model = Genre
+		django_get_or_create = ('name',)
+
+	name = factory.Faker('random_element', elements=['Драма', 'Комедия', 'Боевик', 'Фантастика'])
+
+
 class FilmFactory(DjangoModelFactory):
 	class Meta:
 		model = Film
+		skip_postgeneration_save = True
 
 	title = factory.LazyFunction(lambda: f"Фильм {fake.word().capitalize()}")
 	description = factory.Faker('paragraph', locale='ru_RU')
 	duration_minutes = factory.Faker('random_int', min=60, max=180)
 	release_year = factory.LazyFunction(lambda: int(fake.year()))
-	genre = factory.Faker('random_element', elements=['Драма', 'Комедия', 'Боевик', 'Фантастика'])
+
+	@factory.post_generation
+	def genres(self, create, extracted, **kwargs):
+		if not create:
+			return
+		self.genres.set(extracted if extracted is not None else [GenreFactory()])
 
 
 class CinemaHallFactory(DjangoModelFactory):
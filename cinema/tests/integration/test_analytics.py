@@ -0,0 +1,231 @@
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db.models import F
+from django.urls import reverse
+from rest_framework import status
+
+from cinema.analytics import rebuild_sales
+from cinema.models import DailySales
+from cinema.tests.factories import BookingFactory, CinemaHallFactory, FilmFactory, ScreeningFactory
+
+
+def snapshot():
+	return sorted(DailySales.objects.values_list(
+		'day', 'film_id', 'hall_id', 'screenings', 'capacity', 'bookings', 'seats_sold', 'revenue'
+	))
+
+
+@pytest.mark.django_db
+class TestSalesRollups:
+
+	@pytest.fixture
+	def screening(self, test_time):
+		hall = CinemaHallFactory(capacity=100)
+		return ScreeningFactory(hall=hall, start_time=test_time + timedelta(days=1), price=Decimal('300.00'))
+
+	def _book(self, screening, seats, **extra):
+		return BookingFactory(screening=screening, seats=seats, seat_numbers=screening.reserve_seats(seats), **extra)
+
+	def _sales(self, screening):
+		return DailySales.objects.get(film=screening.film, hall=screening.hall)
+
+	@pytest.mark.integration
+	def test_screening_adds_capacity(self, screening):
+		sales = self._sales(screening)
+		assert (sales.screenings, sales.capacity, sales.seats_sold) == (1, 100, 0)
+
+	@pytest.mark.integration
+	def test_confirmed_booking_is_counted(self, api_client, url_booking_list, screening):
+		response = api_client.post(url_booking_list, {
+			'screening': screening.pk,
+			'customer_name': 'Клиент',
+			'customer_email': 'client@example.com',
+			'customer_phone': '+79160000000',
+			'seats': 3,
+			'status': 'confirmed'
+		}, format='json')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		sales = self._sales(screening)
+		assert (sales.bookings, sales.seats_sold, sales.revenue) == (1, 3, Decimal('900.00'))
+
+	@pytest.mark.integration
+	def test_pending_counted_after_confirmation(self, api_client, screening):
+		booking = self._book(screening, 2, status='pending')
+		assert self._sales(screening).seats_sold == 0
+
+		response = api_client.patch(reverse('booking-detail', args=[booking.pk]), {'status': 'confirmed'}, format='json')
+
+		assert response.status_code == status.HTTP_200_OK
+		assert self._sales(screening).seats_sold == 2
+
+	@pytest.mark.integration
+	def test_cancel_removes_sales(self, api_client, screening):
+		booking = self._book(screening, 2)
+		self._book(screening, 1)
+
+		response = api_client.post(reverse('booking-cancel', args=[booking.pk]))
+
+		assert response.status_code == status.HTTP_200_OK
+		sales = self._sales(screening)
+		assert (sales.bookings, sales.seats_sold, sales.revenue) == (1, 1, Decimal('300.00'))
+
+	@pytest.mark.integration
+	def test_screening_cancel_and_delete(self, api_client, screening):
+		self._book(screening, 2)
+		self._book(screening, 1, status='pending')
+		booking = self._book(screening, 4)
+
+		api_client.delete(reverse('booking-detail', args=[booking.pk]))
+		assert self._sales(screening).seats_sold == 2
+
+		b''.join(api_client.post(reverse('screening-cancel', args=[screening.pk])).streaming_content)
+		assert self._sales(screening).seats_sold == 0
+
+		screening.delete()
+		assert not DailySales.objects.exists()
+
+	@pytest.mark.integration
+	def test_missing_row_is_inserted_once(self, screening):
+		self._book(screening, 2)
+		DailySales.objects.all().delete()
+
+		self._book(screening, 3)
+
+		sales = self._sales(screening)
+		assert (sales.screenings, sales.capacity, sales.bookings, sales.seats_sold) == (1, 100, 2, 5)
+
+	@pytest.mark.integration
+	def test_backfill_migration(self, screening):
+		self._book(screening, 2)
+		self._book(screening, 1, status='pending')
+		expected = snapshot()
+		DailySales.objects.all().delete()
+
+		import_module('cinema.migrations.0019_backfill_daily_sales').backfill_daily_sales(apps, None)
+
+		assert snapshot() == expected
+
+	@pytest.mark.integration
+	def test_moved_screening_and_resized_hall(self, screening, test_time):
+		self._book(screening, 2)
+		hall = screening.hall
+
+		screening.start_time += timedelta(days=2)
+		screening.end_time += timedelta(days=2)
+		screening.save()
+		hall.capacity = 120
+		hall.save()
+
+		sales = DailySales.objects.get()
+		assert sales.day == (test_time + timedelta(days=3)).date()
+		assert (sales.capacity, sales.seats_sold) == (120, 2)
+
+	@pytest.mark.integration
+	def test_edits_apply_deltas_without_rebuild(self, screening):
+		self._book(screening, 2)
+		# Приращение параллельной брони, которого нет в первичных таблицах этой
+		# транзакции: пересчёт ключа стёр бы его.
+		DailySales.objects.update(seats_sold=F('seats_sold') + 1)
+		hall = screening.hall
+
+		screening.price = Decimal('500.00')
+		screening.save()
+		hall.name = 'Новое имя'
+		hall.save()
+
+		assert self._sales(screening).seats_sold == 3
+
+	@pytest.mark.integration
+	def test_delete_screening_with_sales(self, screening, test_time):
+		other = ScreeningFactory(hall=screening.hall, film=screening.film, start_time=screening.end_time)
+		self._book(screening, 2)
+		self._book(other, 3)
+
+		screening.delete()
+
+		sales = self._sales(other)
+		assert (sales.screenings, sales.capacity, sales.bookings, sales.seats_sold) == (1, 100, 1, 3)
+
+	@pytest.mark.integration
+	def test_incremental_matches_rebuild(self, api_client, screening, test_time):
+		other = ScreeningFactory(film=screening.film, start_time=test_time + timedelta(days=5))
+		bookings = [self._book(screening, 2), self._book(other, 3), self._book(other, 1, status='pending')]
+		bookings[0].cancel()
+		self._book(screening, 5)
+
+		incremental = snapshot()
+		DailySales.objects.all().delete()
+		call_command('rebuild_analytics')
+
+		assert snapshot() == incremental
+		assert rebuild_sales() == 2
+
+
+@pytest.mark.django_db
+class TestAnalyticsApi:
+
+	@pytest.fixture
+	def sales(self, test_time):
+		films = [FilmFactory(title='Первый'), FilmFactory(title='Второй')]
+		halls = [CinemaHallFactory(capacity=100), CinemaHallFactory(capacity=50)]
+		for day, film, hall, seats in ((1, 0, 0, 40), (1, 1, 1, 10), (2, 0, 1, 25), (40, 1, 0, 20)):
+			screening = ScreeningFactory(
+				film=films[film], hall=halls[hall], start_time=test_time + timedelta(days=day), price=Decimal('100.00')
+			)
+			BookingFactory(screening=screening, seats=seats)
+		return films, halls
+
+	@pytest.mark.integration
+	def test_films(self, api_client, sales, django_assert_num_queries):
+		films, _ = sales
+
+		with django_assert_num_queries(1):
+			response = api_client.get(reverse('analytics-films'))
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data == [
+			{'film': films[0].pk, 'name': 'Первый', 'screenings': 2, 'capacity': 150, 'bookings': 2,
+			 'seats_sold': 65, 'revenue': '6500.00', 'occupancy': 43.3},
+			{'film': films[1].pk, 'name': 'Второй', 'screenings': 2, 'capacity': 150, 'bookings': 2,
+			 'seats_sold': 30, 'revenue': '3000.00', 'occupancy': 20.0},
+		]
+
+	@pytest.mark.integration
+	def test_halls_filtered_by_dates(self, api_client, sales, test_time):
+		_, halls = sales
+
+		response = api_client.get(reverse('analytics-halls'), {
+			'date_from': (test_time + timedelta(days=1)).date().isoformat(),
+			'date_to': (test_time + timedelta(days=2)).date().isoformat(),
+		})
+
+		assert [(row['hall'], row['seats_sold'], row['occupancy']) for row in response.data] == [
+			(halls[0].pk, 40, 40.0),
+			(halls[1].pk, 35, 35.0),
+		]
+
+	@pytest.mark.integration
+	def test_series_buckets(self, api_client, sales, test_time, django_assert_num_queries):
+		films, _ = sales
+
+		with django_assert_num_queries(1):
+			response = api_client.get(reverse('analytics-series'), {'bucket': 'month'})
+		assert [(row['period'], row['seats_sold']) for row in response.data] == [
+			((test_time + timedelta(days=1)).date().replace(day=1), 75),
+			((test_time + timedelta(days=40)).date().replace(day=1), 20),
+		]
+
+		response = api_client.get(reverse('analytics-series'), {'film': films[0].pk})
+		assert [row['seats_sold'] for row in response.data] == [40, 25]
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('params', [{'bucket': 'year'}, {'date_from': '15.01.2025'}, {'film': 'abc'}])
+	def test_invalid_params(self, api_client, sales, params):
+		response = api_client.get(reverse('analytics-series'), params)
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,148 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from cinema import schedule_cache
+from cinema.analytics import rebuild_sales
+from cinema.archive import archive_screenings
+from cinema.models import ArchivedBooking, ArchivedScreening, Booking, DailySales, Screening, ScreeningListing
+from cinema.tests.factories import BookingFactory, CinemaHallFactory, ScreeningFactory
+
+
+def sales_snapshot():
+	return sorted(DailySales.objects.values_list('day', 'film_id', 'hall_id', 'capacity', 'seats_sold', 'revenue'))
+
+
+@pytest.mark.django_db
+class TestArchive:
+
+	@pytest.fixture
+	def screenings(self, settings, test_time):
+		settings.ARCHIVE_AFTER_DAYS = 30
+		hall = CinemaHallFactory(capacity=100)
+		old = [
+			ScreeningFactory(hall=hall, start_time=test_time - timedelta(days=days), price=Decimal('200.00'))
+			for days in (60, 45)
+		]
+		recent = ScreeningFactory(hall=hall, start_time=test_time - timedelta(days=3))
+		for screening in old + [recent]:
+			BookingFactory(screening=screening, seats=2, customer_email='archive@example.com')
+		BookingFactory(screening=old[0], seats=1, status='cancelled')
+		return old, recent
+
+	@pytest.mark.integration
+	def test_moves_old_screenings_with_bookings(self, screenings):
+		old, recent = screenings
+		booking_ids = set(Booking.objects.filter(screening__in=old).values_list('pk', flat=True))
+
+		assert archive_screenings(batch_size=1) == (2, 3)
+
+		assert list(Screening.objects.values_list('pk', flat=True)) == [recent.pk]
+		assert list(ScreeningListing.objects.values_list('pk', flat=True)) == [recent.pk]
+		assert not Booking.objects.filter(pk__in=booking_ids).exists()
+		assert set(ArchivedScreening.objects.values_list('pk', flat=True)) == {screening.pk for screening in old}
+		assert set(ArchivedBooking.objects.values_list('pk', flat=True)) == booking_ids
+
+		archived = ArchivedScreening.objects.get(pk=old[0].pk)
+		assert (archived.film_title, archived.hall_name, archived.capacity) == (old[0].film.title, old[0].hall.name, 100)
+		assert archive_screenings() == (0, 0)
+
+	@pytest.mark.integration
+	def test_drops_cached_seats(self, screenings, django_capture_on_commit_callbacks):
+		old, recent = screenings
+		for screening in old + [recent]:
+			schedule_cache.set_seats(screening.pk, 1, screening.version)
+
+		with django_capture_on_commit_callbacks(execute=True):
+			archive_screenings()
+
+		assert set(cache.get_many([schedule_cache.seats_key(screening.pk) for screening in old + [recent]])) == {
+			schedule_cache.seats_key(recent.pk)
+		}
+
+	@pytest.mark.integration
+	def test_analytics_survive_archiving(self, screenings):
+		old, _ = screenings
+		before = sales_snapshot()
+
+		archive_screenings()
+		assert sales_snapshot() == before
+
+		rebuild_sales()
+		assert sales_snapshot() == before
+
+		hall = old[0].hall
+		hall.capacity = 150
+		hall.save()
+		assert DailySales.objects.get(film=old[0].film).capacity == 100
+
+	@pytest.mark.integration
+	def test_command(self, screenings):
+		out = StringIO()
+		call_command('archive_screenings', stdout=out)
+		assert 'сеансов: 2, броней: 3' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestHistoryApi:
+
+	@pytest.fixture
+	def archived(self, settings, test_time):
+		settings.ARCHIVE_AFTER_DAYS = 30
+		screenings = [ScreeningFactory(start_time=test_time - timedelta(days=days)) for days in (90, 60, 40)]
+		bookings = [BookingFactory(screening=screening, customer_email='history@example.com') for screening in screenings]
+		BookingFactory(screening=screenings[0])
+		archive_screenings()
+		return screenings, bookings
+
+	@pytest.mark.integration
+	def test_screening_history(self, api_client, archived, test_time):
+		screenings, _ = archived
+
+		response = api_client.get(reverse('screening-history-list'))
+		assert [row['id'] for row in response.data['results']] == [screening.pk for screening in reversed(screenings)]
+
+		response = api_client.get(reverse('screening-history-list'), {
+			'date_from': (test_time - timedelta(days=70)).date().isoformat(),
+			'date_to': (test_time - timedelta(days=50)).date().isoformat(),
+			'hall': screenings[1].hall_id,
+		})
+		assert [row['id'] for row in response.data['results']] == [screenings[1].pk]
+
+		response = api_client.get(reverse('screening-history-detail', args=[screenings[0].pk]))
+		assert response.data['film_title'] == screenings[0].film.title
+
+	@pytest.mark.integration
+	def test_booking_history(self, api_client, archived):
+		screenings, bookings = archived
+
+		response = api_client.get(reverse('booking-history-list'), {'email': 'HISTORY@example.com'})
+		assert {row['id'] for row in response.data['results']} == {booking.pk for booking in bookings}
+
+		response = api_client.get(reverse('booking-history-list'), {'reference': bookings[1].booking_reference.lower()})
+		assert [row['screening'] for row in response.data['results']] == [screenings[1].pk]
+		assert response.data['results'][0]['film_title'] == screenings[1].film.title
+
+		response = api_client.get(reverse('booking-history-list'), {'screening': screenings[0].pk})
+		assert len(response.data['results']) == 2
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('url, params', [
+		('screening-history-list', {'film': 'abc'}),
+		('screening-history-list', {'date_to': '01.01.2025'}),
+		('booking-history-list', {'screening': 'abc'}),
+	])
+	def test_invalid_params(self, api_client, archived, url, params):
+		response = api_client.get(reverse(url), params)
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+	@pytest.mark.integration
+	def test_live_endpoints_do_not_see_archive(self, api_client, archived, url_booking_list):
+		response = api_client.get(url_booking_list)
+		assert response.data['results'] == []
@@ -0,0 +1,153 @@
+from datetime import timedelta
+
+import pytest
+from rest_framework import status
+
+from cinema import schedule_cache
+from cinema.models import Booking, Screening
+from cinema.tests.factories import CinemaHallFactory, ScreeningFactory
+
+
+@pytest.mark.django_db
+class TestAvailability:
+
+	@pytest.fixture(autouse=True)
+	def shared_cache(self, settings):
+		settings.CACHE_SHARED = True
+
+	@pytest.fixture
+	def screenings(self):
+		return ScreeningFactory(hall=CinemaHallFactory(capacity=10)), ScreeningFactory(hall=CinemaHallFactory(capacity=20))
+
+	def get(self, api_client, url, screenings, **headers):
+		return api_client.get(url, {'ids': ','.join(str(screening.pk) for screening in screenings)}, **headers)
+
+	@pytest.mark.integration
+	def test_returns_seats_for_requested_ids(self, api_client, url_screening_availability, screenings):
+		response = api_client.get(url_screening_availability, {'ids': f'{screenings[1].pk},{screenings[0].pk},999999'})
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data == [
+			{'id': screenings[1].pk, 'available_seats': 20, 'is_available': True},
+			{'id': screenings[0].pk, 'available_seats': 10, 'is_available': True},
+		]
+		assert response['ETag']
+		assert 'Last-Modified' not in response
+		assert response['Cache-Control'] == 'no-cache'
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('ids', ['', 'abc', ','.join(str(i) for i in range(1, 102))])
+	def test_rejects_bad_ids(self, api_client, url_screening_availability, ids):
+		response = api_client.get(url_screening_availability, {'ids': ids})
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert 'error' in response.data
+
+	@pytest.mark.integration
+	def test_unchanged_poll_is_not_modified_without_queries(
+		self, api_client, url_screening_availability, screenings, django_assert_num_queries
+	):
+		etag = self.get(api_client, url_screening_availability, screenings)['ETag']
+
+		with django_assert_num_queries(0):
+			response = self.get(api_client, url_screening_availability, screenings, HTTP_IF_NONE_MATCH=etag)
+
+		assert response.status_code == status.HTTP_304_NOT_MODIFIED
+		assert response['ETag'] == etag
+		assert not response.content
+
+	@pytest.mark.integration
+	def test_without_shared_cache_reads_database(
+		self, api_client, url_screening_availability, screenings, settings, django_assert_num_queries
+	):
+		settings.CACHE_SHARED = False
+		screening = screenings[0]
+		etag = self.get(api_client, url_screening_availability, screenings)['ETag']
+		schedule_cache.set_availability(screening.pk, 3, screening.version + 5, screening.start_time, False)
+
+		with django_assert_num_queries(1):
+			response = self.get(api_client, url_screening_availability, screenings, HTTP_IF_NONE_MATCH=etag)
+
+		assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+	@pytest.mark.integration
+	def test_cache_keeps_newest_version(self, screenings):
+		screening = screenings[0]
+
+		def load(ids):
+			return {screening.pk: (screening.version, 10, screening.start_time, False)}
+
+		schedule_cache.set_availability(screening.pk, 4, screening.version + 1, screening.start_time, False)
+		assert schedule_cache.get_availability([screening.pk], load)[screening.pk][1] == 4
+
+		schedule_cache.drop_screenings([screening.pk])
+		schedule_cache.get_availability([screening.pk], load)
+		schedule_cache.set_availability(screening.pk, 4, screening.version + 2, screening.start_time, False)
+		schedule_cache.set_availability(screening.pk, 7, screening.version + 1, screening.start_time, False)
+		assert schedule_cache.get_availability([screening.pk], load)[screening.pk][1] == 4
+
+	@pytest.mark.integration
+	def test_booking_changes_etag(
+		self, api_client, url_screening_availability, url_booking_list, screenings,
+		django_assert_num_queries, django_capture_on_commit_callbacks
+	):
+		etag = self.get(api_client, url_screening_availability, screenings)['ETag']
+
+		with django_capture_on_commit_callbacks(execute=True):
+			api_client.post(url_booking_list, {
+				'screening': screenings[0].pk,
+				'customer_name': 'Иван Петров',
+				'customer_email': 'ivan@example.com',
+				'customer_phone': '+79161234567',
+				'seats': 10
+			}, format='json')
+
+		with django_assert_num_queries(0):
+			response = self.get(api_client, url_screening_availability, screenings, HTTP_IF_NONE_MATCH=etag)
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response['ETag'] != etag
+		assert response.data[0] == {'id': screenings[0].pk, 'available_seats': 0, 'is_available': False}
+
+		with django_capture_on_commit_callbacks(execute=True):
+			Booking.objects.get(screening=screenings[0]).cancel()
+
+		response = self.get(api_client, url_screening_availability, screenings)
+		assert response.data[0]['available_seats'] == 10
+
+	@pytest.mark.integration
+	def test_stale_save_gets_new_version(
+		self, api_client, url_screening_availability, screenings, django_capture_on_commit_callbacks
+	):
+		stale = Screening.objects.get(pk=screenings[0].pk)
+		with django_capture_on_commit_callbacks(execute=True):
+			screenings[0].reserve_seats(4)
+		etag = self.get(api_client, url_screening_availability, screenings)['ETag']
+
+		with django_capture_on_commit_callbacks(execute=True):
+			stale.price = 999
+			stale.save()
+
+		stale.refresh_from_db()
+		assert (stale.version, stale.available_seats) == (3, 6)
+		response = self.get(api_client, url_screening_availability, screenings, HTTP_IF_NONE_MATCH=etag)
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data[0]['available_seats'] == 6
+
+	@pytest.mark.integration
+	def test_screening_update_changes_etag(
+		self, api_client, url_screening_availability, screenings, django_capture_on_commit_callbacks
+	):
+		etag = self.get(api_client, url_screening_availability, screenings)['ETag']
+		version = screenings[0].version
+
+		with django_capture_on_commit_callbacks(execute=True):
+			screenings[0].start_time -= timedelta(days=30)
+			screenings[0].end_time -= timedelta(days=30)
+			screenings[0].save()
+
+		response = self.get(api_client, url_screening_availability, screenings, HTTP_IF_NONE_MATCH=etag)
+
+		assert screenings[0].version == version + 1
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data[0]['is_available'] is False
@@ -2,7 +2,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
-from cinema.tests.factories import ScreeningFactory, BookingFactory
+from cinema.tests.factories import CinemaHallFactory, ScreeningFactory, BookingFactory
 
 
 @pytest.mark.django_db
@@ -15,7 +15,7 @@ class TestBookingViewSet:
 		response = api_client.get(url_booking_list)
 
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 5
+		assert len(response.data['results']) == 5
 
 	@pytest.mark.integration
 	def test_retrieve_booking(self, api_client):
@@ -80,3 +80,84 @@ class TestBookingViewSet:
 		response = api_client.post(url)
 
 		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+	@pytest.mark.integration
+	def test_create_booking_decrements_seats(self, api_client, url_booking_list):
+		screening = ScreeningFactory(available_seats=10)
+
+		booking_data = {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 3
+		}
+
+		response = api_client.post(url_booking_list, booking_data, format='json')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		screening.refresh_from_db()
+		assert screening.available_seats == 7
+
+	@pytest.mark.integration
+	def test_create_booking_with_seat_numbers(self, api_client, url_booking_list):
+		screening = ScreeningFactory(hall=CinemaHallFactory(capacity=20, row_sizes=[10, 10]))
+
+		booking_data = {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 2,
+			'seat_numbers': [[2, 5], [2, 6]]
+		}
+
+		response = api_client.post(url_booking_list, booking_data, format='json')
+		assert response.status_code == status.HTTP_201_CREATED
+		assert response.data['seat_numbers'] == [[2, 5], [2, 6]]
+
+		booking_data['seat_numbers'] = [[2, 6], [2, 7]]
+		response = api_client.post(url_booking_list, booking_data, format='json')
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert 'Выбранные места недоступны' in str(response.data['error'])
+
+	@pytest.mark.integration
+	def test_update_keeps_seats(self, api_client, url_booking_list):
+		screening = ScreeningFactory(hall=CinemaHallFactory(capacity=20, row_sizes=[10, 10]))
+		booking_data = {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 1,
+		}
+		first = api_client.post(url_booking_list, {**booking_data, 'seat_numbers': [[1, 1]]}, format='json').data
+		api_client.post(url_booking_list, {**booking_data, 'seat_numbers': [[1, 2]]}, format='json')
+		url = reverse('booking-detail', args=[first['id']])
+
+		response = api_client.patch(url, {'seat_numbers': [[1, 2]], 'seats': 1, 'screening': ScreeningFactory().pk}, format='json')
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data['seat_numbers'] == [[1, 1]]
+		assert response.data['screening'] == screening.pk
+
+		api_client.post(reverse('booking-cancel', args=[first['id']]))
+		rows = api_client.get(reverse('screening-seats', args=[screening.pk])).data['rows']
+		assert rows[0][:2] == [True, False]
+
+	@pytest.mark.integration
+	def test_create_booking_seat_numbers_count_mismatch(self, api_client, url_booking_list):
+		screening = ScreeningFactory()
+
+		booking_data = {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 3,
+			'seat_numbers': [[1, 1]]
+		}
+
+		response = api_client.post(url_booking_list, booking_data, format='json')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
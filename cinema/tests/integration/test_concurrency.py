@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.models import Screening, Booking
+from cinema.tests.factories import BookingFactory, CinemaHallFactory, ScreeningFactory
+
+
+@pytest.mark.skipif(
+	connection.vendor != 'postgresql',
+	reason="Конкурентные транзакции требуют PostgreSQL"
+)
+@pytest.mark.django_db(transaction=True)
+class TestBookingConcurrency:
+
+	@pytest.mark.integration
+	def test_parallel_bookings_do_not_oversell(self, url_booking_list):
+		hall = CinemaHallFactory(capacity=100)
+		screening = ScreeningFactory(hall=hall)
+
+		def book(i):
+			client = APIClient()
+			try:
+				response = client.post(url_booking_list, {
+					'screening': screening.pk,
+					'customer_name': f'Клиент {i}',
+					'customer_email': f'client{i}@example.com',
+					'customer_phone': '+79160000000',
+					'seats': 1
+				}, format='json')
+				return response.status_code
+			finally:
+				connection.close()
+
+		with ThreadPoolExecutor(max_workers=16) as executor:
+			codes = list(executor.map(book, range(300)))
+
+		screening.refresh_from_db()
+		booked = sum(Booking.objects.filter(screening=screening).values_list('seats', flat=True))
+
+		assert codes.count(status.HTTP_201_CREATED) == 100
+		assert codes.count(status.HTTP_400_BAD_REQUEST) == 200
+		assert screening.available_seats == 0
+		assert booked == 100
+
+	@pytest.mark.integration
+	def test_parallel_overlapping_screenings(self):
+		existing = ScreeningFactory()
+		film, hall = existing.film, existing.hall
+		start_time = existing.end_time + timedelta(days=1)
+
+		def create(i):
+			try:
+				Screening.objects.create(
+					film=film,
+					hall=hall,
+					start_time=start_time + timedelta(minutes=i),
+					end_time=start_time + timedelta(hours=2, minutes=i),
+					price=300
+				)
+				return True
+			except ValidationError:
+				return False
+			finally:
+				connection.close()
+
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			results = list(executor.map(create, range(8)))
+
+		assert results.count(True) == 1
+		assert Screening.objects.filter(hall=hall).count() == 2
+
+	@pytest.mark.integration
+	def test_parallel_cancels_release_seats_once(self):
+		hall = CinemaHallFactory(capacity=10)
+		screening = ScreeningFactory(hall=hall)
+		booking = BookingFactory(screening=screening, seats=4, seat_numbers=screening.reserve_seats(4))
+
+		def cancel(i):
+			try:
+				return APIClient().post(reverse('booking-cancel', args=[booking.pk])).status_code
+			finally:
+				connection.close()
+
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			codes = list(executor.map(cancel, range(16)))
+
+		screening.refresh_from_db()
+		assert codes.count(status.HTTP_200_OK) == 1
+		assert screening.available_seats == 10
+
+	@pytest.mark.integration
+	def test_parallel_retries_with_idempotency_key(self, url_booking_list):
+		hall = CinemaHallFactory(capacity=10)
+		screening = ScreeningFactory(hall=hall)
+
+		def book(i):
+			client = APIClient()
+			try:
+				response = client.post(url_booking_list, {
+					'screening': screening.pk,
+					'customer_name': 'Клиент',
+					'customer_email': 'client@example.com',
+					'customer_phone': '+79160000000',
+					'seats': 2
+				}, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+				return response.status_code, response.data['booking_reference']
+			finally:
+				connection.close()
+
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			results = list(executor.map(book, range(8)))
+
+		screening.refresh_from_db()
+		assert {code for code, _ in results} == {status.HTTP_201_CREATED}
+		assert len({reference for _, reference in results}) == 1
+		assert screening.available_seats == 8
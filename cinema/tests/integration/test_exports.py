@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+
+from cinema.tests.factories import BookingFactory, ScreeningFactory
+
+
+def read(response):
+	return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestBookingExport:
+
+	@pytest.fixture
+	def url_export(self):
+		return reverse('booking-export')
+
+	@pytest.fixture
+	def bookings(self, test_time):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=3), price=Decimal('250.00'))
+		result = []
+		for days, booking_status in ((2, 'confirmed'), (1, 'cancelled'), (0, 'pending')):
+			with freeze_time(test_time - timedelta(days=days)):
+				result.append(BookingFactory(
+					screening=screening, seats=2, status=booking_status, customer_name='Иван «Тест», мл.'
+				))
+		return result
+
+	@pytest.mark.integration
+	def test_csv_export(self, api_client, url_export, bookings):
+		response = api_client.get(url_export)
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response['Content-Type'] == 'text/csv; charset=utf-8'
+		assert 'attachment' in response['Content-Disposition']
+		content = read(response)
+		assert content.startswith('\ufeff')
+		rows = list(csv.DictReader(io.StringIO(content.lstrip('\ufeff'))))
+		assert [int(row['id']) for row in rows] == [booking.pk for booking in bookings]
+		assert rows[0]['customer_name'] == 'Иван «Тест», мл.'
+		assert rows[0]['total_price'] == '500.00'
+		assert rows[0]['film_title'] == bookings[0].screening.film.title
+
+	@pytest.mark.integration
+	def test_ndjson_export_with_filters(self, api_client, url_export, bookings, test_time):
+		response = api_client.get(url_export, {
+			'output': 'ndjson',
+			'date_from': (test_time - timedelta(days=2)).date().isoformat(),
+			'date_to': (test_time - timedelta(days=1)).date().isoformat(),
+			'status': 'confirmed,pending',
+		})
+
+		assert response['Content-Type'] == 'application/x-ndjson'
+		rows = [json.loads(line) for line in read(response).splitlines()]
+		assert [row['id'] for row in rows] == [bookings[0].pk]
+		assert rows[0]['status'] == 'confirmed'
+		assert rows[0]['screening'] == bookings[0].screening_id
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('params', [
+		{'output': 'xlsx'},
+		{'date_from': '15.01.2025'},
+		{'status': 'refunded'},
+	])
+	def test_invalid_params(self, api_client, url_export, params):
+		response = api_client.get(url_export, params)
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+	@pytest.mark.integration
+	def test_export_is_single_query(self, api_client, url_export, bookings, django_assert_num_queries):
+		BookingFactory.create_batch(20)
+
+		with django_assert_num_queries(1):
+			content = read(api_client.get(url_export, {'output': 'ndjson'}))
+
+		assert len(content.splitlines()) == 23
+
+	@pytest.mark.integration
+	def test_export_command(self, bookings, tmp_path):
+		path = tmp_path / 'bookings.ndjson'
+
+		call_command('export_bookings', '--output', 'ndjson', '--path', str(path), '--status', 'cancelled', '--chunk-size', '1')
+
+		rows = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+		assert [row['id'] for row in rows] == [bookings[1].pk]
+
+	@pytest.mark.integration
+	def test_export_command_rejects_bad_status(self):
+		with pytest.raises(CommandError):
+			call_command('export_bookings', '--status', 'refunded')
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from cinema.tests.factories import (
+	BookingFactory,
+	CinemaHallFactory,
+	FilmFactory,
+	GenreFactory,
+	ScreeningFactory
+)
+
+
+@pytest.fixture
+def catalog(test_time):
+	drama = GenreFactory(name='Драма')
+	comedy = GenreFactory(name='Комедия')
+	FilmFactory(title='Без жанра', genres=[])
+	film = FilmFactory(title='Фильм «Кавычки»   и "экранирование"', genres=[drama, comedy])
+
+	hall = CinemaHallFactory(name='Малый зал', capacity=5, row_sizes=[2, 3])
+	sold_out = ScreeningFactory(film=film, hall=hall, start_time=test_time + timedelta(days=1), price=Decimal('350.50'))
+	sold_out.reserve_seats(5)
+	screening = ScreeningFactory(film=film, start_time=test_time + timedelta(hours=5, minutes=30), price=Decimal('0.00'))
+	ScreeningFactory.create_batch(3)
+
+	BookingFactory(screening=screening, seats=2, seat_numbers=[[1, 1], [1, 2]])
+	BookingFactory(screening=screening, status='pending', expires_at=test_time + timedelta(minutes=15))
+	BookingFactory.create_batch(3, status='cancelled')
+
+
+def fetch(api_client, settings, url, fast):
+	settings.FAST_SERIALIZATION = fast
+	cache.clear()
+	response = api_client.get(url)
+	assert response.status_code == 200
+	return response
+
+
+@pytest.mark.django_db
+class TestFastSerialization:
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('url', [
+		reverse('film-list'),
+		reverse('film-list') + '?genre=драма',
+		reverse('screening-list'),
+		reverse('screening-upcoming'),
+		reverse('screening-schedule') + '?date=2025-01-16',
+		reverse('booking-list'),
+	])
+	def test_output_is_byte_identical(self, api_client, settings, catalog, url):
+		slow = fetch(api_client, settings, url, fast=False)
+		fast = fetch(api_client, settings, url, fast=True)
+
+		assert fast.content == slow.content
+		assert b'"id"' in slow.content
+
+	@pytest.mark.integration
+	def test_utc_timestamps_are_byte_identical(self, api_client, settings, catalog):
+		settings.TIME_ZONE = 'UTC'
+
+		slow = fetch(api_client, settings, reverse('booking-list'), fast=False)
+		fast = fetch(api_client, settings, reverse('booking-list'), fast=True)
+
+		assert fast.content == slow.content
+		assert b'Z"' in slow.content
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('name', ['film-list', 'screening-list', 'booking-list'])
+	def test_cursor_pages_are_byte_identical(self, api_client, settings, catalog, name):
+		url = reverse(name) + '?page_size=2'
+		while url:
+			slow = fetch(api_client, settings, url, fast=False)
+			fast = fetch(api_client, settings, url, fast=True)
+			assert fast.content == slow.content
+			url = slow.data['next']
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('name, queries', [
+		('film-list', 2),
+		('screening-list', 1),
+		('booking-list', 1),
+	])
+	def test_query_counts(self, api_client, settings, catalog, django_assert_num_queries, name, queries):
+		settings.FAST_SERIALIZATION = True
+
+		with django_assert_num_queries(queries):
+			api_client.get(reverse(name))
@@ -2,7 +2,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
-from cinema.tests.factories import FilmFactory
+from cinema.tests.factories import FilmFactory, GenreFactory
 
 
 @pytest.mark.django_db
@@ -23,8 +23,7 @@ class TestFilmViewSet:
 			'title': '',
 			'description': 'Тестовое описание',
 			'duration_minutes': -10,
-			'release_year': 3000,
-			'genre': 'Драма'
+			'release_year': 3000
 		}
 
 		response = api_client.post(url_film_list, invalid_data, format='json')
@@ -33,58 +32,100 @@ class TestFilmViewSet:
 
 	@pytest.mark.integration
 	def test_filter_films_by_genre(self, api_client, url_film_list):
-		FilmFactory.create_batch(3, genre='Драма')
-		FilmFactory.create_batch(2, genre='Комедия')
+		drama = GenreFactory(name='Драма')
+		comedy = GenreFactory(name='Комедия')
+		FilmFactory.create_batch(3, genres=[drama])
+		FilmFactory.create_batch(2, genres=[comedy])
 
 		response = api_client.get(url_film_list)
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 5
+		assert len(response.data['results']) == 5
 
-		response = api_client.get(f"{url_film_list}?genre=Драма")
+		response = api_client.get(f"{url_film_list}?genre={drama.slug}")
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 3
-		assert all(film['genre'] == 'Драма' for film in response.data)
+		assert len(response.data['results']) == 3
+		assert all(film['genres'] == [drama.slug] for film in response.data['results'])
 
-		response = api_client.get(f"{url_film_list}?genre=Комедия")
+		response = api_client.get(f"{url_film_list}?genre={comedy.pk}")
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 2
-		assert all(film['genre'] == 'Комедия' for film in response.data)
-
-		response = api_client.get(f"{url_film_list}?genre=дра")  # 'дра' в 'Драма'
-		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 3
-		assert all('Драма' in film['genre'] for film in response.data)
+		assert len(response.data['results']) == 2
+		assert all(film['genres'] == [comedy.slug] for film in response.data['results'])
 
 	@pytest.mark.integration
 	def test_filter_films_by_genre_case_insensitive(self, api_client, url_film_list):
-		FilmFactory.create_batch(2, genre='ДРАМА')
-		FilmFactory.create_batch(1, genre='драма')
-		FilmFactory.create_batch(2, genre='Комедия')
+		FilmFactory.create_batch(2, genres=[GenreFactory(name='Драма')])
+		FilmFactory.create_batch(2, genres=[GenreFactory(name='Комедия')])
 
 		response = api_client.get(f"{url_film_list}?genre=драма")
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 3
+		assert len(response.data['results']) == 2
 
 		response = api_client.get(f"{url_film_list}?genre=ДРАМА")
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 3
+		assert len(response.data['results']) == 2
+
+	@pytest.mark.integration
+	def test_filter_films_by_several_genres(self, api_client, url_film_list):
+		drama = GenreFactory(name='Драма')
+		comedy = GenreFactory(name='Комедия')
+		FilmFactory.create_batch(2, genres=[drama])
+		FilmFactory(genres=[drama, comedy])
+		FilmFactory(genres=[GenreFactory(name='Боевик')])
+
+		response = api_client.get(f"{url_film_list}?genre=драма,комедия")
+		assert response.status_code == status.HTTP_200_OK
+		assert len(response.data['results']) == 3
+
+		response = api_client.get(f"{url_film_list}?genre=комедия&genre=боевик")
+		assert response.status_code == status.HTTP_200_OK
+		assert len(response.data['results']) == 2
 
 	@pytest.mark.integration
 	def test_filter_films_by_nonexistent_genre(self, api_client, url_film_list):
-		FilmFactory.create_batch(3, genre='Драма')
+		FilmFactory.create_batch(3, genres=[GenreFactory(name='Драма')])
 
 		response = api_client.get(f"{url_film_list}?genre=Фантастика")
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 0
+		assert len(response.data['results']) == 0
 
 	@pytest.mark.integration
 	def test_filter_films_empty_genre_param(self, api_client, url_film_list):
-		FilmFactory.create_batch(3, genre='Драма')
+		FilmFactory.create_batch(3, genres=[GenreFactory(name='Драма')])
 
 		response = api_client.get(f"{url_film_list}?genre=")
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 3
+		assert len(response.data['results']) == 3
 
+	@pytest.mark.integration
+	def test_create_film_with_genres(self, api_client, url_film_list, film_data):
+		drama = GenreFactory(name='Драма')
+
+		response = api_client.post(url_film_list, {**film_data, 'genres': [drama.slug]}, format='json')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert response.data['genres'] == [drama.slug]
+
+	@pytest.mark.integration
+	def test_genre_facets(self, api_client, django_assert_num_queries):
+		drama = GenreFactory(name='Драма')
+		comedy = GenreFactory(name='Комедия')
+		GenreFactory(name='Боевик')
+		FilmFactory.create_batch(3, genres=[drama])
+		FilmFactory(genres=[drama, comedy])
+		url = reverse('film-facets')
+
+		with django_assert_num_queries(1):
+			response = api_client.get(url)
+
+		assert response.status_code == status.HTTP_200_OK
+		assert [(genre['slug'], genre['film_count']) for genre in response.data['genres']] == [
+			(drama.slug, 4), (comedy.slug, 1),
+		]
+
+		response = api_client.get(f"{url}?genre={comedy.slug}")
+		assert [(genre['slug'], genre['film_count']) for genre in response.data['genres']] == [
+			(drama.slug, 1), (comedy.slug, 1),
+		]
 
 	@pytest.mark.integration
 	def test_get_nonexistent_film(self, api_client):
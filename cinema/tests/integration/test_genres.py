@@ -0,0 +1,41 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from cinema.models import Genre
+from cinema.tests.factories import GenreFactory
+
+
+@pytest.mark.django_db
+class TestGenreViewSet:
+
+	@pytest.fixture
+	def url_genre_list(self):
+		return reverse('genre-list')
+
+	@pytest.mark.integration
+	def test_create_genre_derives_slug(self, api_client, url_genre_list):
+		response = api_client.post(url_genre_list, {'name': 'Драма'}, format='json')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert response.data['slug'] == 'драма'
+
+	@pytest.mark.integration
+	@pytest.mark.parametrize('data', [{'name': 'драма'}, {'name': 'Мелодрама', 'slug': 'драма'}, {'name': '!!!'}])
+	def test_slug_clash_or_empty(self, api_client, url_genre_list, data):
+		GenreFactory(name='Драма')
+
+		response = api_client.post(url_genre_list, data, format='json')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert 'slug' in response.data
+		assert Genre.objects.count() == 1
+
+	@pytest.mark.integration
+	def test_rename_keeps_slug(self, api_client):
+		genre = GenreFactory(name='Драма')
+
+		response = api_client.patch(reverse('genre-detail', args=[genre.pk]), {'name': 'Драмы'}, format='json')
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data['slug'] == 'драма'
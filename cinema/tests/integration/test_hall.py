@@ -2,7 +2,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
-from cinema.tests.factories import CinemaHallFactory
+from cinema.tests.factories import CinemaHallFactory, ScreeningFactory
 
 
 @pytest.mark.django_db
@@ -15,7 +15,7 @@ class TestCinemaHallViewSet:
 		response = api_client.get(url_hall_list)
 
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 3
+		assert len(response.data['results']) == 3
 
 	@pytest.mark.integration
 	def test_create_hall(self, api_client, url_hall_list, hall_data):
@@ -25,6 +25,15 @@ class TestCinemaHallViewSet:
 		assert response.data['name'] == hall_data['name']
 		assert response.data['capacity'] == hall_data['capacity']
 
+	@pytest.mark.integration
+	def test_create_hall_with_mismatched_rows(self, api_client, url_hall_list, hall_data):
+		hall_data['row_sizes'] = [10, 10]
+
+		response = api_client.post(url_hall_list, hall_data, format='json')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert 'row_sizes' in response.data
+
 	@pytest.mark.integration
 	def test_retrieve_hall(self, api_client):
 		hall = CinemaHallFactory()
@@ -51,6 +60,18 @@ class TestCinemaHallViewSet:
 		assert response.data['name'] == 'Обновленный зал'
 		assert response.data['capacity'] == 150
 
+	@pytest.mark.integration
+	def test_update_layout_with_screenings(self, api_client):
+		hall = CinemaHallFactory(capacity=100)
+		ScreeningFactory(hall=hall)
+		url = reverse('cinemahall-detail', args=[hall.pk])
+
+		response = api_client.patch(url, {'capacity': 150}, format='json')
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+		response = api_client.patch(url, {'name': 'Малый зал'}, format='json')
+		assert response.status_code == status.HTTP_200_OK
+
 	@pytest.mark.integration
 	def test_delete_hall(self, api_client):
 		hall = CinemaHallFactory()
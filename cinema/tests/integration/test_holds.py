@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+
+from cinema.holds import expire_holds
+from cinema.models import Booking
+from cinema.tests.factories import CinemaHallFactory, ScreeningFactory
+
+
+@pytest.mark.django_db
+class TestBookingHolds:
+
+	def _book(self, api_client, screening, **extra):
+		booking_data = {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 2,
+			**extra
+		}
+		return api_client.post(reverse('booking-list'), booking_data, format='json')
+
+	@pytest.mark.integration
+	def test_pending_booking_gets_expiry(self, api_client, test_time, settings):
+		settings.BOOKING_HOLD_TTL = 600
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+
+		response = self._book(api_client, screening)
+
+		assert response.status_code == status.HTTP_201_CREATED
+		booking = Booking.objects.get(pk=response.data['id'])
+		assert booking.expires_at == test_time + timedelta(seconds=600)
+
+	@pytest.mark.integration
+	def test_confirmed_booking_has_no_expiry(self, api_client, test_time):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+
+		response = self._book(api_client, screening, status='confirmed')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert response.data['expires_at'] is None
+
+	@pytest.mark.integration
+	def test_expired_holds_release_seats(self, api_client, test_time, settings):
+		settings.BOOKING_HOLD_TTL = 600
+		hall = CinemaHallFactory(capacity=10)
+		screening = ScreeningFactory(hall=hall, start_time=test_time + timedelta(days=1))
+		self._book(api_client, screening)
+		self._book(api_client, screening)
+		self._book(api_client, screening, status='confirmed')
+
+		with freeze_time(test_time + timedelta(seconds=599)):
+			assert expire_holds() == 0
+
+		with freeze_time(test_time + timedelta(seconds=601)):
+			assert expire_holds() == 2
+
+		screening.refresh_from_db()
+		assert screening.available_seats == 8
+		assert Booking.objects.filter(status='cancelled', expires_at=None).count() == 2
+		assert Booking.objects.filter(status='confirmed').count() == 1
+
+	@pytest.mark.integration
+	def test_confirm_expired_hold(self, api_client, test_time, settings):
+		settings.BOOKING_HOLD_TTL = 600
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		booking_id = self._book(api_client, screening).data['id']
+		url = reverse('booking-detail', args=[booking_id])
+
+		with freeze_time(test_time + timedelta(seconds=601)):
+			response = api_client.patch(url, {'status': 'confirmed'}, format='json')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+		response = api_client.patch(url, {'status': 'confirmed'}, format='json')
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data['expires_at'] is None
+
+	@pytest.mark.integration
+	def test_confirm_hold_on_last_seats(self, api_client, test_time):
+		hall = CinemaHallFactory(capacity=4)
+		screening = ScreeningFactory(hall=hall, start_time=test_time + timedelta(days=1))
+		booking_id = self._book(api_client, screening, seats=3).data['id']
+
+		response = api_client.patch(reverse('booking-detail', args=[booking_id]), {'status': 'confirmed'}, format='json')
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data['status'] == 'confirmed'
+		screening.refresh_from_db()
+		assert screening.available_seats == 1
+
+	@pytest.mark.integration
+	def test_expire_holds_command(self, api_client, test_time, settings, capsys):
+		settings.BOOKING_HOLD_TTL = 60
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		self._book(api_client, screening)
+
+		with freeze_time(test_time + timedelta(minutes=5)):
+			call_command('expire_holds', batch_size=1)
+
+		assert "Снято просроченных броней: 1" in capsys.readouterr().out
@@ -0,0 +1,129 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+
+from cinema.idempotency import purge_idempotency_keys
+from cinema.models import Booking, IdempotencyKey
+from cinema.tests.factories import BookingFactory, CinemaHallFactory, ScreeningFactory
+
+
+@pytest.mark.django_db
+class TestBookingCancellation:
+
+	@pytest.mark.integration
+	def test_cancel_releases_seats_once(self, api_client):
+		hall = CinemaHallFactory(capacity=10)
+		screening = ScreeningFactory(hall=hall)
+		booking = BookingFactory(screening=screening, seats=3, seat_numbers=screening.reserve_seats(3))
+		url = reverse('booking-cancel', args=[booking.pk])
+
+		assert api_client.post(url).status_code == status.HTTP_200_OK
+		assert api_client.post(url).status_code == status.HTTP_400_BAD_REQUEST
+
+		screening.refresh_from_db()
+		booking.refresh_from_db()
+		assert screening.available_seats == 10
+		assert booking.status == 'cancelled'
+
+	@pytest.mark.integration
+	def test_cancel_model_method_is_conditional(self):
+		hall = CinemaHallFactory(capacity=10)
+		screening = ScreeningFactory(hall=hall)
+		booking = BookingFactory(screening=screening, seats=2, seat_numbers=screening.reserve_seats(2))
+		stale = Booking.objects.get(pk=booking.pk)
+
+		assert booking.cancel() is True
+		assert stale.cancel() is False
+
+		screening.refresh_from_db()
+		assert screening.available_seats == 10
+
+
+@pytest.mark.django_db
+class TestIdempotencyKeys:
+
+	@pytest.fixture
+	def booking_data(self):
+		screening = ScreeningFactory(hall=CinemaHallFactory(capacity=10))
+		return {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 2
+		}
+
+	@pytest.mark.integration
+	def test_create_retry_returns_original_response(self, api_client, url_booking_list, booking_data):
+		first = api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+		second = api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+		assert first.status_code == second.status_code == status.HTTP_201_CREATED
+		assert second.json() == first.json()
+		assert second['Idempotent-Replayed'] == 'true'
+		assert Booking.objects.count() == 1
+		assert Booking.objects.get().screening.available_seats == 8
+
+	@pytest.mark.integration
+	def test_different_keys_create_separate_bookings(self, api_client, url_booking_list, booking_data):
+		api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='first')
+		api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='second')
+		api_client.post(url_booking_list, booking_data, format='json')
+
+		assert Booking.objects.count() == 3
+
+	@pytest.mark.integration
+	def test_key_reused_with_other_payload(self, api_client, url_booking_list, booking_data):
+		api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+		response = api_client.post(
+			url_booking_list, {**booking_data, 'seats': 3}, format='json', HTTP_IDEMPOTENCY_KEY='abc'
+		)
+
+		assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+		assert Booking.objects.count() == 1
+
+	@pytest.mark.integration
+	def test_rejected_create_is_replayed(self, api_client, url_booking_list, booking_data):
+		booking_data['seats'] = 11
+
+		first = api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+		second = api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+		assert first.status_code == second.status_code == status.HTTP_400_BAD_REQUEST
+		assert second.json() == first.json()
+
+	@pytest.mark.integration
+	def test_cancel_retry_returns_original_response(self, api_client, url_booking_list, booking_data):
+		booking_id = api_client.post(url_booking_list, booking_data, format='json').data['id']
+		url = reverse('booking-cancel', args=[booking_id])
+
+		first = api_client.post(url, HTTP_IDEMPOTENCY_KEY='cancel-1')
+		second = api_client.post(url, HTTP_IDEMPOTENCY_KEY='cancel-1')
+
+		assert first.status_code == second.status_code == status.HTTP_200_OK
+		assert second.json() == first.json()
+		assert Booking.objects.get(pk=booking_id).screening.available_seats == 10
+
+	@pytest.mark.integration
+	def test_keys_are_scoped_per_endpoint(self, api_client, url_booking_list, booking_data):
+		booking_id = api_client.post(
+			url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='same'
+		).data['id']
+
+		response = api_client.post(reverse('booking-cancel', args=[booking_id]), HTTP_IDEMPOTENCY_KEY='same')
+
+		assert response.status_code == status.HTTP_200_OK
+		assert IdempotencyKey.objects.count() == 2
+
+	@pytest.mark.integration
+	def test_purge_old_keys(self, api_client, url_booking_list, booking_data, test_time, settings):
+		settings.IDEMPOTENCY_KEY_TTL = 3600
+		api_client.post(url_booking_list, booking_data, format='json', HTTP_IDEMPOTENCY_KEY='old')
+
+		with freeze_time(test_time + timedelta(minutes=59)):
+			assert purge_idempotency_keys() == 0
+		with freeze_time(test_time + timedelta(minutes=61)):
+			assert purge_idempotency_keys() == 1
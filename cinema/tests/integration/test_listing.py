@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from cinema.models import ScreeningListing
+from cinema.schedule_import import import_screenings
+from cinema.tests.factories import CinemaHallFactory, FilmFactory, ScreeningFactory
+
+
+@pytest.mark.django_db
+class TestScreeningListing:
+
+	@pytest.fixture
+	def url_listing(self):
+		return reverse('screening-listing')
+
+	@pytest.mark.integration
+	def test_listing_matches_screening_list(self, api_client, url_listing, url_screening_list, test_time):
+		for days in range(1, 4):
+			ScreeningFactory(start_time=test_time + timedelta(days=days))
+
+		listing = api_client.get(url_listing).data['results']
+		screenings = api_client.get(url_screening_list).data['results']
+
+		assert len(listing) == 3
+		assert listing == [{key: item[key] for key in listing[0]} for item in screenings]
+
+	@pytest.mark.integration
+	def test_listing_skips_past_screenings(self, api_client, url_listing, test_time):
+		ScreeningFactory(start_time=test_time - timedelta(days=1))
+		upcoming = ScreeningFactory(start_time=test_time + timedelta(days=1))
+
+		response = api_client.get(url_listing)
+
+		assert [item['id'] for item in response.data['results']] == [upcoming.pk]
+
+	@pytest.mark.integration
+	def test_listing_filters(self, api_client, url_listing, test_time):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		ScreeningFactory(start_time=test_time + timedelta(days=2))
+
+		response = api_client.get(f"{url_listing}?film={screening.film_id}")
+		assert [item['id'] for item in response.data['results']] == [screening.pk]
+
+		response = api_client.get(f"{url_listing}?hall={screening.hall_id}")
+		assert [item['id'] for item in response.data['results']] == [screening.pk]
+
+		response = api_client.get(f"{url_listing}?hall=abc")
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+	@pytest.mark.integration
+	def test_seat_changes_update_listing(self, test_time):
+		hall = CinemaHallFactory(capacity=10)
+		screening = ScreeningFactory(hall=hall, start_time=test_time + timedelta(days=1))
+
+		seat_numbers = screening.reserve_seats(4)
+		assert ScreeningListing.objects.get(pk=screening.pk).available_seats == 6
+
+		screening.release_seats(4, seat_numbers)
+		assert ScreeningListing.objects.get(pk=screening.pk).available_seats == 10
+
+	@pytest.mark.integration
+	def test_renames_and_edits_update_listing(self, test_time):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+
+		screening.film.title = 'Новое название'
+		screening.film.save()
+		screening.hall.name = 'Зал IMAX'
+		screening.hall.save()
+		screening.price = 999
+		screening.save()
+
+		listing = ScreeningListing.objects.get(pk=screening.pk)
+		assert (listing.film_title, listing.hall_name, listing.price) == ('Новое название', 'Зал IMAX', 999)
+
+		screening.delete()
+		assert not ScreeningListing.objects.exists()
+
+	@pytest.mark.integration
+	def test_import_creates_listing(self, test_time):
+		film = FilmFactory()
+		hall = CinemaHallFactory()
+		start = test_time + timedelta(days=1)
+
+		created, errors = import_screenings([{
+			'film': film.pk,
+			'hall': hall.pk,
+			'start_time': start.isoformat(),
+			'end_time': (start + timedelta(hours=2)).isoformat(),
+			'price': '350.00'
+		}])
+
+		assert (created, errors) == (1, [])
+		listing = ScreeningListing.objects.get()
+		assert (listing.film_title, listing.hall_name, listing.available_seats) == (film.title, hall.name, hall.capacity)
@@ -0,0 +1,98 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from cinema.metrics import REGISTRY
+from cinema.tests.factories import BookingFactory, FilmFactory, ScreeningFactory
+
+
+def sample(name, **labels):
+	return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+	@pytest.fixture
+	def metrics_enabled(self, settings):
+		settings.METRICS_ENABLED = True
+
+	@pytest.mark.integration
+	def test_request_metrics_per_action(self, metrics_enabled, api_client, url_film_list):
+		FilmFactory.create_batch(3)
+		requests = sample('cinema_request_duration_seconds_count', view='FilmViewSet.list', method='GET', status='200')
+		queries = sample('cinema_request_db_queries_sum', view='FilmViewSet.list')
+		serializer_time = sample('cinema_request_serializer_duration_seconds_sum', view='FilmViewSet.list')
+
+		response = api_client.get(url_film_list)
+
+		assert response.status_code == status.HTTP_200_OK
+		assert sample(
+			'cinema_request_duration_seconds_count', view='FilmViewSet.list', method='GET', status='200'
+		) == requests + 1
+		assert sample('cinema_request_db_queries_sum', view='FilmViewSet.list') == queries + 2
+		assert sample('cinema_request_serializer_duration_seconds_sum', view='FilmViewSet.list') > serializer_time
+
+	@pytest.mark.integration
+	def test_extra_actions_and_errors_are_labelled(self, metrics_enabled, api_client):
+		screening = ScreeningFactory()
+		before = sample('cinema_request_duration_seconds_count', view='ScreeningViewSet.seats', method='GET', status='200')
+		missing = sample('cinema_request_duration_seconds_count', view='BookingViewSet.retrieve', method='GET', status='404')
+
+		api_client.get(reverse('screening-seats', args=[screening.pk]))
+		api_client.get(reverse('booking-detail', args=[0]))
+
+		assert sample(
+			'cinema_request_duration_seconds_count', view='ScreeningViewSet.seats', method='GET', status='200'
+		) == before + 1
+		assert sample(
+			'cinema_request_duration_seconds_count', view='BookingViewSet.retrieve', method='GET', status='404'
+		) == missing + 1
+
+	@pytest.mark.integration
+	def test_fast_path_serializer_time(self, metrics_enabled, settings, api_client, url_screening_list):
+		settings.FAST_SERIALIZATION = True
+		ScreeningFactory.create_batch(2)
+		before = sample('cinema_request_serializer_duration_seconds_sum', view='ScreeningViewSet.list')
+
+		api_client.get(url_screening_list)
+
+		assert sample('cinema_request_serializer_duration_seconds_sum', view='ScreeningViewSet.list') > before
+
+	@pytest.mark.integration
+	def test_streaming_response_observed_on_close(self, metrics_enabled, api_client):
+		BookingFactory.create_batch(3)
+		labels = {'view': 'BookingViewSet.export'}
+		requests = sample('cinema_request_duration_seconds_count', method='GET', status='200', **labels)
+		queries = sample('cinema_request_db_queries_sum', **labels)
+
+		response = api_client.get(reverse('booking-export'), {'output': 'ndjson'})
+		content = b''.join(response.streaming_content)
+
+		assert len(content.splitlines()) == 3
+		assert sample('cinema_request_duration_seconds_count', method='GET', status='200', **labels) == requests + 1
+		assert sample('cinema_request_db_queries_sum', **labels) == queries + 1
+
+	@pytest.mark.integration
+	def test_metrics_endpoint(self, metrics_enabled, api_client, url_hall_list):
+		api_client.get(url_hall_list)
+
+		response = api_client.get(reverse('metrics'))
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response['Content-Type'].startswith('text/plain')
+		body = response.content.decode()
+		assert 'cinema_request_duration_seconds_bucket{' in body
+		assert 'view="CinemaHallViewSet.list"' in body
+
+	@pytest.mark.integration
+	def test_disabled(self, settings, api_client, url_hall_list):
+		settings.METRICS_ENABLED = False
+		before = sample('cinema_request_duration_seconds_count', view='CinemaHallViewSet.list', method='GET', status='200')
+
+		api_client.get(url_hall_list)
+
+		assert sample(
+			'cinema_request_duration_seconds_count', view='CinemaHallViewSet.list', method='GET', status='200'
+		) == before
+		assert api_client.get(reverse('metrics')).status_code == status.HTTP_404_NOT_FOUND
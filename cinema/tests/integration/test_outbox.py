@@ -0,0 +1,149 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+
+from cinema.models import Booking, OutboxMessage
+from cinema.outbox import HANDLERS, process_outbox
+from cinema.tests.factories import CinemaHallFactory, ScreeningFactory
+
+
+@pytest.mark.django_db
+class TestBookingOutbox:
+
+	def _book(self, api_client, screening, **extra):
+		booking_data = {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 2,
+			**extra
+		}
+		return api_client.post(reverse('booking-list'), booking_data, format='json')
+
+	@pytest.mark.integration
+	def test_confirmed_booking_is_queued_not_sent(self, api_client, test_time, mailoutbox, sms_outbox):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+
+		response = self._book(api_client, screening, status='confirmed')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert sorted(OutboxMessage.objects.values_list('topic', flat=True)) == ['booking.email', 'booking.sms']
+		assert mailoutbox == []
+		assert sms_outbox == []
+
+	@pytest.mark.integration
+	def test_failed_booking_leaves_no_messages(self, api_client, test_time):
+		hall = CinemaHallFactory(capacity=1)
+		screening = ScreeningFactory(hall=hall, start_time=test_time + timedelta(days=1))
+
+		response = self._book(api_client, screening, status='confirmed')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert not OutboxMessage.objects.exists()
+
+	@pytest.mark.integration
+	def test_confirming_hold_queues_messages_once(self, api_client, test_time):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		response = self._book(api_client, screening)
+		assert not OutboxMessage.objects.exists()
+
+		url = reverse('booking-detail', args=[response.data['id']])
+		api_client.patch(url, {'status': 'confirmed'}, format='json')
+		api_client.patch(url, {'customer_name': 'Пётр Иванов'}, format='json')
+
+		assert OutboxMessage.objects.count() == 2
+
+	@pytest.mark.integration
+	def test_worker_sends_email_and_sms(self, api_client, test_time, mailoutbox, sms_outbox):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		reference = self._book(api_client, screening, status='confirmed').data['booking_reference']
+
+		assert process_outbox() == 2
+
+		assert len(mailoutbox) == 1
+		assert mailoutbox[0].to == ['ivan@example.com']
+		assert reference in mailoutbox[0].subject
+		assert sms_outbox == [{'phone': '+79161234567', 'text': mock.ANY}]
+		assert reference in sms_outbox[0]['text']
+		assert set(OutboxMessage.objects.values_list('status', flat=True)) == {'sent'}
+		assert process_outbox() == 0
+
+	@pytest.mark.integration
+	def test_cancelled_booking_is_not_notified(self, api_client, test_time, mailoutbox):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		booking_id = self._book(api_client, screening, status='confirmed').data['id']
+		Booking.objects.filter(pk=booking_id).update(status='cancelled')
+
+		process_outbox()
+
+		assert mailoutbox == []
+		assert set(OutboxMessage.objects.values_list('status', flat=True)) == {'sent'}
+
+	@pytest.mark.integration
+	def test_failed_delivery_is_retried_with_backoff(self, api_client, test_time, settings, mailoutbox):
+		settings.OUTBOX_RETRY_DELAY = 10
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		self._book(api_client, screening, status='confirmed')
+
+		with mock.patch('cinema.transports.send_mail', side_effect=ConnectionError('SMTP недоступен')):
+			process_outbox()
+		message = OutboxMessage.objects.get(topic='booking.email')
+		assert message.status == 'pending'
+		assert message.attempts == 1
+		assert message.available_at == test_time + timedelta(seconds=10)
+		assert 'SMTP недоступен' in message.last_error
+
+		assert process_outbox() == 0
+		with freeze_time(test_time + timedelta(seconds=10)):
+			assert process_outbox() == 1
+
+		message.refresh_from_db()
+		assert message.status == 'sent'
+		assert message.attempts == 2
+		assert len(mailoutbox) == 1
+
+	@pytest.mark.integration
+	def test_message_fails_after_max_attempts(self, test_time, settings):
+		settings.OUTBOX_MAX_ATTEMPTS = 2
+		settings.OUTBOX_RETRY_DELAY = 0
+		OutboxMessage.objects.create(topic='unknown.topic', payload={})
+
+		process_outbox()
+		process_outbox()
+
+		message = OutboxMessage.objects.get()
+		assert message.status == 'failed'
+		assert message.attempts == 2
+		assert process_outbox() == 0
+
+	@pytest.mark.integration
+	def test_database_error_rolls_back_only_its_message(self, test_time, monkeypatch):
+		def broken(payload):
+			OutboxMessage.objects.create(topic='side.effect', payload={})
+			raise DatabaseError('current transaction is aborted')
+
+		monkeypatch.setitem(HANDLERS, 'test.broken', broken)
+		monkeypatch.setitem(HANDLERS, 'test.ok', lambda payload: None)
+		OutboxMessage.objects.create(topic='test.broken', payload={})
+		OutboxMessage.objects.create(topic='test.ok', payload={})
+
+		assert process_outbox() == 2
+
+		statuses = dict(OutboxMessage.objects.values_list('topic', 'status'))
+		assert statuses == {'test.broken': 'pending', 'test.ok': 'sent'}
+
+	@pytest.mark.integration
+	def test_process_outbox_command(self, api_client, test_time, capsys):
+		screening = ScreeningFactory(start_time=test_time + timedelta(days=1))
+		self._book(api_client, screening, status='confirmed')
+
+		call_command('process_outbox')
+
+		assert 'Обработано сообщений: 2' in capsys.readouterr().out
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from cinema.pagination import CinemaCursorPagination
+from cinema.tests.factories import FilmFactory, BookingFactory
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+	@pytest.mark.integration
+	def test_films_paginated_by_title(self, api_client, url_film_list):
+		for title in ['Бэтмен', 'Аватар', 'Дюна', 'Вий', 'Гарри']:
+			FilmFactory(title=title)
+
+		response = api_client.get(url_film_list, {'page_size': 2})
+		titles = [film['title'] for film in response.data['results']]
+		while response.data['next']:
+			response = api_client.get(response.data['next'])
+			titles += [film['title'] for film in response.data['results']]
+
+		assert titles == ['Аватар', 'Бэтмен', 'Вий', 'Гарри', 'Дюна']
+
+	@pytest.mark.integration
+	def test_films_with_equal_titles_are_not_lost(self, api_client, url_film_list):
+		films = FilmFactory.create_batch(5, title='Дубль')
+
+		response = api_client.get(url_film_list, {'page_size': 2})
+		ids = [film['id'] for film in response.data['results']]
+		while response.data['next']:
+			response = api_client.get(response.data['next'])
+			ids += [film['id'] for film in response.data['results']]
+
+		assert ids == [film.pk for film in films]
+
+	@pytest.mark.integration
+	def test_bookings_newest_first(self, api_client, url_booking_list):
+		bookings = BookingFactory.create_batch(3)
+
+		response = api_client.get(url_booking_list)
+
+		assert response.status_code == status.HTTP_200_OK
+		assert [booking['id'] for booking in response.data['results']] == [b.pk for b in reversed(bookings)]
+		assert response.data['next'] is None
+
+	@pytest.mark.integration
+	def test_page_size_is_bounded(self, api_client, url_film_list, monkeypatch):
+		monkeypatch.setattr(CinemaCursorPagination, 'max_page_size', 2)
+		FilmFactory.create_batch(3)
+
+		response = api_client.get(url_film_list, {'page_size': 100000})
+
+		assert response.status_code == status.HTTP_200_OK
+		assert len(response.data['results']) == 2
+		assert response.data['next'] is not None
+
+	@pytest.mark.integration
+	def test_equal_titles_seek_without_offset(self, api_client, url_film_list):
+		films = FilmFactory.create_batch(6, title='Дубль')
+		response = api_client.get(url_film_list, {'page_size': 2})
+
+		with CaptureQueriesContext(connection) as queries:
+			response = api_client.get(response.data['next'])
+
+		assert [film['id'] for film in response.data['results']] == [film.pk for film in films[2:4]]
+		assert not any('OFFSET' in query['sql'] for query in queries)
+
+		response = api_client.get(response.data['previous'])
+		assert [film['id'] for film in response.data['results']] == [film.pk for film in films[:2]]
+
+	@pytest.mark.integration
+	def test_invalid_cursor(self, api_client, url_film_list):
+		response = api_client.get(url_film_list, {'cursor': 'cD1ub3Rqc29u'})
+
+		assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,70 @@
+import pytest
+from django.urls import reverse
+
+from cinema.tests.factories import (
+	FilmFactory,
+	CinemaHallFactory,
+	ScreeningFactory,
+	BookingFactory
+)
+
+
+@pytest.mark.django_db
+class TestQueryCounts:
+
+	@pytest.mark.integration
+	def test_film_list(self, api_client, url_film_list, django_assert_num_queries):
+		FilmFactory.create_batch(10)
+
+		# Фильмы и одна выборка жанров через prefetch_related.
+		with django_assert_num_queries(2):
+			api_client.get(url_film_list)
+
+	@pytest.mark.integration
+	def test_hall_list(self, api_client, url_hall_list, django_assert_num_queries):
+		CinemaHallFactory.create_batch(10)
+
+		with django_assert_num_queries(1):
+			api_client.get(url_hall_list)
+
+	@pytest.mark.integration
+	def test_screening_list(self, api_client, url_screening_list, django_assert_num_queries):
+		ScreeningFactory.create_batch(10)
+
+		with django_assert_num_queries(1):
+			api_client.get(url_screening_list)
+
+	@pytest.mark.integration
+	def test_screening_upcoming(self, api_client, url_screening_upcoming, django_assert_num_queries):
+		ScreeningFactory.create_batch(10)
+
+		with django_assert_num_queries(1):
+			api_client.get(url_screening_upcoming)
+
+	@pytest.mark.integration
+	def test_screening_listing(self, api_client, django_assert_num_queries):
+		ScreeningFactory.create_batch(10)
+
+		with django_assert_num_queries(1):
+			api_client.get(reverse('screening-listing'))
+
+	@pytest.mark.integration
+	def test_screening_detail(self, api_client, django_assert_num_queries):
+		screening = ScreeningFactory()
+
+		with django_assert_num_queries(1):
+			api_client.get(reverse('screening-detail', args=[screening.pk]))
+
+	@pytest.mark.integration
+	def test_booking_list(self, api_client, url_booking_list, django_assert_num_queries):
+		BookingFactory.create_batch(10)
+
+		with django_assert_num_queries(1):
+			api_client.get(url_booking_list)
+
+	@pytest.mark.integration
+	def test_booking_detail(self, api_client, django_assert_num_queries):
+		booking = BookingFactory()
+
+		with django_assert_num_queries(1):
+			api_client.get(reverse('booking-detail', args=[booking.pk]))
@@ -16,8 +16,7 @@ class TestIntegrationScenarios:
 				'title': 'Интеграционный фильм',
 				'description': 'Описание',
 				'duration_minutes': 120,
-				'release_year': 2024,
-				'genre': 'Драма'
+				'release_year': 2024
 			}
 			film_response = api_client.post(reverse('film-list'), film_data, format='json')
 			assert film_response.status_code == status.HTTP_201_CREATED
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from cinema import schedule_cache
+from cinema.tests.factories import CinemaHallFactory, ScreeningFactory
+
+
+@pytest.mark.django_db
+class TestScheduleCache:
+
+	@pytest.mark.integration
+	def test_upcoming_is_cached(self, api_client, url_screening_upcoming, django_assert_num_queries):
+		ScreeningFactory.create_batch(3)
+		api_client.get(url_screening_upcoming)
+
+		with django_assert_num_queries(0):
+			response = api_client.get(url_screening_upcoming)
+
+		assert response.status_code == status.HTTP_200_OK
+		assert len(response.data) == 3
+
+	@pytest.mark.integration
+	def test_booking_patches_cached_seats(
+		self, api_client, url_screening_upcoming, url_booking_list,
+		django_assert_num_queries, django_capture_on_commit_callbacks
+	):
+		screening = ScreeningFactory(hall=CinemaHallFactory(capacity=10))
+		api_client.get(url_screening_upcoming)
+
+		with django_capture_on_commit_callbacks(execute=True):
+			api_client.post(url_booking_list, {
+				'screening': screening.pk,
+				'customer_name': 'Иван Петров',
+				'customer_email': 'ivan@example.com',
+				'customer_phone': '+79161234567',
+				'seats': 10
+			}, format='json')
+
+		with django_assert_num_queries(0):
+			response = api_client.get(url_screening_upcoming)
+
+		assert response.data[0]['available_seats'] == 0
+		assert response.data[0]['is_available'] is False
+
+	@pytest.mark.integration
+	def test_screening_change_invalidates(
+		self, api_client, url_screening_upcoming, django_capture_on_commit_callbacks
+	):
+		ScreeningFactory()
+		api_client.get(url_screening_upcoming)
+
+		with django_capture_on_commit_callbacks(execute=True):
+			ScreeningFactory()
+
+		response = api_client.get(url_screening_upcoming)
+		assert len(response.data) == 2
+
+	@pytest.mark.integration
+	def test_schedule_by_day_and_hall(self, api_client, test_time):
+		hall = CinemaHallFactory()
+		day = test_time + timedelta(days=3)
+		ScreeningFactory(hall=hall, start_time=day, end_time=day + timedelta(hours=2))
+		ScreeningFactory(start_time=day, end_time=day + timedelta(hours=2))
+		ScreeningFactory(hall=hall, start_time=day + timedelta(days=1), end_time=day + timedelta(days=1, hours=2))
+		url = reverse('screening-schedule')
+
+		response = api_client.get(url, {'date': day.date().isoformat()})
+		assert len(response.data) == 2
+
+		response = api_client.get(url, {'date': day.date().isoformat(), 'hall': hall.pk})
+		assert len(response.data) == 1
+
+		response = api_client.get(url, {'date': '2025-02-30'})
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+	@pytest.mark.integration
+	def test_older_seat_patch_is_ignored(self, api_client, url_screening_upcoming):
+		screening = ScreeningFactory(hall=CinemaHallFactory(capacity=10))
+		api_client.get(url_screening_upcoming)
+
+		schedule_cache.set_seats(screening.pk, 4, version=3)
+		schedule_cache.set_seats(screening.pk, 7, version=2)
+
+		response = api_client.get(url_screening_upcoming)
+		assert response.data[0]['available_seats'] == 4
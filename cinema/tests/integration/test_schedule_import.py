@@ -0,0 +1,111 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.urls import reverse
+from rest_framework import status
+
+from cinema.models import DailySales, Screening
+from cinema.tests.factories import FilmFactory, CinemaHallFactory, ScreeningFactory
+
+
+@pytest.fixture
+def url_screening_import():
+	return reverse('screening-import-schedule')
+
+
+def make_rows(film, hall, start, count):
+	return [
+		{
+			'film': film.pk,
+			'hall': hall.pk,
+			'start_time': (start + timedelta(hours=3 * i)).isoformat(),
+			'end_time': (start + timedelta(hours=3 * i + 2)).isoformat(),
+			'price': '350.00'
+		}
+		for i in range(count)
+	]
+
+
+@pytest.mark.django_db
+class TestScheduleImport:
+
+	@pytest.mark.integration
+	def test_import_json(self, api_client, url_screening_import, test_time, django_assert_max_num_queries):
+		film = FilmFactory()
+		hall = CinemaHallFactory(capacity=80)
+		rows = make_rows(film, hall, test_time + timedelta(days=1), 50)
+
+		with django_assert_max_num_queries(15):
+			response = api_client.post(url_screening_import, rows, format='json')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert response.data['created'] == 50
+		assert DailySales.objects.filter(hall=hall).aggregate(total=Sum('capacity'))['total'] == 80 * 50
+		screening = Screening.objects.filter(hall=hall).first()
+		assert screening.available_seats == 80
+		assert screening.reserve_seats(2) is not None
+
+	@pytest.mark.integration
+	def test_import_csv(self, api_client, url_screening_import, test_time):
+		film = FilmFactory()
+		hall = CinemaHallFactory()
+		rows = make_rows(film, hall, test_time + timedelta(days=1), 3)
+		content = 'film,hall,start_time,end_time,price\n' + ''.join(
+			f"{row['film']},{row['hall']},{row['start_time']},{row['end_time']},{row['price']}\n" for row in rows
+		)
+
+		response = api_client.post(url_screening_import, content, content_type='text/csv')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert Screening.objects.count() == 3
+
+	@pytest.mark.integration
+	def test_import_empty(self, api_client, url_screening_import):
+		response = api_client.post(url_screening_import, [], format='json')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert response.data['created'] == 0
+
+		response = api_client.post(url_screening_import, 'film,hall,start_time,end_time,price\n', content_type='text/csv')
+
+		assert response.status_code == status.HTTP_201_CREATED
+		assert Screening.objects.count() == 0
+
+	@pytest.mark.integration
+	def test_import_reports_errors_and_inserts_nothing(self, api_client, url_screening_import, test_time):
+		film = FilmFactory()
+		hall = CinemaHallFactory()
+		start = test_time + timedelta(days=1)
+		ScreeningFactory(film=film, hall=hall, start_time=start, end_time=start + timedelta(hours=2))
+
+		rows = make_rows(film, hall, start + timedelta(hours=3), 3)
+		rows.append(make_rows(film, hall, start + timedelta(hours=1), 1)[0])
+		rows.append(make_rows(film, hall, start + timedelta(hours=4), 1)[0])
+		rows.append({**rows[0], 'hall': 99999})
+		rows.append({**rows[0], 'price': 'дорого'})
+
+		response = api_client.post(url_screening_import, rows, format='json')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert [error['row'] for error in response.data['errors']] == [4, 5, 6, 7]
+		assert Screening.objects.count() == 1
+
+	@pytest.mark.integration
+	def test_import_command(self, tmp_path, test_time, capsys):
+		film = FilmFactory()
+		hall = CinemaHallFactory()
+		path = tmp_path / 'schedule.json'
+		rows = make_rows(film, hall, test_time + timedelta(days=1), 2)
+		path.write_text(json.dumps(rows))
+
+		call_command('import_schedule', str(path))
+
+		assert Screening.objects.count() == 2
+		assert "Импортировано сеансов: 2" in capsys.readouterr().out
+
+		with pytest.raises(CommandError):
+			call_command('import_schedule', str(path))
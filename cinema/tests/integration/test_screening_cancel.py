@@ -0,0 +1,114 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from cinema.models import Booking, ScreeningListing
+from cinema.tests.factories import BookingFactory, CinemaHallFactory, ScreeningFactory
+
+
+def read_report(response):
+	lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+	return lines[0]['summary'], lines[1:]
+
+
+@pytest.mark.django_db
+class TestScreeningCancel:
+
+	@pytest.fixture
+	def screening(self, test_time):
+		hall = CinemaHallFactory(capacity=100)
+		return ScreeningFactory(hall=hall, start_time=test_time + timedelta(days=1), price=Decimal('300.00'))
+
+	def _book(self, screening, seats, **extra):
+		return BookingFactory(screening=screening, seats=seats, seat_numbers=screening.reserve_seats(seats), **extra)
+
+	@pytest.mark.integration
+	def test_cancel_show_refunds_and_resets_seats(self, api_client, screening):
+		confirmed = [self._book(screening, 2) for _ in range(3)]
+		self._book(screening, 1, status='pending')
+		self._book(screening, 4, status='cancelled')
+
+		response = api_client.post(reverse('screening-cancel', args=[screening.pk]))
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response['Content-Type'] == 'application/x-ndjson'
+		summary, refunds = read_report(response)
+		assert summary == {
+			'screening': screening.pk,
+			'cancelled': 4,
+			'seats_released': 7,
+			'refunds': 3,
+			'refunded_total': '1800.00',
+		}
+		assert [line['booking'] for line in refunds if line['refund'] != '0.00'] == [b.pk for b in confirmed]
+
+		screening.refresh_from_db()
+		assert screening.is_cancelled
+		assert screening.available_seats == 0
+		assert not ScreeningListing.objects.filter(pk=screening.pk).exists()
+		assert not Booking.objects.exclude(status='cancelled').exists()
+		assert screening.reserve_seats(1) is None
+
+	@pytest.mark.integration
+	def test_cancelled_show_is_off_sale(
+		self, api_client, screening, url_booking_list, url_screening_upcoming, url_screening_availability,
+		django_capture_on_commit_callbacks
+	):
+		api_client.get(url_screening_upcoming)
+		with django_capture_on_commit_callbacks(execute=True):
+			read_report(api_client.post(reverse('screening-cancel', args=[screening.pk])))
+
+		response = api_client.post(url_booking_list, {
+			'screening': screening.pk,
+			'customer_name': 'Иван Петров',
+			'customer_email': 'ivan@example.com',
+			'customer_phone': '+79161234567',
+			'seats': 1
+		}, format='json')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert 'Сеанс отменён' in str(response.data['error'])
+		assert api_client.get(url_screening_upcoming).data == []
+		assert api_client.get(reverse('screening-listing')).data['results'] == []
+		assert api_client.get(url_screening_availability, {'ids': screening.pk}).data == []
+
+		screening.price = Decimal('350.00')
+		screening.save()
+		screening.refresh_from_db()
+		assert screening.is_cancelled and screening.available_seats == 0
+		assert not ScreeningListing.objects.filter(pk=screening.pk).exists()
+
+	@pytest.mark.integration
+	def test_cancel_show_query_count_is_constant(self, api_client, screening, django_assert_max_num_queries):
+		for _ in range(50):
+			self._book(screening, 1)
+
+		with django_assert_max_num_queries(9):
+			response = api_client.post(reverse('screening-cancel', args=[screening.pk]))
+			summary, _ = read_report(response)
+
+		assert summary['cancelled'] == 50
+
+	@pytest.mark.integration
+	def test_repeat_cancel_is_noop(self, api_client, screening):
+		self._book(screening, 2)
+		url = reverse('screening-cancel', args=[screening.pk])
+		read_report(api_client.post(url))
+
+		summary, refunds = read_report(api_client.post(url))
+
+		assert summary['cancelled'] == 0
+		assert summary['refunded_total'] == '0.00'
+		assert refunds == []
+
+	@pytest.mark.integration
+	def test_cannot_cancel_past_screening(self, api_client, test_time):
+		screening = ScreeningFactory(start_time=test_time - timedelta(days=1))
+
+		response = api_client.post(reverse('screening-cancel', args=[screening.pk]))
+
+		assert response.status_code == status.HTTP_404_NOT_FOUND
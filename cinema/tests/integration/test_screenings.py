@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 import pytest
+from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 
@@ -61,7 +62,7 @@ class TestScreeningViewSet:
 		response = api_client.get(url_screening_list)
 
 		assert response.status_code == status.HTTP_200_OK
-		assert len(response.data) == 3
+		assert len(response.data['results']) == 3
 
 
 	@pytest.mark.integration
@@ -77,3 +78,35 @@ class TestScreeningViewSet:
 		response = api_client.post(url_booking_list, booking_data, format='json')
 
 		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+	@pytest.mark.integration
+	def test_screening_seats(self, api_client):
+		hall = CinemaHallFactory(capacity=6, row_sizes=[3, 3])
+		screening = ScreeningFactory(hall=hall)
+		screening.reserve_seats(1, [[1, 2]])
+		url = reverse('screening-seats', args=[screening.pk])
+
+		response = api_client.get(url, {'adjacent': 3})
+
+		assert response.status_code == status.HTTP_200_OK
+		assert response.data['available_seats'] == 5
+		assert response.data['rows'] == [[True, False, True], [True, True, True]]
+		assert response.data['suggestion'] == [[2, 1], [2, 2], [2, 3]]
+
+	@pytest.mark.integration
+	def test_create_overlapping_screening(self, api_client, url_screening_list):
+		hall = CinemaHallFactory()
+		existing = ScreeningFactory(hall=hall)
+
+		screening_data = {
+			'film': FilmFactory().pk,
+			'hall': hall.pk,
+			'start_time': existing.start_time + timedelta(minutes=30),
+			'end_time': existing.end_time + timedelta(minutes=30),
+			'price': 500.00
+		}
+
+		response = api_client.post(url_screening_list, screening_data, format='json')
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+		assert "уже есть сеанс" in str(response.data)
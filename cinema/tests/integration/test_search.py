@@ -0,0 +1,59 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from cinema.search import stem, tokenize
+from cinema.tests.factories import FilmFactory, GenreFactory
+
+
+@pytest.fixture
+def url_film_search():
+	return reverse('film-search')
+
+
+@pytest.mark.django_db
+class TestFilmSearch:
+
+	@pytest.mark.integration
+	def test_search_ranks_title_above_description(self, api_client, url_film_search):
+		in_description = FilmFactory(title='Тихий вечер', description='История о космических пиратах', genres=[GenreFactory(name='Драма')])
+		in_title = FilmFactory(title='Космические пираты', description='Приключения экипажа', genres=[GenreFactory(name='Боевик')])
+		FilmFactory(title='Осенний сад', description='Семейная история', genres=[GenreFactory(name='Драма')])
+
+		response = api_client.get(url_film_search, {'q': 'космический пират'})
+
+		assert response.status_code == status.HTTP_200_OK
+		assert [film['id'] for film in response.data] == [in_title.pk, in_description.pk]
+
+	@pytest.mark.integration
+	def test_search_by_genre(self, api_client, url_film_search):
+		FilmFactory.create_batch(2, genres=[GenreFactory(name='Комедия')])
+		FilmFactory(genres=[GenreFactory(name='Драма')])
+
+		response = api_client.get(url_film_search, {'q': 'комедии'})
+
+		assert len(response.data) == 2
+
+	@pytest.mark.integration
+	def test_search_sees_updates(self, api_client, url_film_search):
+		film = FilmFactory(title='Старое название')
+		api_client.get(url_film_search, {'q': 'название'})
+
+		film.title = 'Новый заголовок'
+		film.save()
+
+		response = api_client.get(url_film_search, {'q': 'заголовок'})
+		assert [item['id'] for item in response.data] == [film.pk]
+
+	@pytest.mark.integration
+	def test_search_requires_query(self, api_client, url_film_search):
+		response = api_client.get(url_film_search)
+
+		assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestStemming:
+	@pytest.mark.unit
+	def test_word_forms_share_stem(self):
+		assert stem('комедия') == stem('комедии') == stem('комедией')
+		assert tokenize('Космические ПИРАТЫ') == tokenize('космических пиратов')
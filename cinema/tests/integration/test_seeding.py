@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Q, Sum
+
+from cinema import references
+from cinema.models import Booking, CinemaHall, DailySales, Film, Screening, ScreeningListing
+from cinema.seeding import seed
+
+
+@pytest.mark.django_db
+class TestSeeding:
+
+	@pytest.fixture
+	def seeded(self):
+		return seed(films=10, halls=3, screenings=60, bookings=1500, chunk_size=25)
+
+	@pytest.mark.integration
+	def test_counts(self, seeded):
+		assert seeded == {'films': 10, 'halls': 3, 'screenings': 60, 'bookings': Booking.objects.count()}
+		assert Film.objects.count() == 10
+		assert CinemaHall.objects.count() == 3
+		assert Screening.objects.count() == 60
+		assert ScreeningListing.objects.count() == 60
+		assert Booking.objects.count() > 0
+
+	@pytest.mark.integration
+	def test_schedule_has_no_overlaps(self, seeded):
+		for hall in CinemaHall.objects.all():
+			previous = None
+			for screening in Screening.objects.filter(hall=hall).order_by('start_time'):
+				assert screening.end_time > screening.start_time
+				if previous is not None:
+					assert screening.start_time >= previous.end_time
+				previous = screening
+
+	@pytest.mark.integration
+	def test_seats_and_prices_are_consistent(self, seeded):
+		screenings = Screening.objects.select_related('hall').annotate(
+			booked=Sum('booking__seats', filter=~Q(booking__status='cancelled'))
+		)
+		for screening in screenings:
+			assert screening.available_seats == screening.hall.capacity - (screening.booked or 0)
+			assert screening.listing.available_seats == screening.available_seats
+
+		for booking in Booking.objects.select_related('screening'):
+			assert booking.total_price == booking.seats * booking.screening.price
+			assert len(booking.seat_numbers) == booking.seats
+			assert references.is_valid(booking.booking_reference)
+
+		duplicates = Booking.objects.values('booking_reference').annotate(n=Count('pk')).filter(n__gt=1)
+		assert not duplicates.exists()
+
+	@pytest.mark.integration
+	def test_rebuilds_sales(self, seeded):
+		confirmed = Booking.objects.filter(status='confirmed').aggregate(seats=Sum('seats'), revenue=Sum('total_price'))
+		sales = DailySales.objects.aggregate(screenings=Sum('screenings'), seats=Sum('seats_sold'), revenue=Sum('revenue'))
+
+		assert sales == {'screenings': 60, 'seats': confirmed['seats'], 'revenue': confirmed['revenue']}
+
+	@pytest.mark.integration
+	def test_command(self):
+		out = StringIO()
+
+		call_command('seed_cinema', films=2, halls=1, screenings=5, bookings=50, random_seed=1, stdout=out)
+
+		assert Screening.objects.count() == 5
+		assert 'сеансов: 5' in out.getvalue()
@@ -0,0 +1,78 @@
+import json
+import logging
+import sys
+import threading
+
+import pytest
+
+from cinema.log import JSONFormatter, StructuredQueueHandler, start_queue_logging
+
+
+class RecordingHandler(logging.Handler):
+	def __init__(self):
+		super().__init__()
+		self.records = []
+		self.threads = set()
+		self.done = threading.Event()
+
+	def emit(self, record):
+		self.records.append(self.format(record))
+		self.threads.add(threading.get_ident())
+		self.done.set()
+
+
+class TestJSONFormatter:
+
+	@pytest.mark.unit
+	def test_fields_and_extra(self):
+		record = logging.makeLogRecord({
+			'name': 'cinema.views', 'levelname': 'INFO', 'levelno': logging.INFO,
+			'msg': 'Создана бронь #%s на %d мест', 'args': ('ABC', 2), 'booking_reference': 'ABC',
+		})
+
+		data = json.loads(JSONFormatter().format(record))
+
+		assert data['message'] == 'Создана бронь #ABC на 2 мест'
+		assert data['level'] == 'INFO'
+		assert data['logger'] == 'cinema.views'
+		assert data['booking_reference'] == 'ABC'
+		assert data['time'].endswith('+00:00')
+		assert 'args' not in data and 'msg' not in data
+
+	@pytest.mark.unit
+	def test_exception(self):
+		try:
+			raise ValueError('сломалось')
+		except ValueError:
+			record = logging.makeLogRecord({'msg': 'Ошибка', 'exc_info': sys.exc_info()})
+
+		data = json.loads(JSONFormatter().format(record))
+
+		assert data['message'] == 'Ошибка'
+		assert 'ValueError: сломалось' in data['exc_info']
+
+
+class TestQueueLogging:
+
+	@pytest.mark.unit
+	def test_records_are_written_by_listener_thread(self):
+		logger = logging.getLogger('cinema.tests.queue')
+		logger.propagate = False
+		logger.setLevel(logging.INFO)
+		target = RecordingHandler()
+		target.setFormatter(JSONFormatter())
+		logger.addHandler(target)
+
+		start_queue_logging(('cinema.tests.queue',))
+		try:
+			raise RuntimeError('сбой')
+		except RuntimeError:
+			logger.exception('Бронь #%s не отменена', 'XYZ', extra={'booking_reference': 'XYZ'})
+
+		assert target.done.wait(timeout=5)
+		assert [type(handler) for handler in logger.handlers] == [StructuredQueueHandler]
+		assert threading.get_ident() not in target.threads
+		data = json.loads(target.records[0])
+		assert data['message'] == 'Бронь #XYZ не отменена'
+		assert data['booking_reference'] == 'XYZ'
+		assert 'RuntimeError: сбой' in data['exc_info']
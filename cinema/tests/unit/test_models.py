@@ -3,6 +3,7 @@ import pytest
 from datetime import datetime, timedelta
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from cinema import seatmap
 from cinema.models import Film, Screening
 from cinema.tests.factories import (
 	FilmFactory,
@@ -110,6 +111,67 @@ class TestScreeningModel:
 		expected_str = f"Интерстеллар - {expected_date.strftime('%d.%m.%Y %H:%M')}"
 		assert str(screening) == expected_str
 
+	@pytest.mark.unit
+	def test_screening_seat_map_matches_available_seats(self):
+		hall = CinemaHallFactory(capacity=20)
+		screening = ScreeningFactory(hall=hall, available_seats=15)
+		assert seatmap.count_occupied(screening.seat_map) == 5
+
+	@pytest.mark.unit
+	def test_screening_reserve_seats(self):
+		hall = CinemaHallFactory(capacity=10, row_sizes=[5, 5])
+		screening = ScreeningFactory(hall=hall, available_seats=5)
+
+		assert screening.reserve_seats(3) == [[2, 1], [2, 2], [2, 3]]
+		assert screening.reserve_seats(3) is None
+
+		screening.refresh_from_db()
+		assert screening.available_seats == 2
+		assert seatmap.count_occupied(screening.seat_map) == 8
+
+	@pytest.mark.unit
+	def test_screening_reserve_taken_seat(self):
+		hall = CinemaHallFactory(capacity=10, row_sizes=[5, 5])
+		screening = ScreeningFactory(hall=hall)
+
+		assert screening.reserve_seats(1, [[1, 3]]) == [[1, 3]]
+		assert screening.reserve_seats(1, [[1, 3]]) is None
+		assert screening.reserve_seats(1, [[3, 1]]) is None
+
+	@pytest.mark.unit
+	def test_screening_release_seats(self):
+		hall = CinemaHallFactory(capacity=10)
+		screening = ScreeningFactory(hall=hall)
+		screening.reserve_seats(2, [[1, 4], [1, 5]])
+
+		screening.release_seats(2, [[1, 4], [1, 5]])
+
+		screening.refresh_from_db()
+		assert screening.available_seats == 10
+		assert seatmap.count_occupied(screening.seat_map) == 0
+
+	@pytest.mark.unit
+	def test_screening_stale_save_keeps_reservations(self):
+		screening = ScreeningFactory(hall=CinemaHallFactory(capacity=10))
+		stale = Screening.objects.get(pk=screening.pk)
+		screening.reserve_seats(4)
+
+		stale.price = 999
+		stale.save()
+
+		stale.refresh_from_db()
+		assert stale.available_seats == 6
+		assert seatmap.count_occupied(stale.seat_map) == 4
+
+	@pytest.mark.unit
+	def test_screening_move_with_bookings_to_other_hall(self):
+		screening = ScreeningFactory(hall=CinemaHallFactory(capacity=10))
+		BookingFactory(screening=screening, seats=2)
+		screening.hall = CinemaHallFactory(capacity=30)
+
+		with pytest.raises(ValidationError):
+			screening.save()
+
 
 @pytest.mark.django_db
 class TestBookingModel:
@@ -0,0 +1,57 @@
+import pytest
+
+from cinema import references
+from cinema.models import ReferenceSequence
+from cinema.tests.factories import BookingFactory
+
+
+class TestReferenceEncoding:
+	@pytest.mark.unit
+	def test_permutation_is_collision_free(self):
+		codes = {references.encode(number) for number in range(1, 20001)}
+		assert len(codes) == 20000
+
+	@pytest.mark.unit
+	def test_reference_format(self):
+		reference = references.encode(10_000_000)
+		assert len(reference) == 8
+		assert all(char in references.ALPHABET for char in reference)
+		assert references.is_valid(reference)
+
+	@pytest.mark.unit
+	def test_check_char_detects_typos(self):
+		reference = references.encode(42)
+		for position in range(len(reference)):
+			for char in references.ALPHABET:
+				if char != reference[position]:
+					typo = reference[:position] + char + reference[position + 1:]
+					assert not references.is_valid(typo)
+
+	@pytest.mark.unit
+	def test_secret_key_rotation_keeps_codes(self, settings):
+		code = references.encode(42)
+		references._round_keys.cache_clear()
+		settings.SECRET_KEY = 'rotated-secret-key'
+		try:
+			assert references.encode(42) == code
+		finally:
+			references._round_keys.cache_clear()
+
+	@pytest.mark.unit
+	def test_out_of_range_number(self):
+		with pytest.raises(ValueError):
+			references.encode(1 << 35)
+
+
+@pytest.mark.django_db
+class TestReferenceSequence:
+	@pytest.mark.unit
+	def test_allocate_is_sequential(self):
+		first = ReferenceSequence.allocate()[0]
+		assert ReferenceSequence.allocate(3) == [first + 1, first + 2, first + 3]
+
+	@pytest.mark.unit
+	def test_bookings_get_valid_references(self):
+		bookings = BookingFactory.create_batch(5)
+		assert all(references.is_valid(booking.booking_reference) for booking in bookings)
+		assert len({booking.booking_reference for booking in bookings}) == 5
@@ -0,0 +1,38 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from cinema.renderers import ORJSONRenderer
+
+
+class TestORJSONRenderer:
+
+	@pytest.mark.unit
+	@pytest.mark.parametrize('data', [
+		None,
+		{},
+		[],
+		{'title': 'Фильм «Ёлки» 😀', 'escape': '"\\/\n\t\x00\x1f\x7f', 'separators': '  '},
+		{'id': 1, 'price': '350.00', 'active': True, 'empty': None, 'nested': [[1, 2], {'a': []}]},
+		{'floats': [0.1, 1.0, 1e16, 1e-05, 9e-05, 1e-07, 1.5e-10, -2.5e-300, 123.456]},
+		{'decimal': Decimal('350.50'), 'tiny': Decimal('0.00001')},
+		{'at': datetime(2025, 1, 15, 12, 0, 30, 123456, tzinfo=timezone.utc), 'day': date(2025, 1, 15)},
+		{'duration': timedelta(hours=2), 'uuid': UUID('12345678-1234-5678-1234-567812345678')},
+		{'big': 2 ** 70, 1: 'int key'},
+		ReturnDict({'error': [ErrorDetail('Недостаточно свободных мест', code='invalid')]}, serializer=None),
+		ReturnList([{'id': 1}], serializer=None),
+	])
+	def test_matches_json_renderer(self, data):
+		assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+	@pytest.mark.unit
+	def test_indent_falls_back(self):
+		data = {'title': 'Фильм'}
+		media_type = 'application/json; indent=4'
+
+		assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
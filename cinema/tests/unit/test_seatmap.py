@@ -0,0 +1,50 @@
+import pytest
+
+from cinema import seatmap
+
+
+class TestSeatMap:
+	@pytest.mark.unit
+	def test_build_marks_leading_seats(self):
+		bitmap = seatmap.build(10, 3)
+		assert seatmap.count_occupied(bitmap) == 3
+		assert not seatmap.is_free(bitmap, 2)
+		assert seatmap.is_free(bitmap, 3)
+
+	@pytest.mark.unit
+	def test_occupy_and_release(self):
+		bitmap = seatmap.occupy(seatmap.build(20), [4, 5, 17], 20)
+		assert seatmap.count_occupied(bitmap) == 3
+
+		bitmap = seatmap.release(bitmap, [5], 20)
+		assert seatmap.is_free(bitmap, 5)
+		assert not seatmap.is_free(bitmap, 17)
+
+	@pytest.mark.unit
+	def test_find_adjacent_stays_within_row(self):
+		layout = [4, 4]
+		bitmap = seatmap.occupy(seatmap.build(8), [1], 8)
+
+		assert seatmap.find_adjacent(bitmap, layout, 2) == [2, 3]
+		assert seatmap.find_adjacent(bitmap, layout, 3) == [4, 5, 6]
+		assert seatmap.find_adjacent(bitmap, layout, 5) is None
+
+	@pytest.mark.unit
+	def test_find_free_falls_back_to_scattered_seats(self):
+		bitmap = seatmap.occupy(seatmap.build(6), [1, 3], 6)
+		assert seatmap.find_free(bitmap, 6, 3) == [0, 2, 4]
+		assert seatmap.find_free(bitmap, 6, 5) is None
+
+	@pytest.mark.unit
+	def test_seat_index_and_position(self):
+		layout = [3, 5]
+		assert seatmap.seat_index(layout, 2, 1) == 3
+		assert seatmap.seat_position(layout, 3) == [2, 1]
+
+		with pytest.raises(ValueError):
+			seatmap.seat_index(layout, 1, 4)
+
+	@pytest.mark.unit
+	def test_rows(self):
+		bitmap = seatmap.occupy(seatmap.build(5), [0, 4], 5)
+		assert seatmap.rows(bitmap, [2, 3]) == [[False, True], [True, True, False]]
@@ -20,8 +20,7 @@ class TestFilmSerializer:
 			'title': '',
 			'description': 'Тест',
 			'duration_minutes': -10,
-			'release_year': 1990,
-			'genre': 'Драма'
+			'release_year': 1990
 		}
 		serializer = FilmSerializer(data=invalid_data)
 		assert serializer.is_valid() is False
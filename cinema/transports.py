@@ -0,0 +1,29 @@
+# Транспорты уведомлений. Письма уходят через почтовый бэкенд Django
+# (EMAIL_BACKEND), для SMS — собственные бэкенды по тому же принципу:
+# консольный для разработки и locmem для тестов.
+import sys
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.utils.module_loading import import_string
+
+sms_outbox = []
+
+
+class ConsoleSMSBackend:
+	def send(self, phone, text):
+		sys.stdout.write(f"SMS для {phone}: {text}\n")
+		sys.stdout.flush()
+
+
+class LocMemSMSBackend:
+	def send(self, phone, text):
+		sms_outbox.append({'phone': phone, 'text': text})
+
+
+def send_email(recipient, subject, text):
+	send_mail(subject, text, settings.DEFAULT_FROM_EMAIL, [recipient])
+
+
+def send_sms(phone, text):
+	import_string(settings.SMS_BACKEND)().send(phone, text)
@@ -4,9 +4,13 @@ from . import views
 
 router = DefaultRouter()
 router.register(r'films', views.FilmViewSet)
+router.register(r'genres', views.GenreViewSet)
 router.register(r'halls', views.CinemaHallViewSet)
 router.register(r'screenings', views.ScreeningViewSet)
 router.register(r'bookings', views.BookingViewSet)
+router.register(r'history/screenings', views.ScreeningHistoryViewSet, basename='screening-history')
+router.register(r'history/bookings', views.BookingHistoryViewSet, basename='booking-history')
+router.register(r'analytics', views.AnalyticsViewSet, basename='analytics')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,71 +1,323 @@
+import hashlib
 import logging
+from datetime import datetime, time, timedelta
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
+from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from django.utils import timezone
-from .models import Film, CinemaHall, Screening, Booking
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
+from . import analytics, exports, listings, schedule_cache, seatmap
+from .fastpath import FastListMixin
+from .holds import hold_expiry
+from .idempotency import idempotent
+from .outbox import enqueue_booking_confirmation
+from .parsers import CSVParser
+from .refunds import cancellation_report
+from .schedule_import import import_screenings
+from .search import search_films
+from .models import Film, Genre, CinemaHall, Screening, ScreeningListing, Booking, ArchivedScreening, ArchivedBooking
 from .serializers import (
 	FilmSerializer,
+	GenreSerializer,
 	CinemaHallSerializer,
 	ScreeningSerializer,
-	BookingSerializer
+	BookingSerializer,
+	ArchivedScreeningSerializer,
+	ArchivedBookingSerializer,
+	fast_bookings,
+	fast_films,
+	fast_screenings
 )
 
 logger = logging.getLogger(__name__)
 
+AVAILABILITY_MAX_IDS = 100
 
-class FilmViewSet(viewsets.ModelViewSet):
+
+class FilmViewSet(FastListMixin, viewsets.ModelViewSet):
 	queryset = Film.objects.all()
 	serializer_class = FilmSerializer
+	fast_serializer = fast_films
+	cursor_ordering = ('title', 'id')
 
 	def get_queryset(self):
 		queryset = Film.objects.all()
-		genre = self.request.query_params.get('genre')
+		if self.action != 'facets':
+			queryset = queryset.prefetch_related('genres')
 
-		if genre:
-			queryset = queryset.filter(genre__icontains=genre)
+		genres = [
+			value.strip()
+			for param in self.request.query_params.getlist('genre')
+			for value in param.split(',') if value.strip()
+		]
+		if genres:
+			ids = [int(value) for value in genres if value.isdigit()]
+			slugs = [slugify(value, allow_unicode=True) for value in genres if not value.isdigit()]
+			links = Film.genres.through.objects.filter(Q(genre_id__in=ids) | Q(genre__slug__in=slugs))
+			queryset = queryset.filter(pk__in=links.values('film_id'))
 
 		return queryset
 
 	def create(self, request, *args, **kwargs):
 		try:
-			logger.info(f"Создание фильма: {request.data.get('title')}")
+			logger.info("Создание фильма: %s", request.data.get('title'))
 			return super().create(request, *args, **kwargs)
 		except Exception as e:
-			logger.error(f"Ошибка при создании фильма: {str(e)}")
+			logger.error("Ошибка при создании фильма: %s", e)
 			return Response(
 				{'error': 'Ошибка при создании фильма'},
 				status=status.HTTP_400_BAD_REQUEST
 			)
 
+	@action(detail=False, methods=['get'])
+	def search(self, request):
+		query = request.query_params.get('q', '').strip()
+		try:
+			limit = min(int(request.query_params.get('limit', 20)), 50)
+		except ValueError:
+			limit = 0
+		if not query or limit <= 0:
+			return Response(
+				{'error': 'Укажите поисковый запрос q и корректный limit'},
+				status=status.HTTP_400_BAD_REQUEST
+			)
+
+		films = search_films(query, limit)
+		return Response(self.get_serializer(films, many=True).data)
+
+	@action(detail=False, methods=['get'])
+	def facets(self, request):
+		genres = (
+			Genre.objects.filter(films__in=self.get_queryset())
+			.annotate(film_count=Count('films'))
+			.values('id', 'slug', 'name', 'film_count')
+			.order_by('-film_count', 'name')
+		)
+		return Response({'genres': list(genres)})
+
+
+class GenreViewSet(viewsets.ModelViewSet):
+	queryset = Genre.objects.all()
+	serializer_class = GenreSerializer
+	cursor_ordering = ('name', 'id')
+
 
 class CinemaHallViewSet(viewsets.ModelViewSet):
 	queryset = CinemaHall.objects.all()
 	serializer_class = CinemaHallSerializer
 
 
-class ScreeningViewSet(viewsets.ModelViewSet):
+class ScreeningViewSet(FastListMixin, viewsets.ModelViewSet):
 	queryset = Screening.objects.all()
 	serializer_class = ScreeningSerializer
+	fast_serializer = fast_screenings
+	cursor_ordering = ('start_time', 'id')
+	read_fields = (
+		'id', 'film', 'hall', 'start_time', 'end_time', 'price', 'available_seats',
+		'film__title', 'hall__name',
+	)
 
 	def get_queryset(self):
-		queryset = Screening.objects.all()
+		queryset = Screening.objects.select_related('film', 'hall')
+		if self.action in ('list', 'retrieve', 'upcoming'):
+			queryset = queryset.only(*self.read_fields)
+		if self.action in ('list', 'upcoming'):
+			queryset = queryset.filter(is_cancelled=False)
 		return queryset.filter(start_time__gte=timezone.now())
 
+	def perform_create(self, serializer):
+		self._save(serializer)
+
+	def perform_update(self, serializer):
+		self._save(serializer)
+
+	def _save(self, serializer):
+		try:
+			serializer.save()
+		except DjangoValidationError as e:
+			raise ValidationError(e.messages)
+
+	def _serialize(self, queryset):
+		if self.fast_serialization_enabled():
+			return self.fast_serializer.serialize(queryset)
+		return [dict(item) for item in self.get_serializer(queryset, many=True).data]
+
 	@action(detail=False, methods=['get'])
 	def upcoming(self, request):
-		screenings = self.get_queryset().filter(start_time__gte=timezone.now())[:10]
-		serializer = self.get_serializer(screenings, many=True)
-		return Response(serializer.data)
+		key = schedule_cache.schedule_key('upcoming')
+		return Response(schedule_cache.get_schedule(key, lambda: self._serialize(self.get_queryset()[:10])))
+
+	@action(detail=False, methods=['get'])
+	def schedule(self, request):
+		try:
+			day = parse_date(request.query_params['date']) if 'date' in request.query_params else timezone.localdate()
+			hall = int(request.query_params.get('hall') or 0)
+		except ValueError:
+			day = None
+		if day is None:
+			return Response(
+				{'error': 'Некорректные параметры date или hall'},
+				status=status.HTTP_400_BAD_REQUEST
+			)
+
+		def build():
+			start = timezone.make_aware(datetime.combine(day, time.min))
+			queryset = Screening.objects.select_related('film', 'hall').only(*self.read_fields).filter(
+				start_time__gte=start,
+				start_time__lt=start + timedelta(days=1),
+				is_cancelled=False
+			)
+			if hall:
+				queryset = queryset.filter(hall_id=hall)
+			return self._serialize(queryset)
+
+		key = schedule_cache.schedule_key('schedule', date=day.isoformat(), hall=hall)
+		return Response(schedule_cache.get_schedule(key, build))
+
+	@action(detail=False, methods=['get'])
+	def listing(self, request):
+		try:
+			filters = {
+				f'{name}_id': int(request.query_params[name])
+				for name in ('film', 'hall') if request.query_params.get(name)
+			}
+		except ValueError:
+			return Response(
+				{'error': 'Некорректные параметры film или hall'},
+				status=status.HTTP_400_BAD_REQUEST
+			)
+
+		queryset = ScreeningListing.objects.filter(start_time__gte=timezone.now(), **filters)
+		page = self.paginate_queryset(listings.listing_values(queryset))
+		return self.get_paginated_response(listings.listing_rows(page))
+
+	@action(detail=False, methods=['post'], url_path='import', parser_classes=[JSONParser, CSVParser])
+	def import_schedule(self, request):
+		if not isinstance(request.data, list):
+			return Response(
+				{'error': 'Ожидается список сеансов'},
+				status=status.HTTP_400_BAD_REQUEST
+			)
+
+		created, errors = import_screenings(request.data)
+		if errors:
+			logger.error("Импорт расписания отклонён: %d ошибок", len(errors))
+			return Response({'created': 0, 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+		logger.info("Импортировано сеансов: %d", created)
+		return Response({'created': created, 'errors': []}, status=status.HTTP_201_CREATED)
+
+	@action(detail=True, methods=['post'])
+	def cancel(self, request, pk=None):
+		screening = self.get_object()
+		bookings = screening.cancel_bookings()
+		logger.info(
+			"Сеанс #%s отменён, снято броней: %d", screening.pk, len(bookings),
+			extra={'screening_id': screening.pk}
+		)
+		return StreamingHttpResponse(
+			cancellation_report(screening.pk, bookings),
+			content_type='application/x-ndjson'
+		)
+
+	@action(detail=False, methods=['get'])
+	def availability(self, request):
+		try:
+			ids = [int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()]
+		except ValueError:
+			ids = []
+		ids = list(dict.fromkeys(ids))
+		if not ids or len(ids) > AVAILABILITY_MAX_IDS:
+			return Response(
+				{'error': f'Параметр ids: от 1 до {AVAILABILITY_MAX_IDS} номеров сеансов через запятую'},
+				status=status.HTTP_400_BAD_REQUEST
+			)
+
+		# Ответ собирается из кеша (версию и остаток мест туда пишут
+		# Screening._update_inventory() и save()); ETag считается по версиям
+		# и is_available, поэтому неизменившийся опрос получает 304 без
+		# сериализатора, а с общим кешем — и без обращения к базе.
+		# Last-Modified не отдаётся: секундной точности и времени изменения
+		# не хватает, чтобы заметить наступление сеанса или удаление строки.
+		found = schedule_cache.get_availability(ids, self._load_availability)
+		now = timezone.now()
+		data = []
+		tags = []
+		for screening_id in ids:
+			if screening_id not in found:
+				continue
+			version, available_seats, start_time, is_cancelled = found[screening_id]
+			if is_cancelled:
+				continue
+			is_available = available_seats > 0 and start_time > now
+			data.append({'id': screening_id, 'available_seats': available_seats, 'is_available': is_available})
+			tags.append(f'{screening_id}:{version}:{int(is_available)}')
+
+		response = Response(data)
+		response['ETag'] = '"%s"' % hashlib.sha256(','.join(tags).encode()).hexdigest()[:32]
+		patch_cache_control(response, no_cache=True)
+		return get_conditional_response(request, etag=response['ETag'], response=response)
+
+	@staticmethod
+	def _load_availability(ids):
+		return {
+			row[0]: row[1:]
+			for row in Screening.objects.filter(pk__in=ids).values_list(
+				'pk', 'version', 'available_seats', 'start_time', 'is_cancelled'
+			)
+		}
 
+	@action(detail=True, methods=['get'])
+	def seats(self, request, pk=None):
+		screening = self.get_object()
+		layout = screening.hall.layout
+		data = {
+			'available_seats': screening.available_seats,
+			'rows': seatmap.rows(screening.seat_map, layout),
+		}
 
-class BookingViewSet(viewsets.ModelViewSet):
+		adjacent = request.query_params.get('adjacent')
+		if adjacent:
+			try:
+				count = int(adjacent)
+			except ValueError:
+				return Response(
+					{'error': 'Параметр adjacent должен быть числом'},
+					status=status.HTTP_400_BAD_REQUEST
+				)
+			indices = seatmap.find_adjacent(screening.seat_map, layout, count)
+			data['suggestion'] = [seatmap.seat_position(layout, index) for index in indices or []]
+
+		return Response(data)
+
+
+class BookingViewSet(FastListMixin, viewsets.ModelViewSet):
 	queryset = Booking.objects.all()
 	serializer_class = BookingSerializer
+	fast_serializer = fast_bookings
+	cursor_ordering = ('-booking_date', '-id')
+	read_fields = (
+		'id', 'screening', 'customer_name', 'customer_email', 'customer_phone', 'seats',
+		'seat_numbers', 'total_price', 'status', 'booking_date', 'booking_reference', 'expires_at',
+		'screening__start_time', 'screening__film', 'screening__film__title',
+	)
 
+	def get_queryset(self):
+		queryset = Booking.objects.select_related('screening__film')
+		if self.action in ('list', 'retrieve'):
+			queryset = queryset.only(*self.read_fields)
+		return queryset
+
+	@idempotent('booking-create')
 	@transaction.atomic()
 	def create(self, request, *args, **kwargs):
 		try:
@@ -74,43 +326,182 @@ class BookingViewSet(viewsets.ModelViewSet):
 			screening = serializer.validated_data['screening']
 			seats = serializer.validated_data['seats']
 
-			booking = serializer.save()
-			screening.available_seats -= seats
-			screening.save()
-			logger.info(f"Создана бронь #{booking.booking_reference} на {seats} мест")
+			requested = serializer.validated_data.get('seat_numbers')
+			seat_numbers = screening.reserve_seats(seats, requested)
+			if seat_numbers is None:
+				raise ValidationError(
+					"Выбранные места недоступны" if requested else "Недостаточно свободных мест"
+				)
+
+			expires_at = None
+			if serializer.validated_data.get('status', 'pending') == 'pending':
+				expires_at = hold_expiry()
+
+			booking = serializer.save(seat_numbers=seat_numbers, expires_at=expires_at)
+			if booking.status == 'confirmed':
+				enqueue_booking_confirmation(booking)
+
+			logger.info(
+				"Создана бронь #%s на %d мест", booking.booking_reference, seats,
+				extra={'booking_reference': booking.booking_reference, 'screening_id': screening.pk}
+			)
 			return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 		except ValidationError as e:
-			logger.error(f"Ошибка валидации при создании брони: {e.detail}")
+			transaction.set_rollback(True)
+			logger.error("Ошибка валидации при создании брони: %s", e.detail)
 			return Response(
 				{'error': e.detail},
 				status=status.HTTP_400_BAD_REQUEST
 			)
 
+	@action(detail=False, methods=['get'])
+	def export(self, request):
+		output = request.query_params.get('output', 'csv')
+		try:
+			if output not in exports.FORMATS:
+				raise ValueError(f"Неизвестный формат выгрузки: {output}")
+			filters = exports.parse_filters(
+				request.query_params.get('date_from'),
+				request.query_params.get('date_to'),
+				request.query_params.get('status')
+			)
+		except ValueError as e:
+			return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+		response = StreamingHttpResponse(
+			exports.export_bookings(output, filters),
+			content_type=exports.FORMATS[output]
+		)
+		response['Content-Disposition'] = f'attachment; filename="bookings-{timezone.localdate():%Y%m%d}.{output}"'
+		return response
+
+	@transaction.atomic()
+	def perform_update(self, serializer):
+		# Сборщик просроченных броней мог снять бронь после того, как её
+		# прочитали для этого запроса: сверяем статус под блокировкой строки.
+		current = Booking.objects.select_for_update().values_list('status', flat=True).get(pk=serializer.instance.pk)
+		if current != serializer.instance.status:
+			raise ValidationError("Бронь изменилась, повторите запрос")
+		was_confirmed = serializer.instance.status == 'confirmed'
+		try:
+			booking = serializer.save()
+		except DjangoValidationError as e:
+			raise ValidationError(e.messages)
+		if booking.status == 'confirmed' and not was_confirmed:
+			enqueue_booking_confirmation(booking)
+
 	@action(detail=True, methods=['post'])
+	@idempotent('booking-cancel:{pk}')
 	def cancel(self, request, pk=None):
 		try:
 			booking = self.get_object()
 
-			if booking.status == 'cancelled':
+			if not booking.cancel():
 				return Response(
 					{'error': 'Бронь уже отменена'},
 					status=status.HTTP_400_BAD_REQUEST
 				)
 
-			booking.screening.available_seats += booking.seats
-			booking.screening.save()
-
-			booking.status = 'cancelled'
-			booking.save()
-
-			logger.info(f"Бронь #{booking.booking_reference} отменена")
+			logger.info(
+				"Бронь #%s отменена", booking.booking_reference,
+				extra={'booking_reference': booking.booking_reference}
+			)
 
 			return Response({'message': 'Бронь успешно отменена'})
 
 		except Exception as e:
-			logger.error(f"Ошибка при отмене брони: {str(e)}")
+			logger.exception("Ошибка при отмене брони: %s", e)
 			return Response(
 				{'error': 'Ошибка при отмене брони'},
 				status=status.HTTP_400_BAD_REQUEST
 			)
+
+
+class ScreeningHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+	queryset = ArchivedScreening.objects.all()
+	serializer_class = ArchivedScreeningSerializer
+	cursor_ordering = ('-start_time', '-id')
+
+	def get_queryset(self):
+		params = self.request.query_params
+		filters = {}
+		try:
+			for name in ('film', 'hall'):
+				if params.get(name):
+					filters[f'{name}_id'] = int(params[name])
+		except ValueError:
+			raise ValidationError({'error': 'Некорректные параметры film или hall'})
+
+		for name, lookup in (('date_from', 'gte'), ('date_to', 'lt')):
+			if params.get(name):
+				day = parse_date(params[name])
+				if day is None:
+					raise ValidationError({'error': 'Некорректная дата, ожидается ГГГГ-ММ-ДД'})
+				if lookup == 'lt':
+					day += timedelta(days=1)
+				filters[f'start_time__{lookup}'] = timezone.make_aware(datetime.combine(day, time.min))
+
+		return ArchivedScreening.objects.filter(**filters)
+
+
+class BookingHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+	queryset = ArchivedBooking.objects.all()
+	serializer_class = ArchivedBookingSerializer
+	cursor_ordering = ('-booking_date', '-id')
+
+	def get_queryset(self):
+		params = self.request.query_params
+		queryset = ArchivedBooking.objects.select_related('screening')
+		if params.get('email'):
+			queryset = queryset.filter(customer_email__iexact=params['email'])
+		if params.get('reference'):
+			queryset = queryset.filter(booking_reference=params['reference'].upper())
+		if params.get('screening'):
+			if not params['screening'].isdigit():
+				raise ValidationError({'error': 'Некорректный параметр screening'})
+			queryset = queryset.filter(screening_id=int(params['screening']))
+		return queryset
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+
+	def _sales(self, request):
+		params = request.query_params
+		dates = {}
+		for name in ('date_from', 'date_to'):
+			if params.get(name):
+				dates[name] = parse_date(params[name])
+				if dates[name] is None:
+					raise ValueError("Некорректная дата, ожидается ГГГГ-ММ-ДД")
+		try:
+			ids = {f'{name}_id': int(params[name]) for name in ('film', 'hall') if params.get(name)}
+		except ValueError:
+			raise ValueError("Некорректные параметры film или hall")
+		return analytics.filter_sales(**dates, **ids)
+
+	def _grouped(self, request, group):
+		try:
+			sales = self._sales(request)
+		except ValueError as e:
+			return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+		return Response(analytics.sales_by(group, sales))
+
+	@action(detail=False, methods=['get'])
+	def films(self, request):
+		return self._grouped(request, 'film')
+
+	@action(detail=False, methods=['get'])
+	def halls(self, request):
+		return self._grouped(request, 'hall')
+
+	@action(detail=False, methods=['get'])
+	def series(self, request):
+		bucket = request.query_params.get('bucket', 'day')
+		try:
+			if bucket not in analytics.BUCKETS:
+				raise ValueError(f"Неизвестный интервал: {bucket}")
+			sales = self._sales(request)
+		except ValueError as e:
+			return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+		return Response(analytics.sales_series(bucket, sales))
@@ -0,0 +1,40 @@
+"""
+Конфигурация gunicorn для продакшена: WSGI с потоковыми воркерами (gthread)
+и постоянными соединениями с БД — единственный поддерживаемый профиль.
+
+    gunicorn config.wsgi:application -c config/gunicorn.conf.py
+
+ASGI здесь не предлагается: async-запросы Django не переиспользуют
+соединения (CONN_MAX_AGE), а пула для psycopg2 нет, так что каждый запрос
+снова открывал бы соединение с PostgreSQL.
+
+Каждый поток держит своё соединение с PostgreSQL, поэтому
+workers * threads должно оставаться ниже max_connections (100 по умолчанию).
+Нагрузочная проверка: benchmarks/load_test.py.
+"""
+import multiprocessing
+
+import decouple
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = decouple.config('GUNICORN_WORKERS', default=min(multiprocessing.cpu_count() * 2 + 1, 9), cast=int)
+worker_class = 'gthread'
+threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)
+
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = 30
+keepalive = 5
+
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=5000, cast=int)
+max_requests_jitter = max_requests // 10
+
+accesslog = decouple.config('GUNICORN_ACCESS_LOG', default='-')
+errorlog = '-'
+
+
+def child_exit(server, worker):
+    # Метрики воркеров собираются через PROMETHEUS_MULTIPROC_DIR
+    # (cinema/metrics.py); файлы завершившегося воркера нужно пометить.
+    if decouple.config('PROMETHEUS_MULTIPROC_DIR', default=''):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
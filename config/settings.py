@@ -16,6 +16,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'corsheaders',
@@ -23,6 +24,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'cinema.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,10 +62,39 @@ DATABASES = {
         'PASSWORD': config('POSTGRES_PASSWORD', 'cinema_password'),
         'HOST': config('POSTGRES_HOST', 'db'),
         'PORT': config('POSTGRES_PORT', '5432'),
+        # Соединение живёт между запросами и проверяется перед повторным
+        # использованием. Это работает для WSGI с потоковыми воркерами
+        # (config/gunicorn.conf.py); под ASGI Django открывал бы соединение
+        # на каждый запрос, поэтому ASGI-профиль не поддерживается.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 
+# Для Redis: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# и CACHE_LOCATION=redis://host:6379/0 (требуется пакет redis)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='cinema'),
+    }
+}
+
+SCHEDULE_CACHE_TIMEOUT = config('SCHEDULE_CACHE_TIMEOUT', default=60, cast=int)
+
+# Кеш общий для всех процессов (Redis, Memcached). LocMemCache у каждого
+# воркера gunicorn свой и не видит изменений из других воркеров, поэтому
+# /screenings/availability/ с ним читает остатки мест из базы (304 по ETag
+# остаётся, но без экономии на запросе). Для одного процесса можно
+# включить явно.
+CACHE_SHARED = config(
+    'CACHE_SHARED',
+    default=CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache',
+    cast=bool
+)
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -82,16 +113,45 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'cinema.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
     'DEFAULT_RESPONSE_CLASS': 'rest_framework.response.Response',
+    'DEFAULT_PAGINATION_CLASS': 'cinema.pagination.CinemaCursorPagination',
+    'PAGE_SIZE': config('API_PAGE_SIZE', default=50, cast=int),
 }
 
+# Списки фильмов, сеансов и броней через .values() вместо ModelSerializer
+# (cinema/fastpath.py); ответ тот же байт в байт.
+FAST_SERIALIZATION = config('FAST_SERIALIZATION', default=False, cast=bool)
+
+# Метрики Prometheus на /metrics (cinema/metrics.py). Выключенные не
+# добавляют работы к запросу.
+METRICS_ENABLED = config('METRICS_ENABLED', default=False, cast=bool)
+
 CORS_ALLOW_ALL_ORIGINS = True
 
+BOOKING_HOLD_TTL = config('BOOKING_HOLD_TTL', default=900, cast=int)
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=86400, cast=int)
+
+# Ключ перестановки номеров броней (cinema/references.py). В отличие от
+# SECRET_KEY его нельзя менять никогда: с другим ключом новые коды совпадут
+# с уже выданными. По умолчанию берётся SECRET_KEY, которым коды шифровались
+# раньше, — перед ротацией SECRET_KEY задайте здесь его текущее значение.
+BOOKING_REFERENCE_KEY = config('BOOKING_REFERENCE_KEY', default=SECRET_KEY)
+
+# Сеансы старше стольких дней переносит в архив команда archive_screenings.
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=30, cast=int)
+
+# Уведомления о бронях рассылает воркер process_outbox.
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='cinema@localhost')
+SMS_BACKEND = config('SMS_BACKEND', default='cinema.transports.ConsoleSMSBackend')
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=8, cast=int)
+OUTBOX_RETRY_DELAY = config('OUTBOX_RETRY_DELAY', default=30, cast=int)
+
 LANGUAGE_CODE = 'ru-ru'
 TIME_ZONE = 'Europe/Moscow'
 USE_I18N = True
@@ -103,27 +163,61 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Обработчики ниже работают в фоновом потоке: CinemaConfig.ready() ставит
+# перед ними очередь (cinema/log.py). LOG_QUEUE=False вернёт синхронную запись.
+LOG_QUEUE = config('LOG_QUEUE', default=True, cast=bool)
+
+# Воркеры gunicorn — отдельные процессы, и RotatingFileHandler в каждом из
+# них ротировал бы общий файл независимо от остальных, теряя записи. Поэтому
+# по умолчанию файл пишет WatchedFileHandler, а ротирует внешний logrotate;
+# LOG_MAX_BYTES > 0 включает встроенную ротацию — только для запуска в один
+# процесс. В контейнерах задайте LOG_FILE='' и LOG_JSON_CONSOLE=True: JSON
+# уходит в stdout, файла нет.
+LOG_FILE = config('LOG_FILE', default='cinema.log')
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=0, cast=int)
+LOG_JSON_CONSOLE = config('LOG_JSON_CONSOLE', default=False, cast=bool)
+
+LOG_HANDLERS = {
+    'console': {
+        'class': 'logging.StreamHandler',
+        **({'formatter': 'json'} if LOG_JSON_CONSOLE else {}),
+    },
+}
+if LOG_FILE and LOG_MAX_BYTES > 0:
+    LOG_HANDLERS['file'] = {
+        'class': 'logging.handlers.RotatingFileHandler',
+        'filename': LOG_FILE,
+        'maxBytes': LOG_MAX_BYTES,
+        'backupCount': config('LOG_BACKUP_COUNT', default=5, cast=int),
+        'encoding': 'utf-8',
+        'formatter': 'json',
+    }
+elif LOG_FILE:
+    LOG_HANDLERS['file'] = {
+        'class': 'logging.handlers.WatchedFileHandler',
+        'filename': LOG_FILE,
+        'encoding': 'utf-8',
+        'formatter': 'json',
+    }
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
-    'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
-        },
-        'file': {
-            'class': 'logging.FileHandler',
-            'filename': 'cinema.log',
+    'formatters': {
+        'json': {
+            '()': 'cinema.log.JSONFormatter',
         },
     },
+    'handlers': LOG_HANDLERS,
     'root': {
-        'handlers': ['console', 'file'],
+        'handlers': list(LOG_HANDLERS),
         'level': 'INFO',
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'],
+            'handlers': list(LOG_HANDLERS),
             'level': 'INFO',
             'propagate': False,
         },
     },
-}
\ No newline at end of file
+}
@@ -1,8 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from cinema.metrics import metrics_view
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('cinema.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
\ No newline at end of file